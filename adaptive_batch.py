@@ -0,0 +1,106 @@
+"""Adaptive batch sizing for query_batch_points
+
+Queries are pulled from any iterable in batches whose size is steered
+toward a target request latency, several batches run concurrently, and
+responses come back in input order.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait as wait_futures
+from itertools import islice
+
+from qdrant_client.http import models
+
+from bulk_ops import is_local_client
+from latency_stats import summarize_latencies
+
+
+class BatchSizer:
+    """Multiplicative controller that moves the batch size toward a target latency
+
+    After each batch the per-query cost (seconds / batch size) gives the
+    size that would have hit target_ms; the current size moves toward it by
+    at most a factor of max_step per observation, within [min_size, max_size].
+    Observations may come from several threads.
+    """
+
+    def __init__(self, initial=64, min_size=1, max_size=1024, target_ms=100.0, max_step=2.0):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_ms / 1000
+        self.max_step = max_step
+        self.size = min(max(initial, min_size), max_size)
+        self._lock = threading.Lock()
+
+    def observe(self, batch_size, seconds):
+        """Update the size from one batch of batch_size queries that took seconds"""
+        with self._lock:
+            if seconds > 0:
+                ideal = batch_size * self.target_seconds / seconds
+                step = min(max(ideal / self.size, 1 / self.max_step), self.max_step)
+            else:
+                step = self.max_step
+            self.size = int(min(max(round(self.size * step), self.min_size), self.max_size))
+            return self.size
+
+
+def adaptive_query_batches(client, collection_name, queries, limit=5, concurrency=4, sizer=None, **request_kwargs):
+    """Answer a stream of query vectors with adaptively sized, concurrent query_batch_points calls
+
+    queries can be any iterable (a generator, a memory-mapped array...);
+    each batch is taken from it only when a slot is free, with the size the
+    sizer currently recommends, so at most concurrency batches are held at
+    once. Pass a BatchSizer to choose the target latency or to carry the
+    learned size across calls. request_kwargs go to every QueryRequest
+    (params, filter, with_payload...). A local client (see
+    is_local_client) runs one batch at a time.
+
+    Returns (responses in input order, stats) where stats holds the latency
+    summary of the batch requests, "batches" (offset, size and seconds of
+    each request in input order) and "final_batch_size".
+    """
+    if is_local_client(client):
+        concurrency = 1
+    sizer = sizer if sizer is not None else BatchSizer()
+    queries = iter(queries)
+    results = {}  # offset -> (responses, size, seconds)
+
+    def send(batch):
+        request_start = time.perf_counter()
+        responses = client.query_batch_points(
+            collection_name=collection_name,
+            requests=[models.QueryRequest(query=query, limit=limit, **request_kwargs) for query in batch]
+        )
+        seconds = time.perf_counter() - request_start
+        sizer.observe(len(batch), seconds)
+        return responses, seconds
+
+    start = time.perf_counter()
+    offset = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        while True:
+            if len(pending) >= concurrency:
+                done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_offset, batch_size = pending.pop(future)
+                    results[batch_offset] = future.result() + (batch_size,)
+            batch = list(islice(queries, sizer.size))
+            if not batch:
+                break
+            pending[executor.submit(send, batch)] = (offset, len(batch))
+            offset += len(batch)
+        for future, (batch_offset, batch_size) in pending.items():
+            results[batch_offset] = future.result() + (batch_size,)
+
+    responses = []
+    batches = []
+    for batch_offset in sorted(results):
+        batch_responses, seconds, batch_size = results[batch_offset]
+        responses.extend(batch_responses)
+        batches.append({"offset": batch_offset, "size": batch_size, "seconds": seconds})
+
+    stats = summarize_latencies([batch["seconds"] for batch in batches], time.perf_counter() - start, items=offset)
+    stats["batches"] = batches
+    stats["final_batch_size"] = sizer.size
+    return responses, stats
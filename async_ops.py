@@ -0,0 +1,181 @@
+"""AsyncQdrantClient fan-out for search and ingest, plus a sync vs async comparison"""
+import asyncio
+import time
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from bulk_ops import is_local_client
+from latency_stats import summarize_latencies
+from vector_data import as_float32
+
+WORKLOADS = ("search", "batch", "ingest")
+
+
+def async_client_options(client):
+    """Return AsyncQdrantClient arguments that reach the same server as client"""
+    if is_local_client(client):
+        raise ValueError(
+            "Async mode needs a Qdrant server: the embedded local storage "
+            "cannot be shared between a sync and an async client"
+        )
+    return dict(client.init_options)
+
+
+def run_async(client_options, operation, *args, **kwargs):
+    """Run operation(async_client, *args, **kwargs) on a fresh event loop and client
+
+    The client is created and closed inside the loop so its connection pool
+    is never reused across event loops.
+    """
+    async def runner():
+        async_client = AsyncQdrantClient(**client_options)
+        try:
+            return await operation(async_client, *args, **kwargs)
+        finally:
+            await async_client.close()
+
+    return asyncio.run(runner())
+
+
+async def _timed(semaphore, latencies, coroutine_fn, *args, **kwargs):
+    """Await one request under the concurrency limit and record its latency"""
+    async with semaphore:
+        start = time.perf_counter()
+        result = await coroutine_fn(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+
+async def query_many(async_client, collection_name, queries, limit=5, concurrency=16, **query_kwargs):
+    """Send one query_points request per query vector, at most concurrency at a time
+
+    Returns (responses in input order, latency summary).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[
+        _timed(
+            semaphore, latencies, async_client.query_points,
+            collection_name=collection_name, query=query, limit=limit, **query_kwargs
+        )
+        for query in as_float32(queries)
+    ])
+    return responses, summarize_latencies(latencies, time.perf_counter() - start)
+
+
+async def batch_query_many(async_client, collection_name, queries, batch_size=64, limit=5, concurrency=4):
+    """Split queries into query_batch_points calls and run the batches concurrently
+
+    Returns (responses in input order, latency summary of the batch requests).
+    """
+    queries = as_float32(queries)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    start = time.perf_counter()
+    batches = await asyncio.gather(*[
+        _timed(
+            semaphore, latencies, async_client.query_batch_points,
+            collection_name=collection_name,
+            requests=[models.QueryRequest(query=query, limit=limit) for query in queries[i:i + batch_size]]
+        )
+        for i in range(0, len(queries), batch_size)
+    ])
+    responses = [response for batch in batches for response in batch]
+    return responses, summarize_latencies(latencies, time.perf_counter() - start, items=len(queries))
+
+
+async def upsert_many(async_client, collection_name, vectors, ids=None, chunk_size=1000, concurrency=8, wait=False):
+    """Upsert vectors in chunks with at most concurrency requests in flight
+
+    Chunks are created lazily as slots free up, so memory stays bounded
+    by chunk_size * concurrency. Returns a latency summary over points.
+    """
+    if ids is None:
+        ids = range(len(vectors))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    tasks = []
+
+    async def send(chunk_ids, chunk_vectors):
+        try:
+            request_start = time.perf_counter()
+            await async_client.upsert(
+                collection_name=collection_name,
+                points=models.Batch(ids=[int(point_id) for point_id in chunk_ids], vectors=chunk_vectors),
+                wait=wait
+            )
+            latencies.append(time.perf_counter() - request_start)
+        finally:
+            semaphore.release()
+
+    start = time.perf_counter()
+    for i in range(0, len(ids), chunk_size):
+        # Wait for a free slot before slicing the next chunk
+        await semaphore.acquire()
+        tasks.append(asyncio.ensure_future(
+            send(ids[i:i + chunk_size], as_float32(vectors[i:i + chunk_size]))
+        ))
+    await asyncio.gather(*tasks)
+
+    return summarize_latencies(latencies, time.perf_counter() - start, items=len(ids))
+
+
+def _sync_workload(client, collection_name, workload, vectors, ids, limit, batch_size, chunk_size):
+    """Run the same workload request by request on the blocking client"""
+    latencies = []
+    start = time.perf_counter()
+    if workload == "search":
+        for query in vectors:
+            request_start = time.perf_counter()
+            client.query_points(collection_name=collection_name, query=query, limit=limit)
+            latencies.append(time.perf_counter() - request_start)
+    elif workload == "batch":
+        for i in range(0, len(vectors), batch_size):
+            request_start = time.perf_counter()
+            client.query_batch_points(
+                collection_name=collection_name,
+                requests=[models.QueryRequest(query=query, limit=limit) for query in vectors[i:i + batch_size]]
+            )
+            latencies.append(time.perf_counter() - request_start)
+    else:
+        for i in range(0, len(ids), chunk_size):
+            request_start = time.perf_counter()
+            client.upsert(
+                collection_name=collection_name,
+                points=models.Batch(
+                    ids=[int(point_id) for point_id in ids[i:i + chunk_size]],
+                    vectors=vectors[i:i + chunk_size]
+                ),
+                wait=False
+            )
+            latencies.append(time.perf_counter() - request_start)
+    return summarize_latencies(latencies, time.perf_counter() - start, items=len(vectors))
+
+
+def compare_sync_async(client, collection_name, workload, vectors, ids=None, limit=5,
+                       concurrency=16, batch_size=64, chunk_size=1000):
+    """Run one workload on the blocking client and then on the async client
+
+    workload is "search" (query_points per vector), "batch"
+    (query_batch_points in batch_size groups) or "ingest" (chunked upserts
+    of vectors/ids). Returns {"sync": summary, "async": summary}.
+    """
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {workload!r} (expected one of {WORKLOADS})")
+    options = async_client_options(client)
+    vectors = as_float32(vectors)
+    if ids is None:
+        ids = range(len(vectors))
+
+    sync_summary = _sync_workload(client, collection_name, workload, vectors, ids, limit, batch_size, chunk_size)
+
+    if workload == "search":
+        _, async_summary = run_async(options, query_many, collection_name, vectors, limit, concurrency)
+    elif workload == "batch":
+        _, async_summary = run_async(options, batch_query_many, collection_name, vectors, batch_size, limit, concurrency)
+    else:
+        async_summary = run_async(options, upsert_many, collection_name, vectors, ids, chunk_size, concurrency)
+
+    return {"sync": sync_summary, "async": async_summary}
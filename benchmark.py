@@ -0,0 +1,770 @@
+"""Non-interactive benchmark suite for the tutorial's Qdrant operations
+
+Runs every operation at each configured dataset size and concurrency level,
+records throughput and latency histograms, and writes JSON/CSV results that
+can be compared between runs to catch regressions:
+
+    python benchmark.py --sizes 10000 100000 --concurrency 1 8 --output results.json
+    python benchmark.py --local --sizes 1000 --compare baseline.json
+    python benchmark.py --mode payload-indexes --sizes 10000 100000 1000000
+    python benchmark.py --mode profiles --sizes 100000 --profiles default low-latency memory-saver
+    python benchmark.py --mode transports --batch-sizes 16 256 1024 --concurrency 4
+    python benchmark.py --transport grpc --sizes 100000
+    python benchmark.py --mode shards --shards 1 2 4 8 --sizes 100000 --layout collections
+    python benchmark.py --mode engines --sizes 10000
+    python benchmark.py --mode hybrid --sizes 10000 100000 --k 10
+    python benchmark.py --fallback-local --sizes 1000
+"""
+import argparse
+import csv
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from bulk_ops import bulk_upsert, is_local_client
+from collection_config import (COLLECTION_PROFILES, collection_kwargs, create_payload_indexes, estimate_ram_mb,
+                               profile_search_params, wait_for_green)
+from evaluation import exact_top_k, recall_at_k
+from hybrid import SEARCH_MODES, create_hybrid_collection, hybrid_queries, search, upsert_hybrid
+from latency_stats import LatencyHistogram, summarize_latencies
+from sharding import ShardedCollection
+from transport import (DEFAULT_GRPC_PORT, DEFAULT_URL, TRANSPORTS, ClientPool, connect, connect_or_local,
+                       encode_query_batch, encode_upsert, time_encoding, transport_options)
+from vector_data import (PAYLOAD_CATEGORIES, VECTOR_DIM, PayloadColumns, random_payload_columns, random_sparse_vectors,
+                         random_vectors)
+
+OPERATIONS = (
+    "upsert",
+    "retrieve",
+    "query_points",
+    "query_batch_points",
+    "scroll",
+    "filtered_search",
+    "delete",
+)
+SHARD_LAYOUTS = ("collections", "shard-number")
+BENCHMARK_COLLECTION = "qdrant_101_benchmark"
+CATEGORIES = np.array(PAYLOAD_CATEGORIES)
+SUMMARY_FIELDS = (
+    "operation", "dataset_size", "concurrency", "requests", "items", "errors",
+    "seconds", "throughput", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms",
+)
+
+
+def _recreate_collection(client, collection_name, profile="default"):
+    """Drop collection_name if it exists and create it with a collection profile"""
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    client.create_collection(collection_name=collection_name, **collection_kwargs(profile))
+
+
+def _fill_collection(client, collection_name, size, vectors, seed, batch_size):
+    """Upsert size points with payloads using the benchmark's upsert requests"""
+    upsert_fn, upsert_requests, _ = operation_requests(
+        client, collection_name, "upsert", size, vectors, None,
+        np.random.default_rng(seed), batch_size, None, None
+    )
+    for i in range(upsert_requests):
+        upsert_fn(i)
+
+
+def _run_requests(request_fn, num_requests, concurrency):
+    """Call request_fn(i) for i in range(num_requests) from concurrency threads
+
+    Returns (latencies, histogram, seconds, errors). Failed requests are
+    counted but their latency is not recorded.
+    """
+    latencies = []
+    histogram = LatencyHistogram()
+    errors = 0
+
+    def timed(i):
+        start = time.perf_counter()
+        request_fn(i)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(timed, i) for i in range(num_requests)]
+        for future in futures:
+            try:
+                latency = future.result()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(latency)
+            histogram.record(latency)
+    return latencies, histogram, time.perf_counter() - start, errors
+
+
+def add_result_row(results, operation, size, concurrency, latencies, seconds, errors=0, items=None, histogram=None,
+                   extra=None, progress=None):
+    """Append one result row (SUMMARY_FIELDS, then extra, then "histogram") to results and report it
+
+    histogram defaults to one built from latencies. Returns the row.
+    """
+    row = {"operation": operation, "dataset_size": size, "concurrency": concurrency, "errors": errors}
+    row.update(summarize_latencies(latencies, seconds, items=items))
+    row.update(extra or {})
+    if histogram is None:
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.record(latency)
+    row["histogram"] = histogram.to_dict()
+    results.append(row)
+    if progress is not None:
+        progress(row)
+    return row
+
+
+def operation_requests(client, collection_name, operation, size, vectors, queries, rng,
+                       batch_size, limit, num_requests):
+    """Return (request_fn, num_requests, items_per_request) for one operation"""
+    if operation == "upsert":
+        payloads = PayloadColumns(random_payload_columns(size, seed=rng.integers(2**32)))
+
+        def request(i):
+            start = i * batch_size
+            client.upsert(
+                collection_name=collection_name,
+                points=models.Batch(
+                    ids=list(range(start, min(start + batch_size, size))),
+                    vectors=vectors[start:start + batch_size],
+                    payloads=payloads[start:start + batch_size]
+                ),
+                wait=True
+            )
+        return request, -(-size // batch_size), batch_size
+
+    if operation == "retrieve":
+        id_batches = rng.integers(size, size=(num_requests, batch_size))
+
+        def request(i):
+            client.retrieve(collection_name=collection_name, ids=id_batches[i].tolist())
+        return request, num_requests, batch_size
+
+    if operation == "query_points":
+        def request(i):
+            client.query_points(collection_name=collection_name, query=queries[i % len(queries)], limit=limit)
+        return request, num_requests, 1
+
+    if operation == "query_batch_points":
+        def request(i):
+            rows = np.arange(i * batch_size, (i + 1) * batch_size) % len(queries)
+            client.query_batch_points(
+                collection_name=collection_name,
+                requests=[models.QueryRequest(query=query, limit=limit) for query in queries[rows]]
+            )
+        return request, num_requests, batch_size
+
+    if operation == "scroll":
+        offsets = rng.integers(size, size=num_requests)
+
+        def request(i):
+            client.scroll(collection_name=collection_name, offset=int(offsets[i]), limit=batch_size)
+        return request, num_requests, batch_size
+
+    if operation == "filtered_search":
+        categories = CATEGORIES[rng.integers(len(CATEGORIES), size=num_requests)]
+        lows = rng.integers(1, 80, size=num_requests)
+
+        def request(i):
+            client.query_points(
+                collection_name=collection_name,
+                query=queries[i % len(queries)],
+                query_filter=models.Filter(must=[
+                    models.FieldCondition(key="category", match=models.MatchValue(value=str(categories[i]))),
+                    models.FieldCondition(key="value", range=models.Range(gte=int(lows[i]), lte=int(lows[i]) + 20)),
+                ]),
+                limit=limit
+            )
+        return request, num_requests, 1
+
+    if operation == "delete":
+        # Delete disjoint id ranges from the end of the collection
+        delete_requests = min(num_requests, size // batch_size)
+
+        def request(i):
+            end = size - i * batch_size
+            client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=list(range(end - batch_size, end))),
+                wait=True
+            )
+        return request, delete_requests, batch_size
+
+    raise ValueError(f"Unknown operation: {operation!r} (expected one of {OPERATIONS})")
+
+
+def run_benchmark(client, sizes, concurrency_levels, operations=OPERATIONS, num_requests=200,
+                  batch_size=64, limit=10, collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Benchmark each operation for every dataset size and concurrency level
+
+    The benchmark collection is recreated and filled by the "upsert"
+    operation for each size, so "upsert" should stay in operations unless
+    the collection is already populated. A local client (see
+    is_local_client) runs at concurrency 1. progress, if given, is called
+    with each result row as it completes.
+
+    Returns a list of result dicts with SUMMARY_FIELDS plus a "histogram".
+    """
+    results = []
+    for size in sizes:
+        for concurrency in concurrency_levels:
+            effective_concurrency = 1 if is_local_client(client) else concurrency
+            rng = np.random.default_rng(seed)
+            vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+            queries = random_vectors(max(num_requests, batch_size), VECTOR_DIM, seed=seed + 1)
+
+            _recreate_collection(client, collection_name)
+
+            for operation in operations:
+                request_fn, requests, items_per_request = operation_requests(
+                    client, collection_name, operation, size, vectors, queries, rng,
+                    batch_size, limit, num_requests
+                )
+                latencies, histogram, seconds, errors = _run_requests(request_fn, requests, effective_concurrency)
+                # The last upsert chunk may be short, so never count more points than exist
+                items = len(latencies) * items_per_request
+                if operation == "upsert":
+                    items = min(items, size)
+                add_result_row(results, operation, size, effective_concurrency, latencies, seconds, errors,
+                               items=items, histogram=histogram, progress=progress)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def run_payload_index_benchmark(client, sizes, num_requests=200, batch_size=64, limit=10,
+                                collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Measure filtered-search latency before and after creating payload indexes
+
+    For each size the collection is filled with payload points, the same
+    filtered queries are run without indexes ("filtered_search_unindexed"),
+    the PAYLOAD_SCHEMA indexes are built and the queries are run again
+    ("filtered_search_indexed"). Rows have the same shape as run_benchmark's,
+    plus "index_seconds" on the indexed row.
+    """
+    results = []
+    for size in sizes:
+        vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+        queries = random_vectors(max(num_requests, batch_size), VECTOR_DIM, seed=seed + 1)
+
+        _recreate_collection(client, collection_name)
+        _fill_collection(client, collection_name, size, vectors, seed, batch_size)
+        wait_for_green(client, collection_name)
+
+        for operation in ("filtered_search_unindexed", "filtered_search_indexed"):
+            extra = {}
+            if operation == "filtered_search_indexed":
+                start = time.perf_counter()
+                create_payload_indexes(client, collection_name)
+                wait_for_green(client, collection_name)
+                extra["index_seconds"] = time.perf_counter() - start
+
+            # Same seed for both passes, so both run exactly the same filters
+            request_fn, requests, _ = operation_requests(
+                client, collection_name, "filtered_search", size, vectors, queries,
+                np.random.default_rng(seed), batch_size, limit, num_requests
+            )
+            latencies, histogram, seconds, errors = _run_requests(request_fn, requests, 1)
+            add_result_row(results, operation, size, 1, latencies, seconds, errors, histogram=histogram, extra=extra,
+                           progress=progress)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def run_profile_sweep(client, profiles=None, size=10000, num_queries=100, k=10, batch_size=64,
+                      collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Measure recall@k, query latency and estimated memory for each collection profile
+
+    Each profile gets a fresh collection with the same data. Ground truth
+    is the exact NumPy brute-force top-k, and the timed pass uses the
+    profile's own search parameters. Rows have the
+    same shape as run_benchmark's (operation "query_points[<profile>]")
+    plus profile, k, recall_at_k, ready_seconds and estimated_ram_mb.
+    """
+    profiles = list(COLLECTION_PROFILES) if profiles is None else profiles
+    vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+    queries = random_vectors(num_queries, VECTOR_DIM, seed=seed + 1)
+    exact, _ = exact_top_k(vectors, queries, k, distance="cosine")
+    results = []
+
+    for profile in profiles:
+        _recreate_collection(client, collection_name, profile)
+        start = time.perf_counter()
+        _fill_collection(client, collection_name, size, vectors, seed, batch_size)
+        wait_for_green(client, collection_name)
+        ready_seconds = time.perf_counter() - start
+
+        search_params = profile_search_params(profile)
+        found = [None] * len(queries)
+
+        def request(i):
+            found[i] = [point.id for point in client.query_points(
+                collection_name=collection_name, query=queries[i], limit=k, search_params=search_params
+            ).points]
+
+        latencies, histogram, seconds, errors = _run_requests(request, len(queries), 1)
+        answered = [i for i, ids in enumerate(found) if ids is not None]
+        recall = recall_at_k([found[i] for i in answered], exact[answered]) if answered else 0.0
+
+        add_result_row(results, f"query_points[{profile}]", size, 1, latencies, seconds, errors, histogram=histogram,
+                       extra={
+                           "profile": profile,
+                           "k": k,
+                           "recall_at_k": recall,
+                           "ready_seconds": ready_seconds,
+                           "estimated_ram_mb": estimate_ram_mb(profile, size),
+                       }, progress=progress)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def run_transport_benchmark(client, batch_sizes=(16, 64, 256, 1024), num_requests=50, concurrency=1, limit=10,
+                            transports=TRANSPORTS, collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Compare REST and gRPC encoding cost and throughput for growing request payloads
+
+    For each transport and batch size the collection is recreated, filled
+    with num_requests upserts of batch_size points ("upsert[<transport>]")
+    and queried with num_requests query_batch_points calls of batch_size
+    queries ("query_batch_points[<transport>]"). With concurrency > 1 the
+    requests go through a ClientPool of that many clients. Rows have the
+    same shape as run_benchmark's plus transport, batch_size, encode_ms
+    (client-side serialization of one request body) and request_kb.
+    """
+    results = []
+    for transport in transports:
+        options = transport_options(client, transport)
+        transport_client = ClientPool(options, concurrency) if concurrency > 1 else QdrantClient(**options)
+        try:
+            for batch_size in batch_sizes:
+                size = batch_size * num_requests
+                vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+                queries = random_vectors(batch_size, VECTOR_DIM, seed=seed + 1)
+                _recreate_collection(transport_client, collection_name)
+
+                sample_points = [models.PointStruct(id=i, vector=vectors[i].tolist()) for i in range(batch_size)]
+                sample_requests = [models.QueryRequest(query=q.tolist(), limit=limit) for q in queries]
+                encodings = {
+                    "upsert": time_encoding(encode_upsert, collection_name, sample_points, transport),
+                    "query_batch_points": time_encoding(encode_query_batch, collection_name, sample_requests,
+                                                        transport),
+                }
+
+                for operation in ("upsert", "query_batch_points"):
+                    request_fn, requests, items_per_request = operation_requests(
+                        transport_client, collection_name, operation, size, vectors, queries,
+                        np.random.default_rng(seed), batch_size, limit, num_requests
+                    )
+                    latencies, histogram, seconds, errors = _run_requests(request_fn, requests, concurrency)
+                    encode_seconds, request_bytes = encodings[operation]
+                    add_result_row(
+                        results, f"{operation}[{transport}]", size, concurrency, latencies, seconds, errors,
+                        items=len(latencies) * items_per_request, histogram=histogram,
+                        extra={
+                            "transport": transport,
+                            "batch_size": batch_size,
+                            "encode_ms": encode_seconds * 1000,
+                            "request_kb": request_bytes / 1024,
+                        },
+                        progress=progress
+                    )
+
+            if transport_client.collection_exists(collection_name=collection_name):
+                transport_client.delete_collection(collection_name=collection_name)
+        finally:
+            transport_client.close()
+    return results
+
+
+def run_hybrid_benchmark(client, sizes, num_queries=200, k=10, fusion="rrf", dense_noise=1.5, terms=4,
+                         collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Compare dense-only, sparse-only and fused hybrid search as the collection grows
+
+    Each size gets a fresh hybrid collection (dense + sparse named vectors)
+    queried with the same planted queries (see hybrid.hybrid_queries), so
+    recall_at_k is the fraction of queries whose source document is in the
+    top k. Rows have the same shape as run_benchmark's (operation
+    "query_points[<mode>]") plus mode, k, recall_at_k and ingest_seconds.
+    """
+    results = []
+    for size in sizes:
+        dense = random_vectors(size, VECTOR_DIM, seed=seed)
+        sparse = random_sparse_vectors(size, seed=seed + 1)
+        targets, dense_queries, sparse_queries = hybrid_queries(
+            dense, sparse, num_queries, dense_noise=dense_noise, terms=terms, seed=seed + 2
+        )
+        sparse_rows = sparse_queries.tolist()
+
+        create_hybrid_collection(client, collection_name)
+        start = time.perf_counter()
+        upsert_hybrid(client, collection_name, dense, sparse, wait=True)
+        wait_for_green(client, collection_name)
+        ingest_seconds = time.perf_counter() - start
+
+        for mode in SEARCH_MODES:
+            found = [None] * num_queries
+
+            def request(i):
+                found[i] = [point.id for point in search(
+                    client, collection_name, mode, dense_queries[i], sparse_rows[i], limit=k, fusion=fusion
+                )]
+
+            latencies, histogram, seconds, errors = _run_requests(request, num_queries, 1)
+            answered = [i for i, ids in enumerate(found) if ids is not None]
+
+            add_result_row(results, f"query_points[{mode}]", size, 1, latencies, seconds, errors, histogram=histogram,
+                           extra={
+                               "mode": mode,
+                               "k": k,
+                               "recall_at_k": (recall_at_k([found[i] for i in answered], targets[answered, None])
+                                               if answered else 0.0),
+                               "ingest_seconds": ingest_seconds,
+                           }, progress=progress)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def run_shard_benchmark(client, shard_counts=(1, 2, 4, 8), size=10000, num_queries=200, limit=10,
+                        layout="collections", collection_name=BENCHMARK_COLLECTION, seed=42, progress=None):
+    """Measure how ingest throughput and query latency scale with the shard count
+
+    layout="collections" spreads the points over N collections with a
+    ShardedCollection (one ingest worker per shard, parallel fan-out search
+    merged with a heap); layout="shard-number" creates one collection with
+    shard_number=N and lets the server fan out. Each shard count yields an
+    "upsert[<layout>x<N>]" row, where every shard's ingest counts as one
+    request, and a "query_points[<layout>x<N>]" row. Rows have the same
+    shape as run_benchmark's plus layout and shards.
+    """
+    if layout not in SHARD_LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {SHARD_LAYOUTS}")
+    vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+    queries = random_vectors(num_queries, VECTOR_DIM, seed=seed + 1)
+    results = []
+
+    for shards in shard_counts:
+        if layout == "collections":
+            sharded = ShardedCollection(client, collection_name, shards)
+            sharded.create()
+            stats = sharded.upsert(vectors)
+            ingest_latencies, ingest_seconds = stats["shard_seconds"], stats["seconds"]
+            search = sharded.query
+        else:
+            if client.collection_exists(collection_name=collection_name):
+                client.delete_collection(collection_name=collection_name)
+            client.create_collection(collection_name=collection_name, shard_number=shards, **collection_kwargs())
+            stats = bulk_upsert(client, collection_name, vectors, workers=shards, wait=True)
+            ingest_latencies, ingest_seconds = [stats["seconds"]], stats["seconds"]
+
+            def search(query, limit):
+                return client.query_points(collection_name=collection_name, query=query, limit=limit).points
+
+        def request(i):
+            search(queries[i], limit=limit)
+
+        latencies, histogram, seconds, errors = _run_requests(request, num_queries, 1)
+        extra = {"layout": layout, "shards": shards}
+        add_result_row(results, f"upsert[{layout}x{shards}]", size, 1, ingest_latencies, ingest_seconds, items=size,
+                       extra=extra, progress=progress)
+        add_result_row(results, f"query_points[{layout}x{shards}]", size, 1, latencies, seconds, errors,
+                       histogram=histogram, extra=extra, progress=progress)
+
+        if layout == "collections":
+            sharded.drop()
+        elif client.collection_exists(collection_name=collection_name):
+            client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def run_engine_comparison(client, sizes, concurrency_levels, operations=OPERATIONS, num_requests=200,
+                          batch_size=64, limit=10, seed=42, progress=None):
+    """Run run_benchmark on the server behind client and on the embedded local engine
+
+    Rows are run_benchmark's with "[server]" or "[local]" appended to the
+    operation and an "engine" field. Returns (rows, gaps) where gaps pairs
+    every server row with its local counterpart: operation, dataset_size,
+    concurrency, server_throughput, local_throughput and local_vs_server
+    (local throughput as a fraction of the server's). The local engine runs
+    every level at concurrency 1.
+    """
+    if is_local_client(client):
+        raise ValueError("The engine comparison needs a Qdrant server to compare against")
+    local_client = QdrantClient(":memory:")
+    runs = {}
+    for engine, engine_client in (("server", client), ("local", local_client)):
+        runs[engine] = run_benchmark(
+            engine_client, sizes, concurrency_levels, operations=operations, num_requests=num_requests,
+            batch_size=batch_size, limit=limit, seed=seed
+        )
+        for row in runs[engine]:
+            row["operation"] = f"{row['operation']}[{engine}]"
+            row["engine"] = engine
+            if progress is not None:
+                progress(row)
+    local_client.close()
+
+    gaps = []
+    for server_row, local_row in zip(runs["server"], runs["local"]):
+        gaps.append({
+            "operation": server_row["operation"].rsplit("[", 1)[0],
+            "dataset_size": server_row["dataset_size"],
+            "concurrency": server_row["concurrency"],
+            "server_throughput": server_row["throughput"],
+            "local_throughput": local_row["throughput"],
+            "local_vs_server": (local_row["throughput"] / server_row["throughput"]
+                                if server_row["throughput"] else 0.0),
+        })
+    return runs["server"] + runs["local"], gaps
+
+
+def write_json(results, path, metadata=None, extra=None):
+    """Write results plus run metadata (and any extra top-level sections) as JSON"""
+    document = {
+        "metadata": dict(metadata or {}, created=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                         python=platform.python_version()),
+        "results": results,
+    }
+    document.update(extra or {})
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def write_csv(results, path):
+    """Write one CSV row per result, with histogram buckets as extra columns"""
+    bucket_fields = list(results[0]["histogram"]) if results else []
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SUMMARY_FIELDS) + bucket_fields)
+        writer.writeheader()
+        for row in results:
+            flat = {field: row[field] for field in SUMMARY_FIELDS}
+            flat.update(row["histogram"])
+            writer.writerow(flat)
+
+
+def load_results(path):
+    """Load results written by write_json"""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare_results(baseline, current, tolerance=0.10):
+    """Compare two result lists and flag regressions beyond tolerance
+
+    A row regresses when its throughput drops, or its p99 latency grows,
+    by more than tolerance (a fraction) relative to the baseline row with
+    the same operation, dataset_size and concurrency.
+    Returns a list of {"operation", "dataset_size", "concurrency", "metric",
+    "baseline", "current", "change", "regression"} dicts.
+    """
+    def key(row):
+        return row["operation"], row["dataset_size"], row["concurrency"]
+
+    baseline_rows = {key(row): row for row in baseline}
+    comparisons = []
+    for row in current:
+        old = baseline_rows.get(key(row))
+        if old is None:
+            continue
+        for metric, higher_is_better in (("throughput", True), ("p99_ms", False)):
+            if old[metric] == 0:
+                continue
+            change = (row[metric] - old[metric]) / old[metric]
+            regression = change < -tolerance if higher_is_better else change > tolerance
+            comparisons.append({
+                "operation": row["operation"],
+                "dataset_size": row["dataset_size"],
+                "concurrency": row["concurrency"],
+                "metric": metric,
+                "baseline": old[metric],
+                "current": row[metric],
+                "change": change,
+                "regression": regression,
+            })
+    return comparisons
+
+
+def format_row(row):
+    """One-line human readable summary of a result row"""
+    return (f"{row['operation']:<25} size={row['dataset_size']:<8} conc={row['concurrency']:<3} "
+            f"{row['throughput']:>10.0f} items/s  p50={row['p50_ms']:.2f}ms  "
+            f"p99={row['p99_ms']:.2f}ms  errors={row['errors']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="Qdrant server URL")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="rest",
+                        help="Protocol for every mode except transports, which runs both")
+    parser.add_argument("--grpc-port", type=int, default=DEFAULT_GRPC_PORT, help="Qdrant gRPC port")
+    parser.add_argument("--local", action="store_true", help="Use the embedded ':memory:' mode instead of a server")
+    parser.add_argument("--fallback-local", action="store_true",
+                        help="Use the embedded ':memory:' mode if no server answers at --url")
+    parser.add_argument("--mode", choices=("operations", "payload-indexes", "profiles", "transports", "shards",
+                                           "engines", "hybrid"),
+                        default="operations",
+                        help="Benchmark every operation, filtered search with and without payload "
+                             "indexes, recall/latency/memory of each collection profile, REST vs gRPC, "
+                             "scaling with the shard count, the local engine against the server, or "
+                             "dense vs sparse vs hybrid search")
+    parser.add_argument("--profiles", nargs="+", choices=list(COLLECTION_PROFILES),
+                        help="Collection profiles for --mode profiles (default: all)")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8], help="Shard counts for --mode shards")
+    parser.add_argument("--layout", choices=SHARD_LAYOUTS, default="collections",
+                        help="Shard across collections (client fan-out) or with shard_number (server fan-out)")
+    parser.add_argument("--k", type=int, default=10, help="Top-k for recall@k in --mode profiles and hybrid")
+    parser.add_argument("--fusion", choices=("rrf", "dbsf"), default="rrf", help="Fusion for --mode hybrid")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Dataset sizes to benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4], help="Concurrency levels")
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS), choices=OPERATIONS)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per read/delete operation")
+    parser.add_argument("--batch-size", type=int, default=64, help="Points or queries per request")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256, 1024],
+                        help="Points or queries per request for --mode transports")
+    parser.add_argument("--limit", type=int, default=10, help="Top-k for searches")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--csv", help="Write results to this CSV file (one row per result; the --mode engines "
+                                      "gaps are only written to the JSON output)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.local:
+        client = QdrantClient(":memory:")
+    elif args.fallback_local:
+        client, is_server = connect_or_local(args.url, args.transport, grpc_port=args.grpc_port)
+        if not is_server:
+            print(f"No Qdrant server at {args.url}; using the embedded ':memory:' mode", file=sys.stderr)
+    else:
+        client = connect(args.url, args.transport, grpc_port=args.grpc_port)
+    if args.mode in ("transports", "engines") and is_local_client(client):
+        print(f"--mode {args.mode} needs a Qdrant server", file=sys.stderr)
+        return 2
+
+    extra = {}
+    if args.mode == "transports":
+        results = run_transport_benchmark(
+            client,
+            batch_sizes=args.batch_sizes,
+            num_requests=args.requests,
+            concurrency=args.concurrency[-1],
+            limit=args.limit,
+            seed=args.seed,
+            progress=lambda row: print(f"{format_row(row)}  encode={row['encode_ms']:.2f}ms  "
+                                       f"body={row['request_kb']:.1f}KB")
+        )
+    elif args.mode == "engines":
+        results, gaps = run_engine_comparison(
+            client,
+            sizes=args.sizes,
+            concurrency_levels=args.concurrency,
+            operations=args.operations,
+            num_requests=args.requests,
+            batch_size=args.batch_size,
+            limit=args.limit,
+            seed=args.seed,
+            progress=lambda row: print(format_row(row))
+        )
+        extra["gaps"] = gaps
+        for gap in gaps:
+            print(f"{gap['operation']:<25} size={gap['dataset_size']:<8} conc={gap['concurrency']:<3} "
+                  f"local runs at {gap['local_vs_server']:.1%} of server throughput")
+    elif args.mode == "hybrid":
+        results = run_hybrid_benchmark(
+            client,
+            sizes=args.sizes,
+            num_queries=args.requests,
+            k=args.k,
+            fusion=args.fusion,
+            seed=args.seed,
+            progress=lambda row: print(f"{format_row(row)}  recall@{row['k']}={row['recall_at_k']:.3f}")
+        )
+    elif args.mode == "shards":
+        results = run_shard_benchmark(
+            client,
+            shard_counts=args.shards,
+            size=args.sizes[0],
+            num_queries=args.requests,
+            limit=args.limit,
+            layout=args.layout,
+            seed=args.seed,
+            progress=lambda row: print(format_row(row))
+        )
+    elif args.mode == "profiles":
+        results = run_profile_sweep(
+            client,
+            profiles=args.profiles,
+            size=args.sizes[0],
+            num_queries=args.requests,
+            k=args.k,
+            batch_size=args.batch_size,
+            seed=args.seed,
+            progress=lambda row: print(f"{format_row(row)}  recall@{row['k']}={row['recall_at_k']:.3f}  "
+                                       f"ram~{row['estimated_ram_mb']:.1f}MB")
+        )
+    elif args.mode == "payload-indexes":
+        results = run_payload_index_benchmark(
+            client,
+            sizes=args.sizes,
+            num_requests=args.requests,
+            batch_size=args.batch_size,
+            limit=args.limit,
+            seed=args.seed,
+            progress=lambda row: print(format_row(row))
+        )
+    else:
+        results = run_benchmark(
+            client,
+            sizes=args.sizes,
+            concurrency_levels=args.concurrency,
+            operations=args.operations,
+            num_requests=args.requests,
+            batch_size=args.batch_size,
+            limit=args.limit,
+            seed=args.seed,
+            progress=lambda row: print(format_row(row))
+        )
+
+    metadata = {
+        "target": client.init_options.get("location") or args.url,
+        "transport": args.transport,
+        "args": vars(args),
+    }
+    if args.output:
+        write_json(results, args.output, metadata, extra)
+        print(f"Results written to {args.output}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"Results written to {args.csv}")
+
+    if args.compare:
+        comparisons = compare_results(load_results(args.compare), results, args.tolerance)
+        regressions = [c for c in comparisons if c["regression"]]
+        for c in regressions:
+            print(f"REGRESSION {c['operation']} size={c['dataset_size']} conc={c['concurrency']} "
+                  f"{c['metric']}: {c['baseline']:.2f} -> {c['current']:.2f} ({c['change']:+.1%})")
+        print(f"{len(regressions)} regression(s) in {len(comparisons)} comparisons")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""Chunked, parallel bulk operations for large Qdrant collections"""
+import random
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait as wait_futures
+
+import numpy as np
+from qdrant_client.http import models
+
+from collection_config import collection_kwargs, wait_for_count, wait_for_green, wait_for_indexed
+from vector_data import PAYLOAD_CATEGORIES, VECTOR_DIM, PayloadColumns, random_payload_columns, random_vectors
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def is_local_client(client):
+    """Return True for the embedded ':memory:' / path storage
+
+    The embedded engine keeps its state in plain Python structures with no
+    locking, so one client must not be used from several threads at once.
+    Every tool that fans requests out over threads checks this and either
+    runs a single worker or serializes its calls.
+    """
+    options = client.init_options
+    return options.get("location") == ":memory:" or options.get("path") is not None
+
+
+def iter_chunks(ids, vectors, chunk_size, payloads=None):
+    """Yield (ids, vectors, payloads) slices of at most chunk_size rows"""
+    for start in range(0, len(ids), chunk_size):
+        end = start + chunk_size
+        chunk_payloads = payloads[start:end] if payloads is not None else None
+        yield ids[start:end], vectors[start:end], chunk_payloads
+
+
+def _upsert_chunk(client, collection_name, chunk_ids, chunk_vectors, chunk_payloads, wait):
+    """Send one chunk as a single Batch upsert"""
+    client.upsert(
+        collection_name=collection_name,
+        points=models.Batch(
+            ids=[int(i) for i in chunk_ids],
+            vectors=chunk_vectors.tolist(),
+            payloads=list(chunk_payloads) if chunk_payloads is not None else None
+        ),
+        wait=wait
+    )
+    return len(chunk_ids)
+
+
+def _drain(pending, return_when):
+    """Wait for in-flight futures and re-raise the first failure"""
+    done, pending = wait_futures(pending, return_when=return_when)
+    for future in done:
+        future.result()
+    return pending
+
+
+def bulk_upsert(client, collection_name, vectors, ids=None, payloads=None, chunk_size=1000, workers=4, wait=False):
+    """Upsert vectors in chunks over a bounded pool of parallel workers
+
+    Each chunk is turned into Python lists only when it is sent, so memory
+    stays proportional to chunk_size * workers instead of the whole matrix.
+    At most two chunks per worker are in flight at any time. With wait=False
+    the server acknowledges a chunk as soon as it is queued, so the next
+    requests are pipelined while earlier ones are still being applied.
+
+    vectors, ids and payloads only need to support len() and slicing, so
+    memory-mapped arrays and lazily decoded payload columns work as well.
+
+    A local client (see is_local_client) gets a single worker.
+
+    Returns a dict with points, chunks, seconds, points_per_sec and peak_rss_mb.
+    """
+    if is_local_client(client):
+        workers = 1
+    if ids is None:
+        ids = range(len(vectors))
+
+    max_in_flight = workers * 2
+    num_points = 0
+    num_chunks = 0
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk_ids, chunk_vectors, chunk_payloads in iter_chunks(ids, vectors, chunk_size, payloads):
+            if len(pending) >= max_in_flight:
+                pending = _drain(pending, FIRST_COMPLETED)
+            pending.add(executor.submit(
+                _upsert_chunk, client, collection_name, chunk_ids, chunk_vectors, chunk_payloads, wait
+            ))
+            num_points += len(chunk_ids)
+            num_chunks += 1
+        _drain(pending, ALL_COMPLETED)
+
+    seconds = time.perf_counter() - start_time
+    return {
+        "points": num_points,
+        "chunks": num_chunks,
+        "seconds": seconds,
+        "points_per_sec": num_points / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _recreate(client, collection_name, kwargs):
+    """Drop collection_name if it exists and create it with kwargs"""
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    client.create_collection(collection_name=collection_name, **kwargs)
+
+
+def bulk_load(client, collection_name, vectors, ids=None, payloads=None, profile="default", deferred=True,
+              chunk_size=1000, workers=4, timeout=3600.0):
+    """(Re)create a collection, stream every point in and wait until it is searchable
+
+    With deferred=True the collection is created with the profile, its
+    resulting HNSW m and indexing threshold are read back from
+    get_collection, and both are then switched off (m=0,
+    indexing_threshold=0), so ingest only appends to segments. Once all
+    points are in, the values read back are restored and the index is built
+    in one pass (see wait_for_indexed). With deferred=False the profile is
+    used as-is from the start, which is the default path to compare against.
+
+    Returns a dict with points, ingest_seconds, index_seconds,
+    time_to_searchable, points_per_sec and peak_rss_mb.
+    """
+    start = time.perf_counter()
+    _recreate(client, collection_name, collection_kwargs(profile))
+    if deferred:
+        config = client.get_collection(collection_name=collection_name).config
+        m, indexing_threshold = config.hnsw_config.m, config.optimizer_config.indexing_threshold
+        client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=models.HnswConfigDiff(m=0),
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+        )
+    stats = bulk_upsert(
+        client, collection_name, vectors, ids=ids, payloads=payloads,
+        chunk_size=chunk_size, workers=workers, wait=False
+    )
+    wait_for_count(client, collection_name, stats["points"], timeout=timeout)
+    ingest_seconds = time.perf_counter() - start
+
+    if deferred:
+        client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=models.HnswConfigDiff(m=m),
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+        )
+    # The embedded local mode runs no optimizer, so there is no indexing to wait for
+    wait_for_indexed(client, collection_name, timeout=timeout, settle=0.0 if is_local_client(client) else 5.0)
+    total_seconds = time.perf_counter() - start
+
+    return {
+        "points": stats["points"],
+        "ingest_seconds": ingest_seconds,
+        "index_seconds": total_seconds - ingest_seconds,
+        "time_to_searchable": total_seconds,
+        "points_per_sec": stats["points"] / ingest_seconds if ingest_seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare_bulk_load(client, collection_name, vectors, ids=None, payloads=None, profile="default", **kwargs):
+    """Run the default path and then the deferred-index path on the same data
+
+    The collection is left in the state produced by the deferred path.
+    Returns {"default": stats, "deferred": stats}.
+    """
+    return {
+        "default": bulk_load(client, collection_name, vectors, ids, payloads, profile, deferred=False, **kwargs),
+        "deferred": bulk_load(client, collection_name, vectors, ids, payloads, profile, deferred=True, **kwargs),
+    }
+
+
+def _delete_chunk(client, collection_name, chunk_ids, wait):
+    """Send one chunk of ids as a single PointIdsList delete"""
+    client.delete(
+        collection_name=collection_name,
+        points_selector=models.PointIdsList(points=[int(i) for i in chunk_ids]),
+        wait=wait
+    )
+    return len(chunk_ids)
+
+
+def bulk_delete(client, collection_name, ids=None, query_filter=None, chunk_size=1000, workers=4, timeout=300.0):
+    """Delete points by a payload filter or by a (large) id list and wait for green
+
+    With query_filter the server resolves the points itself from a single
+    FilterSelector request. With ids the list is split into chunk_size
+    PointIdsList requests sent over a bounded pool of workers, as in
+    bulk_upsert; ids only needs len() and slicing. Every request waits for
+    the delete to be applied, so the exact counts before and after give the
+    number of points actually removed (ids that do not exist are skipped).
+
+    Returns a dict with deleted, requests, delete_seconds, points_per_sec,
+    green_seconds (optimizer settling after the deletes) and time_to_green.
+    """
+    if (ids is None) == (query_filter is None):
+        raise ValueError("Pass exactly one of ids or query_filter")
+    if is_local_client(client):
+        workers = 1
+
+    before = client.count(collection_name=collection_name, exact=True).count
+    start = time.perf_counter()
+    if query_filter is not None:
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(filter=query_filter),
+            wait=True
+        )
+        num_requests = 1
+    else:
+        num_requests = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for begin in range(0, len(ids), chunk_size):
+                if len(pending) >= workers * 2:
+                    pending = _drain(pending, FIRST_COMPLETED)
+                pending.add(executor.submit(
+                    _delete_chunk, client, collection_name, ids[begin:begin + chunk_size], True
+                ))
+                num_requests += 1
+            _drain(pending, ALL_COMPLETED)
+    delete_seconds = time.perf_counter() - start
+
+    deleted = before - client.count(collection_name=collection_name, exact=True).count
+    green_seconds = wait_for_green(client, collection_name, timeout=timeout)
+    return {
+        "deleted": deleted,
+        "requests": num_requests,
+        "delete_seconds": delete_seconds,
+        "points_per_sec": deleted / delete_seconds if delete_seconds > 0 else 0.0,
+        "green_seconds": green_seconds,
+        "time_to_green": time.perf_counter() - start,
+    }
+
+
+def _per_point_payload_points(count, start_id, dim, categories):
+    """Build PointStructs one at a time with random.choice/randint, as the tutorial used to"""
+    points = []
+    for i in range(count):
+        points.append(models.PointStruct(
+            id=start_id + i,
+            vector=np.random.uniform(low=-1.0, high=1.0, size=dim).tolist(),
+            payload={
+                "category": random.choice(categories),
+                "value": random.randint(1, 100),
+                "active": random.choice([True, False])
+            }
+        ))
+    return points
+
+
+def compare_payload_paths(client, collection_name, count, start_id=0, chunk_size=1000, dim=VECTOR_DIM):
+    """Time per-point PointStruct payload generation against columnar NumPy generation
+
+    Both paths upload the same number of points in chunk_size requests from
+    a single worker, so the difference comes from how the points and
+    payloads are built. Ids start_id..start_id+count are overwritten.
+    Returns {"per_point": stats, "columnar": stats} with generate_seconds,
+    upload_seconds and points_per_sec.
+    """
+    results = {}
+
+    start = time.perf_counter()
+    points = _per_point_payload_points(count, start_id, dim, list(PAYLOAD_CATEGORIES))
+    generated = time.perf_counter()
+    for i in range(0, count, chunk_size):
+        client.upsert(collection_name=collection_name, points=points[i:i + chunk_size], wait=True)
+    results["per_point"] = _payload_path_stats(count, start, generated, time.perf_counter())
+    del points
+
+    start = time.perf_counter()
+    vectors = random_vectors(count, dim)
+    payloads = PayloadColumns(random_payload_columns(count))
+    generated = time.perf_counter()
+    bulk_upsert(client, collection_name, vectors, ids=range(start_id, start_id + count), payloads=payloads,
+                chunk_size=chunk_size, workers=1, wait=True)
+    results["columnar"] = _payload_path_stats(count, start, generated, time.perf_counter())
+    return results
+
+
+def _payload_path_stats(count, start, generated, finished):
+    """Split one path's wall time into generation and upload"""
+    return {
+        "generate_seconds": generated - start,
+        "upload_seconds": finished - generated,
+        "total_seconds": finished - start,
+        "points_per_sec": count / (finished - start) if finished > start else 0.0,
+    }
@@ -0,0 +1,226 @@
+"""Collection configuration: payload schema, payload indexes, collection profiles and hybrid layouts"""
+import os
+import time
+
+from qdrant_client.http import models
+
+from vector_data import VECTOR_DIM
+
+# Payload fields the tutorial filters on, with the index type that serves each filter:
+# category -> MatchValue, value -> Range, active -> MatchValue on a bool
+PAYLOAD_SCHEMA = {
+    "category": models.PayloadSchemaType.KEYWORD,
+    "value": models.PayloadSchemaType.INTEGER,
+    "active": models.PayloadSchemaType.BOOL,
+}
+
+
+# Named collection profiles. Every key is optional: on_disk goes into VectorParams,
+# hnsw_config / quantization_config / optimizers_config go to create_collection,
+# and search_params is what queries against the collection should send.
+COLLECTION_PROFILES = {
+    "default": {
+        "description": "Server defaults (HNSW m=16, ef_construct=100, no quantization)",
+    },
+    "low-latency": {
+        "description": "Denser graph, int8 quantization in RAM, one segment per CPU",
+        "hnsw_config": models.HnswConfigDiff(m=32, ef_construct=256),
+        "quantization_config": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        "optimizers_config": models.OptimizersConfigDiff(default_segment_number=os.cpu_count() or 2),
+        "search_params": models.SearchParams(
+            hnsw_ef=128,
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+    },
+    "memory-saver": {
+        "description": "Original vectors and graph on disk, int8 quantized copy in RAM",
+        "on_disk": True,
+        "hnsw_config": models.HnswConfigDiff(m=16, ef_construct=100, on_disk=True),
+        "quantization_config": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        ),
+        "search_params": models.SearchParams(
+            hnsw_ef=64,
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+    },
+    "binary": {
+        "description": "Vectors on disk, 1-bit binary quantization in RAM with heavy rescoring",
+        "on_disk": True,
+        "quantization_config": models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        ),
+        "search_params": models.SearchParams(
+            hnsw_ef=128,
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=4.0)
+        ),
+    },
+    "bulk-load": {
+        "description": "No HNSW graph and no indexing optimizer, for fast ingest",
+        "hnsw_config": models.HnswConfigDiff(m=0),
+        "optimizers_config": models.OptimizersConfigDiff(indexing_threshold=0),
+    },
+}
+
+# Vector names of hybrid collections (see hybrid_collection_kwargs)
+DENSE_VECTOR = "dense"
+SPARSE_VECTOR = "sparse"
+
+
+def collection_kwargs(profile="default", size=VECTOR_DIM, distance=models.Distance.COSINE):
+    """Return create_collection keyword arguments for a named profile"""
+    settings = COLLECTION_PROFILES[profile]
+    kwargs = {
+        "vectors_config": models.VectorParams(size=size, distance=distance, on_disk=settings.get("on_disk"))
+    }
+    for key in ("hnsw_config", "quantization_config", "optimizers_config"):
+        if key in settings:
+            kwargs[key] = settings[key]
+    return kwargs
+
+
+def hybrid_collection_kwargs(profile="default", size=VECTOR_DIM, distance=models.Distance.COSINE):
+    """Return create_collection keyword arguments for a named dense vector plus a named sparse vector
+
+    The dense vector DENSE_VECTOR follows the profile; the sparse vector
+    SPARSE_VECTOR gets an inverted index (on disk when the profile keeps
+    vectors on disk) and the IDF modifier, so BM25-style document weights
+    are completed with corpus IDF by the server.
+    """
+    kwargs = collection_kwargs(profile, size=size, distance=distance)
+    kwargs["vectors_config"] = {DENSE_VECTOR: kwargs["vectors_config"]}
+    kwargs["sparse_vectors_config"] = {
+        SPARSE_VECTOR: models.SparseVectorParams(
+            index=models.SparseIndexParams(on_disk=COLLECTION_PROFILES[profile].get("on_disk")),
+            modifier=models.Modifier.IDF
+        )
+    }
+    return kwargs
+
+
+def profile_search_params(profile="default"):
+    """Return the SearchParams queries should use for a profile (None for server defaults)"""
+    return COLLECTION_PROFILES[profile].get("search_params")
+
+
+def estimate_ram_mb(profile, count, dim=VECTOR_DIM):
+    """Rough resident memory for vectors, quantized vectors and the HNSW graph
+
+    Original vectors take 4 bytes per dimension unless on disk, int8
+    quantization 1 byte, binary 1 bit; graph links take about m * 2 * 4
+    bytes per point on level 0 unless the graph is on disk.
+    """
+    settings = COLLECTION_PROFILES[profile]
+    total = 0 if settings.get("on_disk") else count * dim * 4
+
+    quantization = settings.get("quantization_config")
+    if isinstance(quantization, models.ScalarQuantization):
+        total += count * dim
+    elif isinstance(quantization, models.BinaryQuantization):
+        total += count * dim / 8
+
+    hnsw = settings.get("hnsw_config") or models.HnswConfigDiff()
+    if not hnsw.on_disk:
+        m = 16 if hnsw.m is None else hnsw.m
+        total += count * m * 2 * 4
+    return total / (1024 * 1024)
+
+
+def create_payload_indexes(client, collection_name, schema=None, wait=True):
+    """Create a payload index for every field in schema that is not indexed yet
+
+    Returns the list of field names that were indexed by this call.
+    """
+    schema = PAYLOAD_SCHEMA if schema is None else schema
+    existing = client.get_collection(collection_name=collection_name).payload_schema or {}
+    created = []
+    for field_name, field_schema in schema.items():
+        if field_name in existing:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+            wait=wait
+        )
+        created.append(field_name)
+    return created
+
+
+def _trigger_optimizers(client, collection_name):
+    """Send an empty optimizers update, which starts optimizations a GREY collection is holding back"""
+    client.update_collection(collection_name=collection_name, optimizers_config=models.OptimizersConfigDiff())
+
+
+def wait_for_green(client, collection_name, timeout=300.0, poll_interval=0.5):
+    """Poll the collection until its status is green (optimizers and indexing done)
+
+    A GREY collection has optimizations pending that only start on the next
+    update, so they are triggered and the wait goes on.
+    Returns the seconds spent waiting; raises TimeoutError after timeout.
+    """
+    start = time.perf_counter()
+    while True:
+        status = client.get_collection(collection_name=collection_name).status
+        if status == models.CollectionStatus.GREEN:
+            return time.perf_counter() - start
+        if status == models.CollectionStatus.GREY:
+            _trigger_optimizers(client, collection_name)
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError(f"Collection '{collection_name}' still {status} after {timeout:g}s")
+        time.sleep(poll_interval)
+
+
+def wait_for_indexed(client, collection_name, timeout=300.0, poll_interval=0.5, settle=5.0):
+    """Poll the collection until the optimizers have indexed what they are going to index
+
+    Right after a config update the status can still read GREEN before the
+    optimizers pick the change up, so green alone is not enough. The wait
+    ends on GREEN once indexed_vectors_count reaches points_count, once the
+    status has left GREEN and come back, or when indexing is disabled
+    (m=0 or indexing_threshold=0). Segments below indexing_threshold are
+    never indexed, so a collection that stays GREEN for settle seconds is
+    taken as done, timed from when it was first seen green. GREY is
+    triggered as in wait_for_green.
+    Returns the seconds spent waiting; raises TimeoutError after timeout.
+    """
+    start = time.perf_counter()
+    left_green = False
+    green_since = None
+    while True:
+        info = client.get_collection(collection_name=collection_name)
+        now = time.perf_counter()
+        if info.status == models.CollectionStatus.GREEN:
+            indexing_off = info.config.hnsw_config.m == 0 or info.config.optimizer_config.indexing_threshold == 0
+            if left_green or indexing_off or (info.indexed_vectors_count or 0) >= (info.points_count or 0):
+                return now - start
+            green_since = now if green_since is None else green_since
+            if now - green_since >= settle:
+                return green_since - start
+        else:
+            left_green = True
+            green_since = None
+            if info.status == models.CollectionStatus.GREY:
+                _trigger_optimizers(client, collection_name)
+        if now - start > timeout:
+            raise TimeoutError(f"Collection '{collection_name}' still {info.status} after {timeout:g}s")
+        time.sleep(poll_interval)
+
+
+def wait_for_count(client, collection_name, expected, timeout=300.0, poll_interval=0.5):
+    """Poll an exact point count until it reaches expected
+
+    Upserts sent with wait=False are acknowledged before they are applied,
+    so this is the barrier that makes every queued point visible.
+    Returns the seconds spent waiting; raises TimeoutError after timeout.
+    """
+    start = time.perf_counter()
+    while True:
+        count = client.count(collection_name=collection_name, exact=True).count
+        if count >= expected:
+            return time.perf_counter() - start
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError(f"Collection '{collection_name}' has {count}/{expected} points after {timeout:g}s")
+        time.sleep(poll_interval)
@@ -0,0 +1,149 @@
+"""Recall evaluation against an exact NumPy brute-force baseline"""
+import time
+
+import numpy as np
+from qdrant_client.http import models
+
+from latency_stats import summarize_latencies
+from vector_data import as_float32
+
+DISTANCES = ("cosine", "dot", "euclid")
+
+_DISTANCE_NAMES = {
+    models.Distance.COSINE: "cosine",
+    models.Distance.DOT: "dot",
+    models.Distance.EUCLID: "euclid",
+}
+
+
+def distance_name(distance):
+    """Map a models.Distance or a distance name to one of DISTANCES"""
+    name = _DISTANCE_NAMES.get(distance, distance)
+    if name not in DISTANCES:
+        raise ValueError(f"Unsupported distance for exact search: {distance!r}")
+    return name
+
+
+def _normalize(vectors):
+    """Scale rows to unit length, leaving zero rows untouched"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _scores(queries, corpus, distance):
+    """Similarity scores (higher is better) of queries against one corpus chunk"""
+    if distance == "cosine":
+        return queries @ _normalize(corpus).T
+    if distance == "dot":
+        return queries @ corpus.T
+    # Squared euclidean distance up to the per-query constant |q|^2, negated
+    return 2.0 * (queries @ corpus.T) - np.einsum("ij,ij->i", corpus, corpus)[None, :]
+
+
+def _top_k(scores, k):
+    """Column indices of the k highest scores per row, best first"""
+    k = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def exact_top_k(vectors, queries, k, distance="cosine", ids=None, corpus_chunk=65536, query_chunk=1024):
+    """Exact top-k neighbours of each query by brute force
+
+    The corpus is scanned in corpus_chunk rows and the queries in
+    query_chunk rows, so at most query_chunk * (corpus_chunk + k) scores are
+    held at once; each corpus chunk's top-k candidates are merged with the
+    running top-k using argpartition. vectors may be a memory-mapped array.
+
+    Returns (neighbour ids, scores), both shaped (len(queries), k) and
+    sorted best first. Ids are row numbers unless ids is given. Euclidean
+    scores are negated distances so that higher is always better.
+    """
+    distance = distance_name(distance)
+    queries = as_float32(np.atleast_2d(queries))
+    if distance == "cosine":
+        queries = _normalize(queries)
+    k = min(k, len(vectors))
+
+    best_rows = np.empty((len(queries), k), dtype=np.int64)
+    best_scores = np.empty((len(queries), k), dtype=np.float32)
+
+    for q_start in range(0, len(queries), query_chunk):
+        query_block = queries[q_start:q_start + query_chunk]
+        rows = np.empty((len(query_block), 0), dtype=np.int64)
+        scores = np.empty((len(query_block), 0), dtype=np.float32)
+
+        for c_start in range(0, len(vectors), corpus_chunk):
+            corpus = as_float32(vectors[c_start:c_start + corpus_chunk])
+            chunk_scores = _scores(query_block, corpus, distance)
+            chunk_top = _top_k(chunk_scores, k)
+            rows = np.concatenate([rows, chunk_top + c_start], axis=1)
+            scores = np.concatenate([scores, np.take_along_axis(chunk_scores, chunk_top, axis=1)], axis=1)
+            keep = _top_k(scores, k)
+            rows = np.take_along_axis(rows, keep, axis=1)
+            scores = np.take_along_axis(scores, keep, axis=1)
+
+        best_rows[q_start:q_start + len(query_block)] = rows
+        best_scores[q_start:q_start + len(query_block)] = scores
+
+    if distance == "euclid":
+        # Turn -(|x|^2 - 2 q.x) back into -|q - x|
+        query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        best_scores = -np.sqrt(np.maximum(query_norms - best_scores, 0.0))
+
+    neighbour_ids = np.asarray(ids)[best_rows] if ids is not None else best_rows
+    return neighbour_ids, best_scores
+
+
+def recall_at_k(found_ids, exact_ids):
+    """Mean fraction of each query's exact top-k ids present in the found ids"""
+    recalls = []
+    for found, exact in zip(found_ids, exact_ids):
+        exact = set(int(i) for i in exact)
+        if not exact:
+            continue
+        recalls.append(len(exact & set(int(i) for i in found)) / len(exact))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def evaluate_search(client, collection_name, vectors, queries, k=10, ids=None, distance=None,
+                    search_params_list=(None,)):
+    """Compare query_points results with the exact baseline for several search settings
+
+    distance defaults to the collection's configured metric. Every entry in
+    search_params_list (a models.SearchParams or None for server defaults)
+    is timed on the same queries. Returns one dict per setting with
+    search_params, k, recall_at_k and the latency summary fields.
+    """
+    if distance is None:
+        distance = client.get_collection(collection_name=collection_name).config.params.vectors.distance
+    queries = as_float32(np.atleast_2d(queries))
+    exact_ids, _ = exact_top_k(vectors, queries, k, distance=distance, ids=ids)
+
+    results = []
+    for search_params in search_params_list:
+        found = []
+        latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            request_start = time.perf_counter()
+            response = client.query_points(
+                collection_name=collection_name,
+                query=query,
+                limit=k,
+                search_params=search_params
+            )
+            latencies.append(time.perf_counter() - request_start)
+            found.append([point.id for point in response.points])
+
+        row = {"search_params": search_params, "k": k, "recall_at_k": recall_at_k(found, exact_ids)}
+        row.update(summarize_latencies(latencies, time.perf_counter() - start))
+        results.append(row)
+    return results
+
+
+def hnsw_ef_sweep(ef_values, quantization=None):
+    """Build a search_params_list that varies hnsw_ef (optionally with quantization params)"""
+    return [models.SearchParams(hnsw_ef=ef, quantization=quantization) for ef in ef_values]
@@ -0,0 +1,123 @@
+"""Hybrid dense + sparse search with server-side fusion
+
+A hybrid collection has a named dense vector and a named sparse vector
+(see collection_config.hybrid_collection_kwargs). A hybrid query is a
+single query_points request whose prefetch runs a dense search and a
+sparse search side by side; the server fuses both candidate lists with
+reciprocal rank fusion (or distribution-based score fusion) and returns
+the top limit.
+"""
+import time
+
+import numpy as np
+from qdrant_client.http import models
+
+from bulk_ops import bulk_upsert
+from collection_config import DENSE_VECTOR, SPARSE_VECTOR, hybrid_collection_kwargs
+from evaluation import recall_at_k
+from latency_stats import summarize_latencies
+from vector_data import VECTOR_DIM, NamedVectors, as_float32, encode_sparse
+
+SEARCH_MODES = ("dense", "sparse", "hybrid")
+FUSIONS = {"rrf": models.Fusion.RRF, "dbsf": models.Fusion.DBSF}
+
+
+def create_hybrid_collection(client, collection_name, profile="default", size=VECTOR_DIM,
+                             distance=models.Distance.COSINE):
+    """(Re)create collection_name with a dense and a sparse named vector"""
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    client.create_collection(collection_name=collection_name,
+                             **hybrid_collection_kwargs(profile, size=size, distance=distance))
+
+
+def upsert_hybrid(client, collection_name, dense, sparse, ids=None, payloads=None, chunk_size=1000, workers=4,
+                  wait=False):
+    """Bulk upsert matching rows of a dense matrix and a SparseVectors as named vectors
+
+    Returns bulk_upsert's stats.
+    """
+    vectors = NamedVectors({DENSE_VECTOR: as_float32(dense), SPARSE_VECTOR: sparse})
+    return bulk_upsert(client, collection_name, vectors, ids=ids, payloads=payloads, chunk_size=chunk_size,
+                       workers=workers, wait=wait)
+
+
+def hybrid_queries(dense, sparse, count, dense_noise=1.5, terms=4, seed=None):
+    """Build queries planted on known documents, for measuring recall without labels
+
+    Each query targets one document: its dense part is the document's
+    vector plus Gaussian noise (dense_noise per dimension), its sparse part
+    is terms of the document's terms drawn at random and counted like a
+    short keyword query. Noisy dense queries and short sparse queries each
+    miss some targets, which is where fusing them pays off.
+    Returns (target row numbers, dense queries, sparse queries).
+    """
+    rng = np.random.default_rng(seed)
+    targets = rng.choice(len(dense), size=count, replace=count > len(dense))
+    noise = rng.normal(scale=dense_noise, size=(count, dense.shape[1])).astype(np.float32)
+    dense_queries = as_float32(dense[targets]) + noise
+    starts = sparse.indptr[targets]
+    lengths = sparse.row_lengths()[targets]
+    positions = starts[:, None] + (rng.random((count, terms)) * lengths[:, None]).astype(np.int64)
+    sparse_queries = encode_sparse(sparse.indices[positions].ravel(), np.full(count, terms), bm25=False)
+    return targets, dense_queries, sparse_queries
+
+
+def search(client, collection_name, mode, dense_query=None, sparse_query=None, limit=10, prefetch_limit=None,
+           fusion="rrf", search_params=None, query_filter=None):
+    """Run one dense, sparse or hybrid query_points request and return its ScoredPoints
+
+    The hybrid mode prefetches prefetch_limit (default 5 * limit)
+    candidates from each vector, applying search_params to the dense
+    search and query_filter to both, and fuses them on the server.
+    """
+    if mode == "dense":
+        return client.query_points(
+            collection_name=collection_name, query=dense_query, using=DENSE_VECTOR, limit=limit,
+            search_params=search_params, query_filter=query_filter
+        ).points
+    if mode == "sparse":
+        return client.query_points(
+            collection_name=collection_name, query=sparse_query, using=SPARSE_VECTOR, limit=limit,
+            query_filter=query_filter
+        ).points
+    if mode == "hybrid":
+        prefetch_limit = prefetch_limit or limit * 5
+        return client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                models.Prefetch(query=as_float32(dense_query).tolist(), using=DENSE_VECTOR, limit=prefetch_limit,
+                                params=search_params, filter=query_filter),
+                models.Prefetch(query=sparse_query, using=SPARSE_VECTOR, limit=prefetch_limit, filter=query_filter),
+            ],
+            query=models.FusionQuery(fusion=FUSIONS[fusion]),
+            limit=limit
+        ).points
+    raise ValueError(f"Unknown search mode: {mode!r} (expected one of {SEARCH_MODES})")
+
+
+def compare_hybrid_search(client, collection_name, targets, dense_queries, sparse_queries, k=10, modes=SEARCH_MODES,
+                          **search_kwargs):
+    """Time every search mode on the same planted queries (see hybrid_queries) and measure recall@k
+
+    recall_at_k is the fraction of queries whose target id is in the top k,
+    assuming point ids are row numbers. search_kwargs go to search
+    (prefetch_limit, fusion, search_params...). Returns one dict per mode
+    with mode, k, recall_at_k and the latency summary fields.
+    """
+    sparse_rows = sparse_queries.tolist()
+    results = []
+    for mode in modes:
+        found = []
+        latencies = []
+        start = time.perf_counter()
+        for dense_query, sparse_query in zip(dense_queries, sparse_rows):
+            request_start = time.perf_counter()
+            points = search(client, collection_name, mode, dense_query, sparse_query, limit=k, **search_kwargs)
+            latencies.append(time.perf_counter() - request_start)
+            found.append([point.id for point in points])
+
+        row = {"mode": mode, "k": k, "recall_at_k": recall_at_k(found, np.asarray(targets)[:, None])}
+        row.update(summarize_latencies(latencies, time.perf_counter() - start))
+        results.append(row)
+    return results
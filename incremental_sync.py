@@ -0,0 +1,205 @@
+"""Incremental sync: upload only new or changed points, delete points missing from the source
+
+A manifest file keeps a 64-bit content hash per point id from the last
+successful sync. Each sync hashes the source rows with vectorized NumPy,
+diffs them against the manifest and sends only the difference, so a
+repeated load of a large dataset costs time proportional to the change
+rather than to the corpus.
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from bulk_ops import bulk_delete, bulk_upsert
+from vector_data import PayloadColumns, as_float32
+
+DEFAULT_MANIFEST = "qdrant_sync_manifest.npz"
+HASH_SEED = 20240601
+
+_MIX = np.uint64(0xFF51AFD7ED558CCD)
+
+
+def _mix(h):
+    """Murmur3 finalizer, so nearby inputs spread over all 64 bits"""
+    h ^= h >> np.uint64(33)
+    h *= _MIX
+    h ^= h >> np.uint64(33)
+    return h
+
+
+def _payload_hashes(payloads, chunk_size):
+    hashes = np.empty(len(payloads), dtype=np.uint64)
+    for start in range(0, len(payloads), chunk_size):
+        for i, payload in enumerate(payloads[start:start + chunk_size], start):
+            digest = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"), digest_size=8)
+            hashes[i] = int.from_bytes(digest.digest(), "little")
+    return hashes
+
+
+def content_hashes(vectors, payloads=None, chunk_size=16384):
+    """Return a uint64 content hash per row of vectors (and payloads, if given)
+
+    Vector rows are hashed on their float32 bit patterns as a sum of
+    per-dimension random odd multipliers, mixed with a Murmur3 finalizer,
+    all in NumPy; vectors may be memory-mapped and are read chunk_size rows
+    at a time. Payloads are hashed as canonical JSON with BLAKE2b.
+    """
+    dim = np.shape(vectors)[1]
+    coefficients = np.random.default_rng(HASH_SEED).integers(1, 2**63, size=dim, dtype=np.uint64) | np.uint64(1)
+    hashes = np.empty(len(vectors), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for start in range(0, len(vectors), chunk_size):
+            bits = as_float32(vectors[start:start + chunk_size]).view(np.uint32).astype(np.uint64)
+            hashes[start:start + chunk_size] = _mix((bits * coefficients).sum(axis=1, dtype=np.uint64))
+        if payloads is not None:
+            hashes ^= _mix(_payload_hashes(payloads, chunk_size) * _MIX)
+    return hashes
+
+
+class SyncManifest:
+    """Point ids and content hashes of the last successful sync of one collection"""
+
+    def __init__(self, path=DEFAULT_MANIFEST, collection_name=None, ids=None, hashes=None):
+        self.path = path
+        self.collection_name = collection_name
+        self.ids = np.empty(0, dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64) if hashes is None else np.asarray(hashes, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MANIFEST):
+        """Read a manifest, or return an empty one if path does not exist"""
+        if not os.path.exists(path):
+            return cls(path)
+        with np.load(path) as manifest:
+            return cls(path, str(manifest["collection_name"]), manifest["ids"], manifest["hashes"])
+
+    def save(self):
+        """Atomically write the manifest, sorted by id"""
+        order = np.argsort(self.ids, kind="stable")
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, collection_name=np.asarray(self.collection_name or ""), ids=self.ids[order],
+                     hashes=self.hashes[order])
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Forget every recorded point and remove the file"""
+        self.ids = np.empty(0, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def plan_sync(manifest, ids, hashes):
+    """Diff source ids/hashes against a manifest
+
+    Returns a dict with upload_rows (source row numbers of new and changed
+    points), new, changed, unchanged and delete_ids (manifest ids missing
+    from the source). Raises ValueError for duplicate source ids.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(np.unique(ids)) != len(ids):
+        raise ValueError("Source ids must be unique")
+    order = np.argsort(manifest.ids, kind="stable")
+    known_ids = manifest.ids[order]
+    known_hashes = manifest.hashes[order]
+
+    if len(known_ids):
+        positions = np.minimum(np.searchsorted(known_ids, ids), len(known_ids) - 1)
+        found = known_ids[positions] == ids
+        changed = found & (known_hashes[positions] != hashes)
+    else:
+        found = np.zeros(len(ids), dtype=bool)
+        changed = found
+    return {
+        "upload_rows": np.flatnonzero(~found | changed),
+        "new": int((~found).sum()),
+        "changed": int(changed.sum()),
+        "unchanged": int((found & ~changed).sum()),
+        "delete_ids": known_ids[~np.isin(known_ids, ids)],
+    }
+
+
+def _take(payloads, rows):
+    """Select rows of a payload list or PayloadColumns"""
+    if isinstance(payloads, PayloadColumns):
+        return PayloadColumns({name: column[rows] for name, column in payloads.columns.items()})
+    return [payloads[i] for i in rows.tolist()]
+
+
+def incremental_sync(client, collection_name, vectors, ids=None, payloads=None, manifest_path=DEFAULT_MANIFEST,
+                     delete_missing=True, chunk_size=1000, workers=4):
+    """Make the collection match the source, sending only what changed since the last sync
+
+    vectors (and payloads, if given) are hashed per row and compared with
+    the manifest: new and changed rows are upserted with bulk_upsert, and
+    with delete_missing the ids the manifest knows but the source lacks are
+    deleted with bulk_delete. The manifest is saved only after every write
+    has been applied, so an interrupted sync is simply redone. A manifest
+    written for another collection, or for a collection that has since been
+    emptied or dropped, is discarded and everything is uploaded.
+
+    Returns a dict with points, new, changed, unchanged, deleted,
+    uploaded_fraction, hash_seconds, upload_seconds, delete_seconds and
+    seconds.
+    """
+    start = time.perf_counter()
+    ids = np.arange(len(vectors), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+    hashes = content_hashes(vectors, payloads)
+    hash_seconds = time.perf_counter() - start
+
+    manifest = SyncManifest.load(manifest_path)
+    stale = manifest.collection_name != collection_name or (
+        len(manifest) and (not client.collection_exists(collection_name=collection_name)
+                           or client.count(collection_name=collection_name, exact=False).count == 0)
+    )
+    if stale:
+        manifest = SyncManifest(manifest_path, collection_name)
+    plan = plan_sync(manifest, ids, hashes)
+
+    rows = plan["upload_rows"]
+    upload_start = time.perf_counter()
+    if len(rows):
+        bulk_upsert(
+            client, collection_name, as_float32(vectors[rows]) if len(rows) < len(vectors) else vectors,
+            ids=ids[rows], payloads=_take(payloads, rows) if payloads is not None else None,
+            chunk_size=chunk_size, workers=workers, wait=True
+        )
+    upload_seconds = time.perf_counter() - upload_start
+
+    deleted = 0
+    delete_seconds = 0.0
+    delete_ids = plan["delete_ids"] if delete_missing else plan["delete_ids"][:0]
+    if len(delete_ids):
+        stats = bulk_delete(client, collection_name, ids=delete_ids, chunk_size=chunk_size, workers=workers)
+        deleted = stats["deleted"]
+        delete_seconds = stats["delete_seconds"]
+
+    if delete_missing:
+        manifest.ids, manifest.hashes = ids, hashes
+    else:
+        # Keep tracking points that are still in the collection but not in this source
+        kept = ~np.isin(manifest.ids, ids)
+        manifest.ids = np.concatenate([manifest.ids[kept], ids])
+        manifest.hashes = np.concatenate([manifest.hashes[kept], hashes])
+    manifest.collection_name = collection_name
+    manifest.save()
+
+    return {
+        "points": len(ids),
+        "new": plan["new"],
+        "changed": plan["changed"],
+        "unchanged": plan["unchanged"],
+        "deleted": deleted,
+        "uploaded_fraction": len(rows) / len(ids) if len(ids) else 0.0,
+        "hash_seconds": hash_seconds,
+        "upload_seconds": upload_seconds,
+        "delete_seconds": delete_seconds,
+        "seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,282 @@
+"""Text ingest pipeline: source reader -> batched embedder -> upsert sink
+
+Each stage runs in its own thread(s) and hands batches to the next one
+through a bounded queue, so a slow stage makes the stages before it block
+(backpressure) instead of letting batches pile up in memory. Every stage
+records how long it spent working, waiting for input and blocked on a
+full output queue; the busiest stage is the bottleneck.
+"""
+import json
+import queue
+import threading
+import time
+import zlib
+from itertools import islice
+
+import numpy as np
+from qdrant_client.http import models
+
+from bulk_ops import is_local_client
+from vector_data import VECTOR_DIM, PayloadColumns, random_payload_columns
+
+WORDS = (
+    "vector", "search", "index", "payload", "filter", "cluster", "shard", "replica", "segment", "query",
+    "embedding", "model", "text", "image", "audio", "product", "review", "price", "category", "user",
+    "fast", "slow", "large", "small", "cheap", "premium", "new", "old", "red", "blue",
+    "green", "quantization", "memory", "disk", "graph", "neighbor", "distance", "cosine", "score", "rank",
+)
+STAGES = ("read", "embed", "upsert")
+
+
+class HashingEmbedder:
+    """Deterministic CPU stand-in for an embedding model
+
+    Texts are lowercased, split on whitespace and feature-hashed into
+    buckets; the term-count matrix is multiplied by a fixed random
+    projection and the rows are L2-normalized, so texts sharing words get
+    similar vectors. The same texts, dim, buckets and seed give the same
+    vectors on every run and machine.
+    """
+
+    def __init__(self, dim=VECTOR_DIM, buckets=4096, seed=0):
+        self.dim = dim
+        self.buckets = buckets
+        self.projection = np.random.default_rng(seed).standard_normal((buckets, dim), dtype=np.float32)
+        self._token_buckets = {}
+
+    def _bucket(self, token):
+        bucket = self._token_buckets.get(token)
+        if bucket is None:
+            # crc32 rather than hash(), which is salted per process
+            bucket = self._token_buckets[token] = zlib.crc32(token.encode("utf-8")) % self.buckets
+        return bucket
+
+    def embed(self, texts):
+        """Return a float32 (len(texts), dim) matrix of unit-length vectors"""
+        rows = []
+        columns = []
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                rows.append(row)
+                columns.append(self._bucket(token))
+        counts = np.zeros((len(texts), self.buckets), dtype=np.float32)
+        np.add.at(counts, (rows, columns), 1.0)
+        vectors = counts @ self.projection
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        return vectors
+
+
+def generated_records(count, start_id=0, words_per_text=(8, 24), seed=None, chunk_size=10000):
+    """Yield {"id", "text", "payload"} records of synthetic text, generated a chunk at a time"""
+    rng = np.random.default_rng(seed)
+    low, high = words_per_text
+    words = np.asarray(WORDS)
+    for chunk_start in range(0, count, chunk_size):
+        n = min(chunk_size, count - chunk_start)
+        lengths = rng.integers(low, high + 1, size=n)
+        tokens = words[rng.integers(len(words), size=int(lengths.sum()))].tolist()
+        offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+        payloads = PayloadColumns(random_payload_columns(n, seed=rng.integers(2**32)))[:]
+        for i in range(n):
+            yield {
+                "id": start_id + chunk_start + i,
+                "text": " ".join(tokens[offsets[i]:offsets[i + 1]]),
+                "payload": payloads[i],
+            }
+
+
+def jsonl_records(path, id_field="id", text_field="text"):
+    """Yield records from a JSON Lines file; fields other than id and text become the payload"""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield {
+                "id": item.pop(id_field),
+                "text": item.pop(text_field),
+                "payload": item,
+            }
+
+
+class StageMetrics:
+    """Work, starvation and backpressure time of one pipeline stage, summed over its workers"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0  # processing batches
+        self.starved_seconds = 0.0  # waiting for the previous stage
+        self.blocked_seconds = 0.0  # waiting for room in the next stage's queue
+        self._lock = threading.Lock()
+
+    def add(self, items=0, busy=0.0, starved=0.0, blocked=0.0):
+        """Record one batch of items (or just waiting time when items is 0)"""
+        with self._lock:
+            if items:
+                self.items += items
+                self.batches += 1
+            self.busy_seconds += busy
+            self.starved_seconds += starved
+            self.blocked_seconds += blocked
+
+    def to_dict(self, seconds):
+        """Return counters plus items_per_sec over the whole run and utilization of the workers"""
+        capacity = seconds * self.workers
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "batches": self.batches,
+            "items_per_sec": self.items / seconds if seconds > 0 else 0.0,
+            "busy_seconds": self.busy_seconds,
+            "starved_seconds": self.starved_seconds,
+            "blocked_seconds": self.blocked_seconds,
+            "utilization": self.busy_seconds / capacity if capacity > 0 else 0.0,
+        }
+
+
+_DONE = object()
+
+
+class _Aborted(Exception):
+    """Raised inside a stage when another stage failed"""
+
+
+def _put(q, item, stop):
+    """Put item on q, blocking while it is full; returns the seconds spent blocked"""
+    start = time.perf_counter()
+    while True:
+        if stop.is_set():
+            raise _Aborted()
+        try:
+            q.put(item, timeout=0.1)
+            return time.perf_counter() - start
+        except queue.Full:
+            continue
+
+
+def _get(q, stop):
+    """Take the next item from q; returns (item, seconds spent waiting)"""
+    start = time.perf_counter()
+    while True:
+        if stop.is_set():
+            raise _Aborted()
+        try:
+            return q.get(timeout=0.1), time.perf_counter() - start
+        except queue.Empty:
+            continue
+
+
+def run_ingest_pipeline(client, collection_name, records, embedder=None, batch_size=64, embed_workers=2,
+                        upsert_workers=2, queue_size=4, wait=False, progress=None):
+    """Embed and upsert records ({"id", "text", optional "payload"}) through a three-stage pipeline
+
+    records can be any iterable (generated_records, jsonl_records, a
+    generator over a database cursor...); it is read batch_size records at
+    a time. At most queue_size batches wait between two stages. The text is
+    stored in each point's payload under "text". embedder needs an
+    embed(texts) method returning a (len(texts), dim) array and defaults to
+    HashingEmbedder. A local client (see is_local_client) gets a single
+    upsert worker. progress(points) is called after every upserted batch.
+
+    Returns a dict with points, seconds, points_per_sec, stages
+    ({stage: StageMetrics.to_dict()}) and bottleneck, the stage with the
+    highest utilization. The first error in any stage stops the pipeline
+    and is re-raised.
+    """
+    embedder = embedder if embedder is not None else HashingEmbedder()
+    if is_local_client(client):
+        upsert_workers = 1
+    metrics = {name: StageMetrics(name, workers) for name, workers in zip(STAGES, (1, embed_workers, upsert_workers))}
+    to_embed = queue.Queue(maxsize=queue_size)
+    to_upsert = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def stage(target):
+        def run():
+            try:
+                target()
+            except _Aborted:
+                pass
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+        return threading.Thread(target=run)
+
+    def read():
+        iterator = iter(records)
+        while True:
+            start = time.perf_counter()
+            batch = list(islice(iterator, batch_size))
+            busy = time.perf_counter() - start
+            if not batch:
+                break
+            metrics["read"].add(len(batch), busy=busy, blocked=_put(to_embed, batch, stop))
+        for _ in range(embed_workers):
+            _put(to_embed, _DONE, stop)
+
+    def embed():
+        while True:
+            batch, starved = _get(to_embed, stop)
+            if batch is _DONE:
+                return
+            start = time.perf_counter()
+            vectors = embedder.embed([record["text"] for record in batch])
+            busy = time.perf_counter() - start
+            metrics["embed"].add(len(batch), busy=busy, starved=starved,
+                                 blocked=_put(to_upsert, (batch, vectors), stop))
+
+    def upsert():
+        while True:
+            item, starved = _get(to_upsert, stop)
+            if item is _DONE:
+                return
+            batch, vectors = item
+            start = time.perf_counter()
+            client.upsert(
+                collection_name=collection_name,
+                points=models.Batch(
+                    ids=[record["id"] for record in batch],
+                    vectors=vectors.tolist(),
+                    payloads=[dict(record.get("payload") or {}, text=record["text"]) for record in batch]
+                ),
+                wait=wait
+            )
+            metrics["upsert"].add(len(batch), busy=time.perf_counter() - start, starved=starved)
+            if progress is not None:
+                progress(metrics["upsert"].items)
+
+    start = time.perf_counter()
+    readers = [stage(read)]
+    embedders = [stage(embed) for _ in range(embed_workers)]
+    upserters = [stage(upsert) for _ in range(upsert_workers)]
+    for thread in readers + embedders + upserters:
+        thread.start()
+    for thread in readers + embedders:
+        thread.join()
+    # Every embedder has finished, so the upserters can be told to stop once the queue drains
+    try:
+        for _ in range(upsert_workers):
+            _put(to_upsert, _DONE, stop)
+    except _Aborted:
+        pass
+    for thread in upserters:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    if errors:
+        raise errors[0]
+    stages = {name: stage_metrics.to_dict(seconds) for name, stage_metrics in metrics.items()}
+    points = metrics["upsert"].items
+    return {
+        "points": points,
+        "seconds": seconds,
+        "points_per_sec": points / seconds if seconds > 0 else 0.0,
+        "stages": stages,
+        "bottleneck": max(stages, key=lambda name: stages[name]["utilization"]),
+    }
@@ -0,0 +1,285 @@
+"""Per-method latency, payload size and error metrics around a QdrantClient
+
+InstrumentedClient records every public method call made through it into a
+ClientMetrics: a latency histogram, approximate request/response JSON
+sizes and error counts per method. Metrics can be dumped as JSON or in the
+Prometheus text exposition format, and chosen methods can be sampled with
+cProfile and tracemalloc.
+"""
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+
+import numpy as np
+from pydantic import BaseModel
+
+from latency_stats import LatencyHistogram
+
+# Upper bounds (bytes) of the payload size buckets; the last bucket is open-ended
+SIZE_BOUNDS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+def json_size(value):
+    """Approximate size in bytes of value once encoded as a JSON request or response body"""
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json(exclude_none=True))
+    if isinstance(value, np.ndarray):
+        return len(json.dumps(value.tolist()))
+    if isinstance(value, (list, tuple)):
+        return sum(json_size(item) for item in value) + len(value) + 1
+    if isinstance(value, dict):
+        return sum(len(json.dumps(str(key))) + json_size(item) + 2 for key, item in value.items()) + 1
+    try:
+        return len(json.dumps(value))
+    except TypeError:
+        return len(repr(value))
+
+
+class SizeHistogram:
+    """Fixed log-spaced payload size buckets"""
+
+    def __init__(self, bounds_bytes=SIZE_BOUNDS_BYTES):
+        self.bounds_bytes = tuple(bounds_bytes)
+        self.counts = [0] * (len(self.bounds_bytes) + 1)
+        self.count = 0
+        self.total_bytes = 0
+
+    def record(self, size):
+        """Add one payload of size bytes"""
+        self.counts[bisect_left(self.bounds_bytes, size)] += 1
+        self.count += 1
+        self.total_bytes += size
+
+    def to_dict(self):
+        """Return {"le_<bound>": count, ..., "le_inf": count} (non-cumulative)"""
+        labels = [f"le_{bound}" for bound in self.bounds_bytes] + ["le_inf"]
+        return dict(zip(labels, self.counts))
+
+
+class MethodMetrics:
+    """Counters and histograms for one client method"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}  # exception type name -> count
+        self.max_ms = 0.0
+        self.latency = LatencyHistogram()
+        self.request_size = SizeHistogram()
+        self.response_size = SizeHistogram()
+
+
+class ClientMetrics:
+    """Thread-safe registry of MethodMetrics keyed by method name"""
+
+    def __init__(self):
+        self.methods = {}
+        self.profiles = {}  # method name -> sampled profiling results, see InstrumentedClient.profile
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, method, seconds, request_bytes=None, response_bytes=None, error=None):
+        """Record one call of method that took seconds"""
+        with self._lock:
+            metrics = self.methods.setdefault(method, MethodMetrics())
+            metrics.calls += 1
+            metrics.latency.record(seconds)
+            metrics.max_ms = max(metrics.max_ms, seconds * 1000.0)
+            if request_bytes is not None:
+                metrics.request_size.record(request_bytes)
+            if response_bytes is not None:
+                metrics.response_size.record(response_bytes)
+            if error is not None:
+                name = type(error).__name__
+                metrics.errors[name] = metrics.errors.get(name, 0) + 1
+
+    def record_profile(self, method, cprofile_report, peak_mb=None):
+        """Store the latest cProfile report of method, counting sampled calls and keeping the largest peak_mb"""
+        with self._lock:
+            previous = self.profiles.get(method, {})
+            profile = {
+                "sampled_calls": previous.get("sampled_calls", 0) + 1,
+                "cprofile": cprofile_report,
+            }
+            if peak_mb is not None:
+                profile["peak_mb"] = max(peak_mb, previous.get("peak_mb", 0.0))
+            self.profiles[method] = profile
+
+    def reset(self):
+        """Forget every recorded call and profile"""
+        with self._lock:
+            self.methods.clear()
+            self.profiles.clear()
+            self.started = time.time()
+
+    def to_dict(self):
+        """Return {method: {calls, errors, mean_ms, max_ms, bytes and histograms}}"""
+        with self._lock:
+            result = {}
+            for method, metrics in sorted(self.methods.items()):
+                result[method] = {
+                    "calls": metrics.calls,
+                    "errors": sum(metrics.errors.values()),
+                    "errors_by_type": dict(metrics.errors),
+                    "mean_ms": metrics.latency.total_ms / metrics.calls if metrics.calls else 0.0,
+                    "max_ms": metrics.max_ms,
+                    "request_bytes": metrics.request_size.total_bytes,
+                    "response_bytes": metrics.response_size.total_bytes,
+                    "latency_histogram_ms": metrics.latency.to_dict(),
+                    "request_size_histogram": metrics.request_size.to_dict(),
+                    "response_size_histogram": metrics.response_size.to_dict(),
+                }
+            return result
+
+    def write_json(self, path):
+        """Write to_dict() and the profiling results to path"""
+        methods = self.to_dict()
+        with self._lock:
+            profiles = dict(self.profiles)
+        with open(path, "w") as f:
+            json.dump({"started": self.started, "methods": methods, "profiles": profiles}, f, indent=2)
+
+    def to_prometheus(self, prefix="qdrant_client"):
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            methods = sorted(self.methods.items())
+            _prometheus_histogram(
+                lines, f"{prefix}_request_duration_seconds", "Client call latency",
+                [(method, m.latency.bounds_ms, m.latency.counts, m.latency.total_ms / 1000.0) for method, m in methods],
+                scale=0.001
+            )
+            _prometheus_histogram(
+                lines, f"{prefix}_request_size_bytes", "Approximate JSON size of call arguments",
+                [(method, m.request_size.bounds_bytes, m.request_size.counts, m.request_size.total_bytes)
+                 for method, m in methods]
+            )
+            _prometheus_histogram(
+                lines, f"{prefix}_response_size_bytes", "Approximate JSON size of call results",
+                [(method, m.response_size.bounds_bytes, m.response_size.counts, m.response_size.total_bytes)
+                 for method, m in methods]
+            )
+            lines.append(f"# HELP {prefix}_errors_total Client calls that raised, by exception type")
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for method, metrics in methods:
+                for error, count in sorted(metrics.errors.items()):
+                    lines.append(f'{prefix}_errors_total{{method="{method}",error="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _prometheus_histogram(lines, name, help_text, series, scale=1.0):
+    """Append one histogram family; series is [(method, bounds, counts, sum)]"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for method, bounds, counts, total in series:
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{method="{method}",le="{bound * scale:g}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{name}_bucket{{method="{method}",le="+Inf"}} {cumulative}')
+        lines.append(f'{name}_sum{{method="{method}"}} {total:g}')
+        lines.append(f'{name}_count{{method="{method}"}} {cumulative}')
+
+
+class InstrumentedClient:
+    """QdrantClient proxy that times every public method call into a ClientMetrics
+
+    measure_sizes=True also estimates request/response sizes; that
+    serializes the arguments and results once more on every call, which
+    adds noticeable overhead to large batches, so it is off by default.
+    """
+
+    def __init__(self, client, metrics=None, measure_sizes=False):
+        self.client = client
+        self.metrics = metrics if metrics is not None else ClientMetrics()
+        self.measure_sizes = measure_sizes
+        self.profile_methods = {}  # method name -> sampling settings and accumulated pstats
+        self._profile_lock = threading.Lock()
+
+    def profile(self, method, every=1, memory=False, top=15):
+        """Sample every n-th call of method with cProfile (and tracemalloc if memory)
+
+        Results accumulate in metrics.profiles[method] as the top functions by
+        cumulative time and, with memory, the largest allocation peak seen.
+        Sampled calls are serialized so their profiles do not overlap.
+        """
+        self.profile_methods[method] = {"every": every, "memory": memory, "top": top, "seen": 0, "stats": None}
+
+    def stop_profiling(self, method=None):
+        """Stop sampling method, or every method when None"""
+        if method is None:
+            self.profile_methods.clear()
+        else:
+            self.profile_methods.pop(method, None)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            settings = self.profile_methods.get(name)
+            if settings is not None:
+                with self._profile_lock:
+                    settings["seen"] += 1
+                    sampled = (settings["seen"] - 1) % settings["every"] == 0
+                if sampled:
+                    return self._profiled_call(name, attribute, settings, args, kwargs)
+            return self._timed_call(name, attribute, args, kwargs)
+        return call
+
+    def _timed_call(self, name, method, args, kwargs):
+        request_bytes = json_size([args, kwargs]) if self.measure_sizes else None
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            self.metrics.record(name, time.perf_counter() - start, request_bytes, error=e)
+            raise
+        seconds = time.perf_counter() - start
+        response_bytes = json_size(result) if self.measure_sizes else None
+        self.metrics.record(name, seconds, request_bytes, response_bytes)
+        return result
+
+    def _profiled_call(self, name, method, settings, args, kwargs):
+        profiler = cProfile.Profile()
+        peak_mb = None
+
+        def profiled(*call_args, **call_kwargs):
+            # Profile only the client call, not the size estimates around it
+            nonlocal peak_mb
+            started_tracing = settings["memory"] and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            if settings["memory"]:
+                tracemalloc.reset_peak()
+            profiler.enable()
+            try:
+                return method(*call_args, **call_kwargs)
+            finally:
+                profiler.disable()
+                if settings["memory"]:
+                    peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                if started_tracing:
+                    tracemalloc.stop()
+
+        with self._profile_lock:
+            try:
+                return self._timed_call(name, profiled, args, kwargs)
+            finally:
+                self._add_profile(name, settings, profiler, peak_mb)
+
+    def _add_profile(self, name, settings, profiler, peak_mb):
+        if settings["stats"] is None:
+            settings["stats"] = pstats.Stats(profiler)
+        else:
+            settings["stats"].add(profiler)
+        report = io.StringIO()
+        settings["stats"].stream = report
+        settings["stats"].sort_stats("cumulative").print_stats(settings["top"])
+        self.metrics.record_profile(name, report.getvalue(), peak_mb)
@@ -0,0 +1,60 @@
+"""Latency percentile helpers shared by the performance tools"""
+from bisect import bisect_left
+
+import numpy as np
+
+
+def percentile(latencies, q):
+    """Return the q-th percentile of latencies (0.0 when there are none)"""
+    if len(latencies) == 0:
+        return 0.0
+    return float(np.percentile(latencies, q))
+
+
+def summarize_latencies(latencies, seconds, items=None):
+    """Summarize per-request latencies (in seconds) measured over a wall-clock run
+
+    items is the number of logical operations performed (e.g. queries or
+    points) and defaults to the number of requests. Returns a dict with
+    requests, items, seconds, throughput and mean/p50/p95/p99/max in ms.
+    """
+    requests = len(latencies)
+    items = requests if items is None else items
+    latencies_ms = np.asarray(latencies, dtype=np.float64) * 1000.0
+    return {
+        "requests": requests,
+        "items": items,
+        "seconds": seconds,
+        "throughput": items / seconds if seconds > 0 else 0.0,
+        "mean_ms": float(latencies_ms.mean()) if requests else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": float(latencies_ms.max()) if requests else 0.0,
+    }
+
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed log-spaced latency buckets, cheap enough to record on every call"""
+
+    def __init__(self, bounds_ms=HISTOGRAM_BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def record(self, seconds):
+        """Add one latency measured in seconds"""
+        latency_ms = seconds * 1000.0
+        self.counts[bisect_left(self.bounds_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+
+    def to_dict(self):
+        """Return {"le_<bound>": count, ..., "le_inf": count} (non-cumulative)"""
+        labels = [f"le_{bound:g}" for bound in self.bounds_ms] + ["le_inf"]
+        return dict(zip(labels, self.counts))
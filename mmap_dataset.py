@@ -0,0 +1,385 @@
+"""Memory-mapped on-disk vector datasets with resumable ingest
+
+A dataset is a directory holding:
+
+- vectors.npy          float32 matrix (count x dim), opened with mmap
+- ids.npy              int64 point ids, opened with mmap
+- payloads.bin         UTF-8 JSON payloads written back to back
+- payload_offsets.npy  int64 byte offsets into payloads.bin (count + 1)
+- checkpoint.json      offset of the next row to ingest, if an ingest was interrupted
+
+Nothing is loaded into RAM up front; rows are paged in by the OS as slices
+are touched, so corpora much larger than memory can be written and read.
+export_dataset writes a collection back out in the same layout.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from qdrant_client.http import models
+
+from bulk_ops import bulk_upsert, is_local_client
+from vector_data import VECTOR_DIM, PayloadColumns, random_payload_columns, random_vectors
+
+VECTORS_FILE = "vectors.npy"
+IDS_FILE = "ids.npy"
+PAYLOADS_FILE = "payloads.bin"
+PAYLOAD_OFFSETS_FILE = "payload_offsets.npy"
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class PayloadColumn:
+    """Lazily decoded payloads backed by payloads.bin and its offsets index"""
+
+    def __init__(self, payloads_path, offsets):
+        self.offsets = offsets
+        self.blob = np.memmap(payloads_path, dtype=np.uint8, mode="r") if offsets[-1] > 0 else None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("PayloadColumn only supports contiguous slices")
+            return [self._decode(i) for i in range(start, stop)]
+        if index < 0:
+            index += len(self)
+        return self._decode(index)
+
+    def _decode(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        if start == end:
+            return {}
+        return json.loads(self.blob[start:end].tobytes())
+
+
+class VectorDataset:
+    """Read-only view over a dataset directory; see the module docstring for the layout"""
+
+    def __init__(self, path):
+        self.path = path
+        self.vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        self.ids = np.load(os.path.join(path, IDS_FILE), mmap_mode="r")
+        offsets = np.load(os.path.join(path, PAYLOAD_OFFSETS_FILE), mmap_mode="r")
+        self.payloads = PayloadColumn(os.path.join(path, PAYLOADS_FILE), offsets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    @classmethod
+    def exists(cls, path):
+        """Return True if path looks like a complete dataset directory"""
+        return all(
+            os.path.exists(os.path.join(path, name))
+            for name in (VECTORS_FILE, IDS_FILE, PAYLOADS_FILE, PAYLOAD_OFFSETS_FILE)
+        )
+
+    @classmethod
+    def create(cls, path, count, dim=VECTOR_DIM, chunk_size=100_000, seed=None):
+        """Write a random dataset of count rows in chunks and return it opened
+
+        Vectors and ids are written straight into memory-mapped .npy files,
+        so peak memory is bounded by chunk_size rather than count.
+        """
+        os.makedirs(path, exist_ok=True)
+        rng = np.random.default_rng(seed)
+
+        vectors = np.lib.format.open_memmap(
+            os.path.join(path, VECTORS_FILE), mode="w+", dtype=np.float32, shape=(count, dim)
+        )
+        ids = np.lib.format.open_memmap(
+            os.path.join(path, IDS_FILE), mode="w+", dtype=np.int64, shape=(count,)
+        )
+        offsets = np.lib.format.open_memmap(
+            os.path.join(path, PAYLOAD_OFFSETS_FILE), mode="w+", dtype=np.int64, shape=(count + 1,)
+        )
+
+        position = 0
+        offsets[0] = 0
+        with open(os.path.join(path, PAYLOADS_FILE), "wb") as payload_file:
+            for start in range(0, count, chunk_size):
+                end = min(start + chunk_size, count)
+                rows = end - start
+                vectors[start:end] = random_vectors(rows, dim, seed=rng.integers(2**32))
+                ids[start:end] = np.arange(start, end, dtype=np.int64)
+
+                payloads = PayloadColumns(random_payload_columns(rows, seed=rng.integers(2**32)))
+                for row, payload in enumerate(payloads[0:rows]):
+                    encoded = json.dumps(payload).encode("utf-8")
+                    payload_file.write(encoded)
+                    position += len(encoded)
+                    offsets[start + row + 1] = position
+
+        for array in (vectors, ids, offsets):
+            array.flush()
+        del vectors, ids, offsets
+        return cls(path)
+
+    def iter_batches(self, batch_size, start=0):
+        """Yield (offset, ids, vectors, payloads) slices, paging rows in lazily"""
+        for offset in range(start, len(self), batch_size):
+            end = offset + batch_size
+            yield offset, self.ids[offset:end], self.vectors[offset:end], self.payloads[offset:end]
+
+    def sample_queries(self, count, seed=None):
+        """Return count vectors drawn from the dataset as a float32 array"""
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(len(self), size=min(count, len(self)), replace=False))
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    def load_checkpoint(self, collection_name=None):
+        """Return the row offset to resume ingest from
+
+        0 if there is no checkpoint, or if collection_name is given and the
+        checkpoint was saved while ingesting into another collection.
+        """
+        checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE)
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if collection_name is not None and checkpoint.get("collection_name") != collection_name:
+            return 0
+        return checkpoint["offset"]
+
+    def save_checkpoint(self, offset, collection_name=None):
+        """Atomically record the next row offset to ingest into collection_name"""
+        checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE)
+        tmp_path = checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": int(offset), "count": len(self), "collection_name": collection_name,
+                       "updated": time.time()}, f)
+        os.replace(tmp_path, checkpoint_path)
+
+    def clear_checkpoint(self):
+        """Forget any saved ingest progress"""
+        checkpoint_path = os.path.join(self.path, CHECKPOINT_FILE)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+
+def ingest_dataset(client, collection_name, dataset, window_size=50_000, chunk_size=1000,
+                   workers=4, resume=True, progress=None):
+    """Upload a dataset window by window, checkpointing after each one
+
+    Each window is sent with bulk_upsert (wait=True) and the checkpoint only
+    moves past it once every chunk has been applied, so an interrupted
+    ingest can be resumed with resume=True without re-sending completed
+    windows. A checkpoint saved for another collection, or one the
+    collection no longer holds (it was reset or emptied since), is ignored
+    and the ingest starts over.
+    progress, if given, is called as progress(done_rows, total_rows, stats).
+
+    Returns a dict with start_offset, points, seconds and points_per_sec.
+    """
+    start_offset = dataset.load_checkpoint(collection_name) if resume else 0
+    if start_offset and client.count(collection_name=collection_name, exact=True).count < start_offset:
+        start_offset = 0
+    total = len(dataset)
+    num_points = 0
+    start_time = time.perf_counter()
+
+    for offset, ids, vectors, payloads in _iter_windows(dataset, window_size, start_offset):
+        stats = bulk_upsert(
+            client,
+            collection_name,
+            vectors,
+            ids=ids,
+            payloads=payloads,
+            chunk_size=chunk_size,
+            workers=workers,
+            wait=True
+        )
+        num_points += stats["points"]
+        dataset.save_checkpoint(offset + stats["points"], collection_name)
+        if progress is not None:
+            progress(offset + stats["points"], total, stats)
+
+    dataset.clear_checkpoint()
+    seconds = time.perf_counter() - start_time
+    return {
+        "start_offset": start_offset,
+        "points": num_points,
+        "seconds": seconds,
+        "points_per_sec": num_points / seconds if seconds > 0 else 0.0,
+    }
+
+
+def _iter_windows(dataset, window_size, start):
+    """Yield (offset, ids, vectors, payloads) windows without decoding payloads early"""
+    for offset in range(start, len(dataset), window_size):
+        end = min(offset + window_size, len(dataset))
+        payloads = _PayloadWindow(dataset.payloads, offset, end)
+        yield offset, dataset.ids[offset:end], dataset.vectors[offset:end], payloads
+
+
+class _PayloadWindow:
+    """Slice of a PayloadColumn that defers decoding until a chunk is taken"""
+
+    def __init__(self, column, start, end):
+        self.column = column
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(len(self))
+        return self.column[self.start + start:self.start + stop]
+
+
+def iter_scroll(client, collection_name, start=None, end=None, page_size=1000, with_vectors=True, with_payload=True):
+    """Yield pages of records, following next_page_offset from start up to (not including) end
+
+    Scroll returns points in id order, so [start, end) is a contiguous id
+    range; the page that crosses end is trimmed and the scan stops there.
+    """
+    offset = start
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            offset=offset,
+            limit=page_size,
+            with_vectors=with_vectors,
+            with_payload=with_payload
+        )
+        if end is not None and records and records[-1].id >= end:
+            records = [record for record in records if record.id < end]
+            offset = None
+        if records:
+            yield records
+        if offset is None:
+            return
+
+
+def plan_partitions(client, collection_name, partitions, samples_per_partition=256):
+    """Split the collection's id space into contiguous ranges holding about equal numbers of points
+
+    The boundaries are quantiles of a random sample of ids, fetched with
+    one query_points SampleQuery without vectors or payloads, so planning
+    costs a single request whatever the collection size; the ranges are
+    only as even as the sample. Returns a list of (start_id, end_id) with
+    start_id None for the first range and end_id None for the last.
+    """
+    if partitions <= 1:
+        return [(None, None)]
+
+    sample = client.query_points(
+        collection_name=collection_name,
+        query=models.SampleQuery(sample=models.Sample.RANDOM),
+        limit=partitions * samples_per_partition,
+        with_payload=False,
+        with_vectors=False
+    ).points
+    ids = [point.id for point in sample]
+    if not all(isinstance(point_id, int) for point_id in ids):
+        raise ValueError("export_dataset only supports integer point ids")
+    if len(ids) < partitions:
+        return [(None, None)]
+
+    ids = np.sort(ids)
+    quantiles = np.linspace(0, len(ids), partitions + 1).astype(int)[1:-1]
+    bounds = np.unique(ids[quantiles]).tolist()
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def export_dataset(client, collection_name, path, partitions=4, page_size=1000, progress=None):
+    """Stream a collection into a dataset directory (see the module docstring)
+
+    The id space is split with plan_partitions and each range is scrolled by
+    its own worker. A worker claims the next free rows for every page it
+    reads, writes vectors and ids straight into those rows of the
+    memory-mapped .npy files and appends the payloads to payloads.bin, so
+    memory stays bounded by page_size * partitions. Rows are therefore in
+    scan order rather than id order. The collection must have one unnamed
+    vector and integer ids and should not be written to while it is
+    exported. progress, if given, is called as progress(done_points,
+    total_points).
+
+    Returns a dict with points, partitions, plan_seconds, seconds,
+    points_per_sec and mb_written.
+    """
+    vectors_config = client.get_collection(collection_name=collection_name).config.params.vectors
+    if not isinstance(vectors_config, models.VectorParams):
+        raise ValueError("export_dataset only supports collections with a single unnamed vector")
+    if is_local_client(client):
+        partitions = 1
+
+    start_time = time.perf_counter()
+    total = client.count(collection_name=collection_name, exact=True).count
+    plan = plan_partitions(client, collection_name, partitions) if total else [(None, None)]
+    plan_seconds = time.perf_counter() - start_time
+
+    os.makedirs(path, exist_ok=True)
+    vectors = np.lib.format.open_memmap(
+        os.path.join(path, VECTORS_FILE), mode="w+", dtype=np.float32, shape=(total, vectors_config.size)
+    )
+    ids = np.lib.format.open_memmap(
+        os.path.join(path, IDS_FILE), mode="w+", dtype=np.int64, shape=(total,)
+    )
+    offsets = np.lib.format.open_memmap(
+        os.path.join(path, PAYLOAD_OFFSETS_FILE), mode="w+", dtype=np.int64, shape=(total + 1,)
+    )
+    offsets[0] = 0
+
+    lock = threading.Lock()
+    next_row = [0]
+    payload_bytes = [0]
+
+    def export_range(payload_file, start, end):
+        for records in iter_scroll(client, collection_name, start, end, page_size):
+            page_vectors = np.asarray([record.vector for record in records], dtype=np.float32)
+            encoded = [json.dumps(record.payload).encode("utf-8") if record.payload else b"" for record in records]
+            ends = np.cumsum([len(payload) for payload in encoded])
+            # Claim rows and append payloads together, so payloads.bin stays in row order
+            with lock:
+                row = next_row[0]
+                if row + len(records) > total:
+                    raise RuntimeError(f"Collection '{collection_name}' grew during export")
+                next_row[0] += len(records)
+                offsets[row + 1:row + len(records) + 1] = payload_bytes[0] + ends
+                payload_file.write(b"".join(encoded))
+                payload_bytes[0] += int(ends[-1])
+                if progress is not None:
+                    progress(next_row[0], total)
+            vectors[row:row + len(records)] = page_vectors
+            ids[row:row + len(records)] = [record.id for record in records]
+
+    with open(os.path.join(path, PAYLOADS_FILE), "wb") as payload_file:
+        with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+            futures = [executor.submit(export_range, payload_file, start, end) for start, end in plan]
+            for future in futures:
+                future.result()
+    if next_row[0] != total:
+        raise RuntimeError(f"Collection '{collection_name}' shrank during export")
+
+    # A checkpoint left by an earlier ingest from this directory no longer applies
+    checkpoint_path = os.path.join(path, CHECKPOINT_FILE)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    mb_written = (vectors.nbytes + ids.nbytes + offsets.nbytes + payload_bytes[0]) / (1024 * 1024)
+    for array in (vectors, ids, offsets):
+        array.flush()
+    del vectors, ids, offsets
+
+    seconds = time.perf_counter() - start_time
+    return {
+        "points": total,
+        "partitions": len(plan),
+        "plan_seconds": plan_seconds,
+        "seconds": seconds,
+        "points_per_sec": total / seconds if seconds > 0 else 0.0,
+        "mb_written": mb_written,
+    }
+
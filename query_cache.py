@@ -0,0 +1,204 @@
+"""Client-side query result cache with TTL and LRU eviction
+
+CachedClient wraps a QdrantClient so that query_points and
+query_batch_points answer repeated (vector, filter, parameters) requests
+from memory. Any write to a collection (upsert, delete, payload updates...)
+invalidates that collection's cached results.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from pydantic import BaseModel
+
+from vector_data import as_float32
+
+# Client methods that change the points of the collection they are called on
+WRITE_METHODS = (
+    "upsert",
+    "upload_points",
+    "upload_collection",
+    "delete",
+    "update_vectors",
+    "delete_vectors",
+    "set_payload",
+    "overwrite_payload",
+    "delete_payload",
+    "clear_payload",
+    "batch_update_points",
+    "create_collection",
+    "recreate_collection",
+    "delete_collection",
+    "update_collection",
+)
+
+
+def _serialize(value):
+    """Serialize filters, request models and plain values into a stable string"""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json(exclude_none=True)
+    if isinstance(value, np.ndarray):
+        return json.dumps(value.tolist())
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+class QueryCache:
+    """LRU cache of query results with a per-entry time to live
+
+    Vectors are rounded to `decimals` before hashing, so float64 and float32
+    copies of the same query share an entry. All methods are thread-safe.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=60.0, decimals=4):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.decimals = decimals
+        self._entries = OrderedDict()  # key -> (collection_name, expires_at, result)
+        self._generations = {}  # collection_name -> write counter
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def make_key(self, collection_name, vector, query_filter=None, **params):
+        """Build a cache key from the quantized vector, the filter and other parameters"""
+        quantized = np.round(as_float32(vector), self.decimals)
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        digest.update(_serialize(query_filter).encode("utf-8"))
+        digest.update(_serialize({name: _serialize(value) for name, value in params.items()}).encode("utf-8"))
+        return collection_name, digest.hexdigest()
+
+    def generation(self, collection_name):
+        """Return the write counter used to discard results fetched before a write"""
+        with self._lock:
+            return self._generations.get(collection_name, 0)
+
+    def get(self, key):
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            _, expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result, generation):
+        """Store result unless the collection was written since generation was read"""
+        collection_name = key[0]
+        with self._lock:
+            if self._generations.get(collection_name, 0) != generation:
+                return
+            self._entries[key] = (collection_name, time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, collection_name):
+        """Drop every cached result for collection_name"""
+        with self._lock:
+            self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+            stale = [key for key in self._entries if key[0] == collection_name]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every cached result and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def stats(self):
+        """Return the hit/miss/eviction counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+def _is_vector(query):
+    """Only raw dense vectors are cached; other query types pass through"""
+    if isinstance(query, np.ndarray):
+        return query.ndim == 1
+    return isinstance(query, list) and all(isinstance(x, (int, float)) for x in query)
+
+
+class CachedClient:
+    """QdrantClient proxy that caches query results and invalidates on writes"""
+
+    def __init__(self, client, cache=None):
+        self.client = client
+        self.cache = cache if cache is not None else QueryCache()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name in WRITE_METHODS:
+            def write(*args, **kwargs):
+                collection_name = kwargs.get("collection_name", args[0] if args else None)
+                try:
+                    return attribute(*args, **kwargs)
+                finally:
+                    self.cache.invalidate(collection_name)
+            return write
+        return attribute
+
+    def query_points(self, collection_name, query=None, query_filter=None, **kwargs):
+        if not _is_vector(query):
+            return self.client.query_points(collection_name=collection_name, query=query,
+                                            query_filter=query_filter, **kwargs)
+        key = self.cache.make_key(collection_name, query, query_filter, **kwargs)
+        result = self.cache.get(key)
+        if result is None:
+            generation = self.cache.generation(collection_name)
+            result = self.client.query_points(collection_name=collection_name, query=query,
+                                              query_filter=query_filter, **kwargs)
+            self.cache.put(key, result, generation)
+        return result
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        """Answer cached requests from memory and send only the misses in one batch"""
+        results = [None] * len(requests)
+        missing = []
+        for i, request in enumerate(requests):
+            if not _is_vector(request.query):
+                missing.append((i, None))
+                continue
+            params = request.model_dump(exclude={"query", "filter"}, exclude_none=True)
+            key = self.cache.make_key(collection_name, request.query, request.filter, **params, **kwargs)
+            results[i] = self.cache.get(key)
+            if results[i] is None:
+                missing.append((i, key))
+
+        if missing:
+            generation = self.cache.generation(collection_name)
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[requests[i] for i, _ in missing],
+                **kwargs
+            )
+            for (i, key), response in zip(missing, responses):
+                results[i] = response
+                if key is not None:
+                    self.cache.put(key, response, generation)
+        return results
@@ -1,10 +1,34 @@
 import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_client.http.models import CollectionStatus, Distance, VectorParams, PointStruct
+from qdrant_client.http.models import CollectionStatus
 import uuid
-import random
+import argparse
 import os
+import sys
+import time
+
+from adaptive_batch import BatchSizer, adaptive_query_batches
+from async_ops import WORKLOADS, async_client_options, compare_sync_async, query_many, run_async, upsert_many
+from benchmark import (SHARD_LAYOUTS, compare_results, format_row, load_results, run_benchmark,
+                       run_engine_comparison, run_payload_index_benchmark, run_profile_sweep, run_shard_benchmark,
+                       run_transport_benchmark, write_csv, write_json)
+from bulk_ops import bulk_delete, bulk_load, bulk_upsert, compare_bulk_load, compare_payload_paths, is_local_client
+from collection_config import (COLLECTION_PROFILES, PAYLOAD_SCHEMA, collection_kwargs, create_payload_indexes,
+                               profile_search_params)
+from evaluation import evaluate_search, hnsw_ef_sweep
+from hybrid import compare_hybrid_search, create_hybrid_collection, hybrid_queries, search, upsert_hybrid
+from mmap_dataset import VectorDataset, export_dataset, ingest_dataset
+from ingest_pipeline import HashingEmbedder, generated_records, jsonl_records, run_ingest_pipeline
+from incremental_sync import DEFAULT_MANIFEST, SyncManifest, incremental_sync
+from instrumentation import InstrumentedClient
+from query_cache import CachedClient, QueryCache
+from sharding import ShardedCollection
+from stress import DEFAULT_READ_RATES, DEFAULT_WRITE_RATES, run_stress
+from transport import DEFAULT_URL, ClientPool, connect_or_local, transport_options
+from vector_data import (VECTOR_MODES, PayloadColumns, as_float32, compare_vector_paths, random_payload_columns,
+                         random_sparse_vectors, random_vectors, to_client_vectors, upload_vectors)
+from workload import load_workload, run_workload
 
 # Global variables
 client = None
@@ -12,6 +36,15 @@ my_collection = "qdrant_101_collection"
 data = None
 point_ids = None
 query_vector = None
+vector_mode = "array"  # "array" sends float32 ndarrays, "list" sends Python float lists
+dataset = None  # VectorDataset when working from an on-disk dataset
+use_async = False  # Route search and insert through AsyncQdrantClient
+async_concurrency = 16
+collection_profile = "default"  # Key of COLLECTION_PROFILES used when creating the collection
+transport = "rest"  # "rest" sends JSON over HTTP, "grpc" sends protobuf over gRPC
+sharded_collection = None  # ShardedCollection that Vector Search fans out to, when enabled
+query_batch_sizer = BatchSizer()  # Keeps the learned query_batch_points size between batch searches
+sync_enabled = False  # Insert/Update Points uploads only what changed since the last sync
 
 def clear_screen():
     """Clear the terminal screen"""
@@ -26,8 +59,12 @@ def connect_to_qdrant():
     """Connect to Qdrant instance"""
     global client
     try:
-        client = QdrantClient("http://localhost:6333")
-        print("✅ Connected to Qdrant at http://localhost:6333")
+        client, is_server = connect_or_local(DEFAULT_URL, transport)
+        if is_server:
+            print(f"✅ Connected to Qdrant at {DEFAULT_URL} over {transport}")
+        else:
+            print(f"⚠️ No Qdrant server at {DEFAULT_URL}; using the embedded in-memory engine")
+            print("   Payload indexes, HNSW and quantization settings are ignored and data is lost on exit")
         return True
     except Exception as e:
         print(f"❌ Failed to connect to Qdrant: {e}")
@@ -48,12 +85,44 @@ def show_main_menu():
     print("10. Advanced Payload Operations")
     print("11. Run All Operations (Demo Mode)")
     print("12. Reset Collection")
+    print("13. Performance Tools")
     print("0.  Exit")
     print("-" * 30)
 
+def show_performance_menu():
+    """Display the performance tools menu"""
+    print("\n⚡ Performance Tools:")
+    print("1.  Bulk Insert Points (chunked, parallel)")
+    print("2.  Compare Vector Paths (list vs float32 array)")
+    print(f"3.  Switch Vector Path (current: {vector_mode})")
+    print("4.  Create/Open On-Disk Dataset (memory-mapped)")
+    print(f"5.  Switch Client Mode (current: {'async' if use_async else 'sync'})")
+    print("6.  Compare Sync vs Async Throughput")
+    print("7.  Run Benchmark Suite (JSON/CSV results)")
+    print(f"8.  Query Cache (current: {'on' if isinstance(client, CachedClient) else 'off'})")
+    print("9.  Payload Index Benchmark (filtered search with/without indexes)")
+    print(f"10. Switch Collection Profile (current: {collection_profile})")
+    print("11. Collection Profile Sweep (recall@k, latency, memory)")
+    print("12. Recall Evaluation (exact NumPy baseline, hnsw_ef sweep)")
+    print("13. Bulk Load with Deferred Indexing")
+    print("14. Compare Payload Paths (per-point vs columnar)")
+    print("15. Export Collection to Dataset")
+    print(f"16. Switch Transport (current: {transport})")
+    print("17. Compare REST vs gRPC")
+    print(f"18. Client Instrumentation (current: {'on' if instrumented_client() is not None else 'off'})")
+    print(f"19. Sharded Layout (current: {sharded_collection.shards if sharded_collection else 'off'})")
+    print("20. Shard Scaling Benchmark")
+    print("21. Compare Local Engine vs Server")
+    print("22. Hybrid Search (dense + sparse, RRF fusion)")
+    print("23. Mixed Read/Write Stress Test")
+    print("24. Embed & Ingest Text (pipeline)")
+    print(f"25. Incremental Sync (current: {'on' if sync_enabled else 'off'})")
+    print("0.  Back")
+    print("-" * 30)
+
 def setup_collection_and_data():
     """Setup collection and generate sample data"""
-    global data, point_ids, query_vector
+    global data, point_ids, query_vector, dataset
     
     print("\n1️⃣ Setting up Collection & Data")
     print("-" * 30)
@@ -71,11 +140,12 @@ def setup_collection_and_data():
                 try:
                     first_collection = client.create_collection(
                         collection_name=my_collection,
-                        vectors_config=VectorParams(size=100, distance=Distance.COSINE)
+                        **collection_kwargs(collection_profile)
                     )
                     print(f"✅ Collection '{my_collection}' created successfully")
                     print(f"   Vector size: 100")
                     print(f"   Distance metric: COSINE")
+                    print(f"   Profile: {collection_profile}")
                 except Exception as e:
                     print(f"❌ Failed to create collection: {e}")
                     return False
@@ -90,28 +160,41 @@ def setup_collection_and_data():
         try:
             first_collection = client.create_collection(
                 collection_name=my_collection,
-                vectors_config=VectorParams(size=100, distance=Distance.COSINE)
+                **collection_kwargs(collection_profile)
             )
             print(f"✅ Collection '{my_collection}' created successfully")
             print(f"   Vector size: 100")
             print(f"   Distance metric: COSINE")
+            print(f"   Profile: {collection_profile}")
         except Exception as e:
             print(f"❌ Failed to create collection: {e}")
             return False
     
+    # Index the payload fields used by filtered search
+    try:
+        created = create_payload_indexes(client, my_collection)
+        if created:
+            print(f"✅ Payload indexes created: " + ", ".join(
+                f"{field} ({PAYLOAD_SCHEMA[field].value})" for field in created
+            ))
+    except Exception as e:
+        print(f"⚠️ Failed to create payload indexes: {e}")
+    
     # Generate sample data
     num_points = input("📊 Number of points to generate (default 1000): ").strip()
     num_points = int(num_points) if num_points.isdigit() else 1000
     
-    data = np.random.uniform(low=-1.0, high=1.0, size=(num_points, 100))
+    # With incremental sync on, the same seed regenerates the same vectors, so re-inserting sends nothing
+    data = random_vectors(num_points, seed=42 if sync_enabled else None)
+    dataset = None
     point_ids = list(range(len(data)))
-    query_vector = np.random.uniform(low=-1.0, high=1.0, size=100).tolist()
+    query_vector = random_vectors(1)[0]
     
     print(f"✅ Generated {len(data)} random vectors of dimension {data.shape[1]}")
-    print(f"   Data type: {type(data[0, 0])}")
+    print(f"   Data type: {data.dtype} ({data.nbytes / (1024 * 1024):.1f} MB, contiguous)")
     print(f"   Sample values: {data[0, :5].tolist()}")
     print(f"✅ Created point IDs: {point_ids[:5]}...{point_ids[-5:]}")
-    print(f"✅ Generated query vector: {query_vector[:5]}")
+    print(f"✅ Generated query vector: {query_vector[:5].tolist()}")
     
     return True
 
@@ -126,6 +209,11 @@ def show_collection_info():
         print(f"📊 Points Count: {collection_info.points_count}")
         print(f"📊 Vector Size: {collection_info.config.params.vectors.size}")
         print(f"📊 Distance Metric: {collection_info.config.params.vectors.distance}")
+        print(f"📊 Vectors On Disk: {bool(collection_info.config.params.vectors.on_disk)}")
+        print(f"📊 HNSW: m={collection_info.config.hnsw_config.m}, "
+              f"ef_construct={collection_info.config.hnsw_config.ef_construct}")
+        quantization = collection_info.config.quantization_config
+        print(f"📊 Quantization: {type(quantization).__name__ if quantization else 'none'}")
     except Exception as e:
         print(f"❌ Failed to get collection info: {e}")
 
@@ -138,18 +226,899 @@ def insert_points():
         print("❌ No data available. Please run 'Setup Collection & Data' first.")
         return
     
+    if sync_enabled:
+        sync_points()
+        return
+    
+    if dataset is not None:
+        insert_dataset_points()
+        return
+    
+    if use_async:
+        try:
+            summary = run_async(
+                async_client_options(client), upsert_many,
+                my_collection, data, point_ids, concurrency=async_concurrency
+            )
+            print(f"✅ Successfully inserted {summary['items']} points (async, {async_concurrency} concurrent requests)")
+            print(f"   Throughput: {summary['throughput']:.0f} points/sec, "
+                  f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms per chunk")
+        except Exception as e:
+            print(f"❌ Failed to insert points: {e}")
+        finally:
+            invalidate_query_cache()
+        return
+    
     try:
-        upsert_result = client.upsert(
-            collection_name=my_collection,
-            points=models.Batch(
-                ids=point_ids,
-                vectors=data.tolist()
+        operation_id = upload_vectors(client, my_collection, data, point_ids, mode=vector_mode)
+        print(f"✅ Successfully inserted {len(point_ids)} points ({vector_mode} path)")
+        if operation_id is not None:
+            print(f"   Operation ID: {operation_id}")
+    except Exception as e:
+        print(f"❌ Failed to insert points: {e}")
+
+def sync_points():
+    """Upload only new or changed points and delete the ones missing from the data"""
+    vectors = dataset.vectors if dataset is not None else data
+    ids = dataset.ids if dataset is not None else point_ids
+    payloads = dataset.payloads if dataset is not None else None
+    
+    try:
+        stats = incremental_sync(client, my_collection, vectors, ids=ids, payloads=payloads)
+        print(f"✅ Synced {stats['points']} points: {stats['new']} new, {stats['changed']} changed, "
+              f"{stats['unchanged']} unchanged, {stats['deleted']} deleted")
+        print(f"   Uploaded {stats['uploaded_fraction']:.1%} of the points in {stats['seconds']:.2f}s "
+              f"(hashing {stats['hash_seconds']:.2f}s, upload {stats['upload_seconds']:.2f}s)")
+    except Exception as e:
+        print(f"❌ Failed to sync points: {e}")
+
+def insert_dataset_points():
+    """Insert the on-disk dataset window by window, resuming from its checkpoint"""
+    resume = True
+    checkpoint = dataset.load_checkpoint(my_collection)
+    if checkpoint > 0:
+        print(f"⏸️ Previous ingest stopped at row {checkpoint} of {len(dataset)}")
+        resume = input("🔄 Resume from checkpoint? (y/n, default y): ").strip().lower() != 'n'
+    
+    def report(done, total, stats):
+        print(f"   {done}/{total} points ({stats['points_per_sec']:.0f} points/sec)")
+    
+    try:
+        stats = ingest_dataset(client, my_collection, dataset, resume=resume, progress=report)
+        print(f"✅ Inserted {stats['points']} points from '{dataset.path}' starting at row {stats['start_offset']}")
+        print(f"   Time: {stats['seconds']:.2f}s ({stats['points_per_sec']:.0f} points/sec)")
+    except KeyboardInterrupt:
+        print(f"\n⏸️ Ingest interrupted at row {dataset.load_checkpoint(my_collection)}; run Insert again to resume")
+    except Exception as e:
+        print(f"❌ Failed to insert dataset points: {e}")
+        print(f"   Progress saved at row {dataset.load_checkpoint(my_collection)}")
+
+def open_dataset():
+    """Create or open a memory-mapped on-disk dataset"""
+    global data, point_ids, query_vector, dataset
+    
+    print("\n💾 On-Disk Dataset")
+    print("-" * 30)
+    
+    path = input("📁 Dataset directory (default ./qdrant_dataset): ").strip() or "qdrant_dataset"
+    
+    try:
+        if VectorDataset.exists(path):
+            dataset = VectorDataset(path)
+            print(f"✅ Opened dataset '{path}' with {len(dataset)} vectors of dimension {dataset.dim}")
+        else:
+            num_points = input("📊 Number of points to write (default 1000000): ").strip()
+            num_points = int(num_points) if num_points.isdigit() else 1000000
+            print(f"💾 Writing {num_points} vectors to '{path}'...")
+            dataset = VectorDataset.create(path, num_points)
+            print(f"✅ Created dataset '{path}' with {len(dataset)} vectors of dimension {dataset.dim}")
+        
+        data = dataset.vectors
+        point_ids = dataset.ids
+        query_vector = dataset.sample_queries(1)[0]
+        print(f"   Vectors on disk: {data.nbytes / (1024 * 1024):.1f} MB (memory-mapped)")
+        print(f"   Sample payload: {dataset.payloads[0]}")
+        checkpoint = dataset.load_checkpoint(my_collection)
+        if checkpoint > 0:
+            print(f"⏸️ Unfinished ingest checkpoint at row {checkpoint}")
+        print("💡 Insert/Update Points and the search menus now use this dataset")
+    except Exception as e:
+        print(f"❌ Failed to open dataset: {e}")
+
+def bulk_insert_points():
+    """Insert points in chunks over parallel workers"""
+    print("\n📦 Bulk Insert Points")
+    print("-" * 30)
+    
+    if data is None:
+        print("❌ No data available. Please run 'Setup Collection & Data' first.")
+        return
+    
+    chunk_size = input("📦 Points per chunk (default 1000): ").strip()
+    chunk_size = int(chunk_size) if chunk_size.isdigit() and int(chunk_size) > 0 else 1000
+    
+    workers = input("🧵 Parallel workers (default 4): ").strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else 4
+    
+    wait = input("⏳ Wait for each chunk to be applied? (y/n, default n): ").strip().lower() == 'y'
+    
+    pool = None
+    if workers > 1 and not is_local_client(client):
+        if input(f"🔌 Give each worker its own {transport} connection? (y/n, default n): ").strip().lower() == 'y':
+            pool = ClientPool(client.init_options, workers)
+    
+    try:
+        # Pooled writes still go through the query cache (so it is invalidated) and the instrumentation
+        stats = bulk_upsert(
+            wrap_like_client(pool) if pool is not None else client,
+            my_collection,
+            data,
+            ids=point_ids,
+            chunk_size=chunk_size,
+            workers=workers,
+            wait=wait
+        )
+        print(f"✅ Bulk inserted {stats['points']} points in {stats['chunks']} chunks")
+        print(f"   Time: {stats['seconds']:.2f}s")
+        print(f"   Throughput: {stats['points_per_sec']:.0f} points/sec")
+        if stats['peak_rss_mb'] is not None:
+            print(f"   Peak RSS: {stats['peak_rss_mb']:.1f} MB")
+    except Exception as e:
+        print(f"❌ Failed to bulk insert points: {e}")
+    finally:
+        if pool is not None:
+            pool.close()
+
+def compare_vector_path_performance():
+    """Measure the list path against the float32 array path"""
+    print("\n⚖️ Compare Vector Paths")
+    print("-" * 30)
+    
+    if data is None:
+        print("❌ No data available. Please run 'Setup Collection & Data' first.")
+        return
+    
+    count = input(f"🔢 Points per path (default {min(len(data), 10000)}, at most 50000): ").strip()
+    count = min(int(count), 50000) if count.isdigit() and int(count) > 0 else 10000
+    count = min(count, len(data))
+    
+    num_queries = input("🔍 Number of query vectors to time (default 100): ").strip()
+    num_queries = int(num_queries) if num_queries.isdigit() else 100
+    
+    # Each path uploads twice (timed and traced), so use a scratch collection rather than the tutorial one
+    scratch_collection = f"{my_collection}_vector_paths"
+    try:
+        if client.collection_exists(collection_name=scratch_collection):
+            client.delete_collection(collection_name=scratch_collection)
+        client.create_collection(collection_name=scratch_collection, **collection_kwargs(collection_profile))
+        results = compare_vector_paths(
+            measurement_client(),
+            scratch_collection,
+            as_float32(data[:count]),
+            point_ids[:count],
+            queries=random_vectors(num_queries)
+        )
+        print(f"✅ Compared paths on {count} vectors and {num_queries} queries:")
+        for mode, stats in results.items():
+            print(f"   {mode:5} path: data {stats['data_mb']:.1f} MB, peak alloc {stats['peak_mb']:.1f} MB, "
+                  f"upload {stats['upload_seconds']:.2f}s, queries {stats['query_seconds']:.2f}s")
+        saved = results['list']['peak_mb'] - results['array']['peak_mb']
+        print(f"💡 Array path saved {saved:.1f} MB of peak allocations")
+    except Exception as e:
+        print(f"❌ Failed to compare vector paths: {e}")
+    finally:
+        if client.collection_exists(collection_name=scratch_collection):
+            client.delete_collection(collection_name=scratch_collection)
+
+def switch_vector_path():
+    """Toggle between the list path and the float32 array path"""
+    global vector_mode
+    vector_mode = VECTOR_MODES[(VECTOR_MODES.index(vector_mode) + 1) % len(VECTOR_MODES)]
+    print(f"\n🔀 Vector path switched to '{vector_mode}'")
+
+def switch_client_mode():
+    """Toggle between the blocking client and the async client"""
+    global use_async, async_concurrency
+    
+    if use_async:
+        use_async = False
+        print("\n🔀 Client mode switched to 'sync'")
+        return
+    
+    try:
+        async_client_options(client)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return
+    
+    concurrency = input("⚡ Max concurrent requests (default 16): ").strip()
+    async_concurrency = int(concurrency) if concurrency.isdigit() and int(concurrency) > 0 else 16
+    use_async = True
+    print(f"🔀 Client mode switched to 'async' ({async_concurrency} concurrent requests)")
+
+def compare_sync_async_performance():
+    """Run the same workload on the sync and async clients"""
+    print("\n⚖️ Compare Sync vs Async")
+    print("-" * 30)
+    
+    workload = input(f"🎯 Workload ({'/'.join(WORKLOADS)}, default search): ").strip().lower() or "search"
+    if workload not in WORKLOADS:
+        print("❌ Invalid workload")
+        return
+    
+    count = input("🔢 Number of queries or points (default 1000): ").strip()
+    count = int(count) if count.isdigit() else 1000
+    
+    concurrency = input(f"⚡ Async concurrency (default {async_concurrency}): ").strip()
+    concurrency = int(concurrency) if concurrency.isdigit() and int(concurrency) > 0 else async_concurrency
+    
+    try:
+        if workload == "ingest":
+            # Use ids past the sample data so the comparison does not overwrite it
+            vectors = random_vectors(count)
+            ids = range(10_000_000, 10_000_000 + count)
+        else:
+            vectors = dataset.sample_queries(count) if dataset is not None else random_vectors(count)
+            ids = None
+        results = compare_sync_async(measurement_client(), my_collection, workload, vectors, ids=ids, concurrency=concurrency)
+        print(f"✅ {workload} workload on {count} items:")
+        for mode, summary in results.items():
+            print(f"   {mode:5}: {summary['throughput']:.0f} items/sec, "
+                  f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms over {summary['requests']} requests")
+        speedup = results['async']['throughput'] / results['sync']['throughput'] if results['sync']['throughput'] else 0
+        print(f"💡 Async throughput: {speedup:.1f}x sync")
+        if workload == "ingest":
+            client.delete(
+                collection_name=my_collection,
+                points_selector=models.PointIdsList(points=list(ids))
             )
+    except Exception as e:
+        print(f"❌ Failed to compare sync and async: {e}")
+    finally:
+        if workload == "ingest":
+            invalidate_query_cache()
+
+def run_benchmark_suite():
+    """Benchmark every operation and save the results"""
+    print("\n📈 Benchmark Suite")
+    print("-" * 30)
+    print("💡 Uses a separate benchmark collection; your tutorial data is not touched")
+    
+    sizes = input("📊 Dataset sizes (comma-separated, default 1000,10000): ").strip() or "1000,10000"
+    levels = input("⚡ Concurrency levels (comma-separated, default 1,4): ").strip() or "1,4"
+    output = input("💾 Results file (default benchmark_results.json): ").strip() or "benchmark_results.json"
+    baseline = input("⚖️ Baseline results to compare against (optional): ").strip()
+    
+    try:
+        sizes = [int(x.strip()) for x in sizes.split(',')]
+        levels = [int(x.strip()) for x in levels.split(',')]
+        results = run_benchmark(measurement_client(), sizes, levels, progress=lambda row: print(f"   {format_row(row)}"))
+        write_json(results, output, {"target": client.init_options.get("location")})
+        csv_output = os.path.splitext(output)[0] + ".csv"
+        write_csv(results, csv_output)
+        print(f"✅ {len(results)} results written to {output} and {csv_output}")
+        
+        if baseline:
+            comparisons = compare_results(load_results(baseline), results)
+            regressions = [c for c in comparisons if c['regression']]
+            for c in regressions:
+                print(f"⚠️ {c['operation']} size={c['dataset_size']} conc={c['concurrency']} "
+                      f"{c['metric']}: {c['baseline']:.2f} → {c['current']:.2f} ({c['change']:+.1%})")
+            print(f"{'❌' if regressions else '✅'} {len(regressions)} regression(s) in {len(comparisons)} comparisons")
+    except Exception as e:
+        print(f"❌ Failed to run benchmark suite: {e}")
+
+def manage_query_cache():
+    """Enable, inspect or disable the client-side query cache"""
+    global client
+    
+    print("\n🗃️ Query Cache")
+    print("-" * 30)
+    
+    if isinstance(client, CachedClient):
+        stats = client.cache.stats()
+        print(f"📊 Entries: {stats['entries']}/{client.cache.max_entries} (TTL {client.cache.ttl_seconds:g}s)")
+        print(f"📊 Hits: {stats['hits']}, Misses: {stats['misses']}, Hit rate: {stats['hit_rate']:.1%}")
+        print(f"📊 Evictions: {stats['evictions']}, Expirations: {stats['expirations']}, "
+              f"Invalidations: {stats['invalidations']}")
+        if input("🔌 Disable query cache? (y/n, default n): ").strip().lower() == 'y':
+            client = client.client
+            print("✅ Query cache disabled")
+        return
+    
+    max_entries = input("🗃️ Max cached queries (default 1024): ").strip()
+    max_entries = int(max_entries) if max_entries.isdigit() and int(max_entries) > 0 else 1024
+    
+    ttl = input("⏱️ Time to live in seconds (default 60): ").strip()
+    ttl = int(ttl) if ttl.isdigit() else 60
+    
+    client = CachedClient(client, QueryCache(max_entries=max_entries, ttl_seconds=ttl))
+    print(f"✅ Query cache enabled: {max_entries} entries, {ttl}s TTL")
+    print("💡 Vector and filtered searches are now served from the cache when repeated;")
+    print("   inserts, deletes and payload updates invalidate the collection's entries")
+
+def payload_index_benchmark():
+    """Compare filtered-search latency with and without payload indexes"""
+    print("\n📇 Payload Index Benchmark")
+    print("-" * 30)
+    print("💡 Uses a separate benchmark collection; your tutorial data is not touched")
+    
+    sizes = input("📊 Collection sizes (comma-separated, default 10000,100000): ").strip() or "10000,100000"
+    
+    try:
+        sizes = [int(x.strip()) for x in sizes.split(',')]
+        results = run_payload_index_benchmark(measurement_client(), sizes, progress=lambda row: print(f"   {format_row(row)}"))
+        for unindexed, indexed in zip(results[::2], results[1::2]):
+            speedup = unindexed['p50_ms'] / indexed['p50_ms'] if indexed['p50_ms'] else 0
+            print(f"✅ {unindexed['dataset_size']} points: p50 {unindexed['p50_ms']:.2f} ms → {indexed['p50_ms']:.2f} ms "
+                  f"({speedup:.1f}x), indexing took {indexed['index_seconds']:.2f}s")
+    except Exception as e:
+        print(f"❌ Failed to run payload index benchmark: {e}")
+
+def switch_collection_profile():
+    """Choose the HNSW/quantization/on-disk profile for new collections"""
+    global collection_profile
+    
+    print("\n🧩 Collection Profiles")
+    print("-" * 30)
+    names = list(COLLECTION_PROFILES)
+    for i, name in enumerate(names, 1):
+        marker = " (current)" if name == collection_profile else ""
+        print(f"{i}. {name}{marker} - {COLLECTION_PROFILES[name]['description']}")
+    
+    choice = input(f"🧩 Select a profile (1-{len(names)}): ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(names):
+        print("❌ Invalid profile")
+        return
+    
+    collection_profile = names[int(choice) - 1]
+    print(f"✅ Profile set to '{collection_profile}'")
+    print("💡 Reset the collection and run 'Setup Collection & Data' to apply it")
+
+def switch_transport():
+    """Reconnect over gRPC or REST, keeping the query cache and instrumentation if enabled"""
+    global client, transport
+    
+    new_transport = "grpc" if transport == "rest" else "rest"
+    try:
+        base = measurement_client()
+        new_client = QdrantClient(**transport_options(base, new_transport))
+        new_client.get_collections()
+    except Exception as e:
+        print(f"\n❌ Could not switch to {new_transport}: {e}")
+        return
+    
+    base.close()
+    client = wrap_like_client(new_client)
+    transport = new_transport
+    print(f"\n🔀 Transport switched to '{transport}'")
+
+def measurement_client():
+    """Return the client under the query cache, so timed queries always reach Qdrant instead of the cache"""
+    return client.client if isinstance(client, CachedClient) else client
+
+def instrumented_client():
+    """Return the InstrumentedClient under the query cache, or None when instrumentation is off"""
+    base = measurement_client()
+    return base if isinstance(base, InstrumentedClient) else None
+
+def invalidate_query_cache():
+    """Drop cached results for the collection after a write that bypassed the client (async client)"""
+    if isinstance(client, CachedClient):
+        client.cache.invalidate(my_collection)
+
+def wrap_like_client(new_client):
+    """Wrap new_client (a client or a ClientPool) in the current client's instrumentation and query cache"""
+    instrumented = instrumented_client()
+    if instrumented is not None:
+        new_client = InstrumentedClient(new_client, instrumented.metrics, instrumented.measure_sizes)
+    return CachedClient(new_client, client.cache) if isinstance(client, CachedClient) else new_client
+
+def manage_instrumentation():
+    """Enable, report, export, profile or disable per-method client metrics"""
+    global client
+    
+    print("\n📡 Client Instrumentation")
+    print("-" * 30)
+    
+    instrumented = instrumented_client()
+    if instrumented is None:
+        print("   Size estimates serialize every request and response once more, which slows large calls")
+        measure_sizes = input("📏 Estimate request/response sizes? (y/n, default n): ").strip().lower() == 'y'
+        if isinstance(client, CachedClient):
+            # Instrument below the cache so cache hits are not counted as API calls
+            client.client = InstrumentedClient(client.client, measure_sizes=measure_sizes)
+        else:
+            client = InstrumentedClient(client, measure_sizes=measure_sizes)
+        print("✅ Instrumentation enabled; every client call is now timed")
+        return
+    
+    print("1. Show metrics")
+    print("2. Write metrics to JSON")
+    print("3. Write metrics in Prometheus format")
+    print("4. Profile an operation (cProfile/tracemalloc)")
+    print("5. Reset metrics")
+    print("6. Disable instrumentation")
+    action = input("Select an action (1-6, default 1): ").strip() or "1"
+    
+    try:
+        if action == "1":
+            methods = instrumented.metrics.to_dict()
+            if not methods:
+                print("ℹ️ No calls recorded yet")
+            for method, stats in methods.items():
+                print(f"   {method:<20} calls={stats['calls']:<6} errors={stats['errors']:<3} "
+                      f"mean={stats['mean_ms']:.2f}ms max={stats['max_ms']:.2f}ms "
+                      f"sent={stats['request_bytes'] / 1024:.1f}KB received={stats['response_bytes'] / 1024:.1f}KB")
+            for method, profile in instrumented.metrics.profiles.items():
+                peak = f", peak {profile['peak_mb']:.2f} MB" if 'peak_mb' in profile else ""
+                print(f"\n🔬 {method}: {profile['sampled_calls']} sampled call(s){peak}")
+                print(profile['cprofile'])
+        elif action == "2":
+            path = input("💾 JSON file (default client_metrics.json): ").strip() or "client_metrics.json"
+            instrumented.metrics.write_json(path)
+            print(f"✅ Metrics written to {path}")
+        elif action == "3":
+            path = input("💾 Metrics file (default client_metrics.prom): ").strip() or "client_metrics.prom"
+            with open(path, "w") as f:
+                f.write(instrumented.metrics.to_prometheus())
+            print(f"✅ Metrics written to {path}")
+        elif action == "4":
+            method = input("🔬 Client method to profile (e.g. query_points, upsert): ").strip()
+            if not method:
+                print("❌ No method given")
+                return
+            every = input("🔁 Profile every n-th call (default 1): ").strip()
+            every = int(every) if every.isdigit() and int(every) > 0 else 1
+            memory = input("🧠 Also trace memory with tracemalloc? (y/n, default n): ").strip().lower() == 'y'
+            instrumented.profile(method, every=every, memory=memory)
+            print(f"✅ Profiling every {every} call(s) of {method}; results appear under Show metrics")
+        elif action == "5":
+            instrumented.stop_profiling()
+            instrumented.metrics.reset()
+            print("✅ Metrics reset")
+        elif action == "6":
+            if isinstance(client, CachedClient):
+                client.client = instrumented.client
+            else:
+                client = instrumented.client
+            print("✅ Instrumentation disabled")
+        else:
+            print("❌ Invalid action")
+    except Exception as e:
+        print(f"❌ Failed to manage instrumentation: {e}")
+
+def manage_incremental_sync():
+    """Turn incremental sync on or off, edit the sample data to try it, or reset the manifest"""
+    global sync_enabled, data, point_ids
+    
+    print("\n🔁 Incremental Sync")
+    print("-" * 30)
+    manifest = SyncManifest.load()
+    print(f"📒 Manifest '{DEFAULT_MANIFEST}': {len(manifest)} points of '{manifest.collection_name or '-'}'")
+    print("💡 Changes made by other tools (deletes, payload updates...) are not tracked in the manifest")
+    
+    print(f"1. Turn {'off' if sync_enabled else 'on'}")
+    print("2. Change or remove some of the sample points")
+    print("3. Clear the manifest (the next insert uploads everything)")
+    action = input("Select an action (1-3, default 1): ").strip() or "1"
+    
+    try:
+        if action == "1":
+            sync_enabled = not sync_enabled
+            print(f"✅ Incremental sync {'on' if sync_enabled else 'off'}")
+            if sync_enabled:
+                print("💡 Insert/Update Points now sends only new or changed points and deletes missing ones")
+        elif action == "2":
+            if data is None or dataset is not None:
+                print("❌ No generated sample data. Please run 'Setup Collection & Data' first.")
+                return
+            changed = input("✏️ Percent of points to change (default 1): ").strip()
+            changed = float(changed) if changed.replace('.', '', 1).isdigit() else 1.0
+            removed = input("🗑️ Percent of points to remove (default 1): ").strip()
+            removed = float(removed) if removed.replace('.', '', 1).isdigit() else 1.0
+            
+            rng = np.random.default_rng()
+            rows = rng.choice(len(data), size=int(len(data) * changed / 100), replace=False)
+            data[rows] += rng.normal(scale=0.01, size=(len(rows), data.shape[1])).astype(np.float32)
+            keep = np.ones(len(data), dtype=bool)
+            keep[rng.choice(len(data), size=int(len(data) * removed / 100), replace=False)] = False
+            data = data[keep]
+            point_ids = [point_id for point_id, kept in zip(point_ids, keep) if kept]
+            print(f"✅ Changed {len(rows)} points and removed {len(keep) - len(data)}; "
+                  f"run Insert/Update Points to sync")
+        elif action == "3":
+            manifest.clear()
+            print("✅ Manifest cleared")
+    except Exception as e:
+        print(f"❌ Failed to manage incremental sync: {e}")
+
+def manage_sharded_layout():
+    """Spread the sample data over N collections and fan Vector Search out to them"""
+    global sharded_collection
+    
+    print("\n🧩 Sharded Layout")
+    print("-" * 30)
+    
+    if sharded_collection is not None:
+        print(f"📊 {sharded_collection.shards} shards: {', '.join(sharded_collection.names)}")
+        print(f"📊 Points across shards: {sharded_collection.count()}")
+        if input("🗑️ Drop the shard collections? (y/n, default n): ").strip().lower() == 'y':
+            sharded_collection.drop()
+            sharded_collection = None
+            print("✅ Shard collections dropped; Vector Search uses the main collection again")
+        return
+    
+    if data is None:
+        print("❌ No data available. Please run 'Setup Collection & Data' first.")
+        return
+    
+    shards = input("🧩 Number of shard collections (default 4): ").strip()
+    shards = int(shards) if shards.isdigit() and int(shards) > 0 else 4
+    
+    try:
+        sharded = ShardedCollection(client, f"{my_collection}_sharded", shards)
+        sharded.create(collection_profile)
+        stats = sharded.upsert(data, point_ids)
+        print(f"✅ Loaded {stats['points']} points into {shards} shards in {stats['seconds']:.2f}s "
+              f"({stats['points_per_sec']:.0f} points/sec)")
+        print(f"   Slowest shard: {max(stats['shard_seconds']):.2f}s")
+        sharded_collection = sharded
+        print("💡 Vector Search now queries every shard in parallel and merges the top-k")
+    except Exception as e:
+        print(f"❌ Failed to build sharded layout: {e}")
+
+def shard_scaling_benchmark():
+    """Measure ingest throughput and query latency against the shard count"""
+    print("\n📐 Shard Scaling Benchmark")
+    print("-" * 30)
+    print("💡 Uses separate benchmark collections; your tutorial data is not touched")
+    
+    counts = input("🧩 Shard counts (comma-separated, default 1,2,4,8): ").strip() or "1,2,4,8"
+    size = input("📊 Points (default 10000): ").strip()
+    size = int(size) if size.isdigit() else 10000
+    layout = input(f"🗂️ Layout ({'/'.join(SHARD_LAYOUTS)}, default collections): ").strip() or "collections"
+    if layout not in SHARD_LAYOUTS:
+        print("❌ Invalid layout")
+        return
+    
+    try:
+        shard_counts = [int(x.strip()) for x in counts.split(',')]
+        results = run_shard_benchmark(measurement_client(), shard_counts, size=size, layout=layout)
+        for upsert_row, query_row in zip(results[::2], results[1::2]):
+            print(f"   {upsert_row['shards']:>3} shards: ingest {upsert_row['throughput']:.0f} points/sec, "
+                  f"query p50 {query_row['p50_ms']:.2f}ms p99 {query_row['p99_ms']:.2f}ms")
+    except Exception as e:
+        print(f"❌ Failed to run shard benchmark: {e}")
+
+def compare_engine_performance():
+    """Benchmark the embedded local engine against the server"""
+    print("\n⚖️ Compare Local Engine vs Server")
+    print("-" * 30)
+    print("💡 Uses separate benchmark collections; your tutorial data is not touched")
+    
+    size = input("📊 Dataset size (default 10000): ").strip()
+    size = int(size) if size.isdigit() else 10000
+    
+    try:
+        _, gaps = run_engine_comparison(measurement_client(), [size], [1])
+        for gap in gaps:
+            print(f"   {gap['operation']:<20} server {gap['server_throughput']:>9.0f}/s  "
+                  f"local {gap['local_throughput']:>9.0f}/s  ({gap['local_vs_server']:.1%} of server)")
+    except Exception as e:
+        print(f"❌ Failed to compare engines: {e}")
+
+def hybrid_search_comparison():
+    """Build a dense + sparse collection and compare dense, sparse and fused hybrid search"""
+    print("\n🔀 Hybrid Search (dense + sparse, RRF fusion)")
+    print("-" * 30)
+    hybrid_collection = f"{my_collection}_hybrid"
+    print(f"💡 Uses a separate collection '{hybrid_collection}'; your tutorial data is not touched")
+    
+    size = input("📊 Collection size (default 10000): ").strip()
+    size = int(size) if size.isdigit() and int(size) > 0 else 10000
+    
+    k = input("🎯 k for recall@k (default 10): ").strip()
+    k = int(k) if k.isdigit() and int(k) > 0 else 10
+    
+    try:
+        dense = random_vectors(size, seed=42)
+        sparse = random_sparse_vectors(size, seed=43)
+        print(f"🔢 {size} documents, {sparse.row_lengths().mean():.1f} non-zero sparse terms on average")
+        
+        create_hybrid_collection(client, hybrid_collection, profile=collection_profile)
+        stats = upsert_hybrid(client, hybrid_collection, dense, sparse, wait=True)
+        print(f"✅ Uploaded dense + sparse vectors at {stats['points_per_sec']:.0f} points/s")
+        
+        # Queries planted on known documents: noisy dense vector + a few of the document's terms
+        targets, dense_queries, sparse_queries = hybrid_queries(dense, sparse, 100, seed=44)
+        points = search(client, hybrid_collection, "hybrid", dense_queries[0], sparse_queries[0], limit=5)
+        print(f"\n🔍 Hybrid query for document {targets[0]}:")
+        for i, point in enumerate(points, 1):
+            print(f"   {i}. ID: {point.id}, RRF score: {point.score:.4f}")
+        
+        print(f"\n⚖️ Dense vs sparse vs hybrid on {len(targets)} queries:")
+        for row in compare_hybrid_search(measurement_client(), hybrid_collection, targets, dense_queries, sparse_queries, k=k,
+                                         search_params=profile_search_params(collection_profile)):
+            print(f"   {row['mode']:<7} recall@{k}={row['recall_at_k']:.3f}  "
+                  f"p50={row['p50_ms']:.2f}ms  p99={row['p99_ms']:.2f}ms")
+        print("💡 recall@k here is the fraction of queries whose source document is in the top k")
+    except Exception as e:
+        print(f"❌ Failed to run hybrid search: {e}")
+    finally:
+        if client.collection_exists(collection_name=hybrid_collection):
+            client.delete_collection(collection_name=hybrid_collection)
+
+def embed_and_ingest_text():
+    """Embed text documents and upsert them through the reader -> embedder -> upsert pipeline"""
+    print("\n🧬 Embed & Ingest Text")
+    print("-" * 30)
+    
+    if not client.collection_exists(collection_name=my_collection):
+        print("❌ Collection doesn't exist. Please run 'Setup Collection & Data' first.")
+        return
+    
+    path = input("📁 JSON Lines file with id/text fields (leave empty to generate documents): ").strip()
+    if path:
+        records = jsonl_records(path)
+        source = f"'{path}'"
+    else:
+        count = input("📊 Number of documents to generate (default 10000): ").strip()
+        count = int(count) if count.isdigit() else 10000
+        # High ids so the tutorial's sample points are left alone
+        records = generated_records(count, start_id=10_000_000, seed=42)
+        source = f"{count} generated documents"
+    
+    workers = input("🧵 Embedding workers (default 2): ").strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else 2
+    
+    embedder = HashingEmbedder()
+    try:
+        print(f"🚚 Ingesting {source}...")
+        stats = run_ingest_pipeline(client, my_collection, records, embedder=embedder, embed_workers=workers)
+        print(f"✅ Ingested {stats['points']} documents in {stats['seconds']:.2f}s "
+              f"({stats['points_per_sec']:.0f} docs/sec)")
+        for name, stage in stats["stages"].items():
+            print(f"   {name:<7} {stage['workers']} worker(s)  busy {stage['utilization']:>6.1%}  "
+                  f"waiting for input {stage['starved_seconds']:>6.2f}s  blocked {stage['blocked_seconds']:>6.2f}s")
+        print(f"💡 Bottleneck: {stats['bottleneck']} (busiest stage); earlier stages spend their time blocked")
+        
+        text = input("\n🔍 Search the ingested text (default 'fast vector search'): ").strip() or "fast vector search"
+        response = client.query_points(
+            collection_name=my_collection,
+            query=embedder.embed([text])[0],
+            # Only points that came through the pipeline carry a "text" payload
+            query_filter=models.Filter(must_not=[models.IsEmptyCondition(is_empty=models.PayloadField(key="text"))]),
+            limit=3,
+            with_payload=True
         )
-        print(f"✅ Successfully inserted {len(point_ids)} points")
-        print(f"   Operation ID: {upsert_result.operation_id}")
+        for i, point in enumerate(response.points, 1):
+            print(f"   {i}. ID: {point.id}, Score: {point.score:.4f}, Text: {point.payload.get('text', '-')}")
     except Exception as e:
-        print(f"❌ Failed to insert points: {e}")
+        print(f"❌ Failed to ingest text: {e}")
+
+def read_write_stress_test():
+    """Run readers alone, then readers and writers together, and report latency over time"""
+    print("\n🔥 Mixed Read/Write Stress Test")
+    print("-" * 30)
+    print("💡 Uses a separate stress collection; your tutorial data is not touched")
+    
+    duration = input("⏱️ Seconds of mixed reads and writes (default 20): ").strip()
+    duration = float(duration) if duration.replace('.', '', 1).isdigit() else 20.0
+    
+    scale = input("📈 Rate multiplier for the default request rates (default 1): ").strip()
+    scale = float(scale) if scale.replace('.', '', 1).isdigit() else 1.0
+    if scale <= 0:
+        print("❌ The rate multiplier must be greater than 0")
+        return
+    
+    wait = input("⏳ Wait for writes to be applied before acknowledging? (Y/n): ").strip().lower() != 'n'
+    
+    read_rates = {op: rate * scale for op, rate in DEFAULT_READ_RATES.items()}
+    write_rates = {op: rate * scale for op, rate in DEFAULT_WRITE_RATES.items()}
+    print(f"📖 Readers: {', '.join(f'{op} {rate:g}/s' for op, rate in read_rates.items())}")
+    print(f"✍️ Writers: {', '.join(f'{op} {rate:g}/s' for op, rate in write_rates.items())}")
+    
+    try:
+        summary, timeline, anomalies = run_stress(
+            measurement_client(), duration=duration, baseline=5.0, read_rates=read_rates, write_rates=write_rates, wait=wait
+        )
+        print("\n📈 query_points latency over time:")
+        for row in timeline:
+            if row["operation"] == "query_points":
+                print(f"   t={row['time']:>5.0f}s  {row['phase']:<9}  p50={row['p50_ms']:>7.2f}ms  "
+                      f"p99={row['p99_ms']:>7.2f}ms  ({row['requests']} requests)")
+        
+        print("\n📊 Summary:")
+        for row in summary:
+            print(f"   {row['operation']:<30} p50={row['p50_ms']:>7.2f}ms  p99={row['p99_ms']:>7.2f}ms  "
+                  f"errors={row['errors']}")
+        
+        if anomalies:
+            print(f"\n⚠️ {len(anomalies)} consistency anomalies:")
+            for anomaly in anomalies[:10]:
+                print(f"   t={anomaly['time']:.1f}s {anomaly['kind']} ({anomaly['operation']}): "
+                      f"ids {anomaly['ids'][:5]}")
+        else:
+            print("\n✅ No consistency anomalies")
+    except Exception as e:
+        print(f"❌ Failed to run stress test: {e}")
+
+def compare_transport_performance():
+    """Benchmark upsert and batch search over REST and gRPC"""
+    print("\n⚖️ Compare REST vs gRPC")
+    print("-" * 30)
+    print("💡 Uses a separate benchmark collection; your tutorial data is not touched")
+    
+    sizes = input("📦 Points/queries per request (comma-separated, default 16,64,256,1024): ").strip()
+    sizes = sizes or "16,64,256,1024"
+    concurrency = input("🧵 Concurrent requests, one pooled client each (default 1): ").strip()
+    concurrency = int(concurrency) if concurrency.isdigit() and int(concurrency) > 0 else 1
+    
+    try:
+        batch_sizes = [int(x.strip()) for x in sizes.split(',')]
+        results = run_transport_benchmark(measurement_client(), batch_sizes=batch_sizes, concurrency=concurrency)
+        for row in results:
+            print(f"   {row['operation']:<26} batch={row['batch_size']:<5} {row['throughput']:>9.0f} items/s  "
+                  f"p50={row['p50_ms']:.2f}ms  encode={row['encode_ms']:.2f}ms  body={row['request_kb']:.1f}KB")
+        print("💡 encode is client-side serialization of one request; body is the bytes sent")
+    except Exception as e:
+        print(f"❌ Failed to compare transports: {e}")
+
+def collection_profile_sweep():
+    """Measure recall@k, latency and memory for every collection profile"""
+    print("\n🧪 Collection Profile Sweep")
+    print("-" * 30)
+    print("💡 Uses a separate benchmark collection; your tutorial data is not touched")
+    
+    size = input("📊 Collection size (default 10000): ").strip()
+    size = int(size) if size.isdigit() else 10000
+    
+    k = input("🎯 k for recall@k (default 10): ").strip()
+    k = int(k) if k.isdigit() and int(k) > 0 else 10
+    
+    try:
+        results = run_profile_sweep(measurement_client(), size=size, k=k)
+        print(f"✅ Swept {len(results)} profiles on {size} points:")
+        for row in results:
+            print(f"   {row['profile']:<13} recall@{k}={row['recall_at_k']:.3f}  "
+                  f"p50={row['p50_ms']:.2f}ms  p99={row['p99_ms']:.2f}ms  "
+                  f"ram~{row['estimated_ram_mb']:.1f}MB  ready in {row['ready_seconds']:.1f}s")
+    except Exception as e:
+        print(f"❌ Failed to run profile sweep: {e}")
+
+def recall_evaluation():
+    """Measure recall@k of vector search against exact brute-force neighbours"""
+    print("\n🎯 Recall Evaluation")
+    print("-" * 30)
+    
+    if data is None:
+        print("❌ No data available. Please run 'Setup Collection & Data' first.")
+        return
+    
+    k = input("🎯 k for recall@k (default 10): ").strip()
+    k = int(k) if k.isdigit() and int(k) > 0 else 10
+    
+    num_queries = input("🔍 Number of query vectors (default 100): ").strip()
+    num_queries = int(num_queries) if num_queries.isdigit() and int(num_queries) > 0 else 100
+    
+    ef_values = input("⚙️ hnsw_ef values to try (comma-separated, default 16,32,64,128): ").strip() or "16,32,64,128"
+    
+    rescore = input("🔁 Rescore quantized results with original vectors? (y/n, default y): ").strip().lower() != 'n'
+    
+    try:
+        ef_values = [int(x.strip()) for x in ef_values.split(',')]
+        collection_info = client.get_collection(collection_name=my_collection)
+        if collection_info.points_count != len(data):
+            print(f"⚠️ Collection has {collection_info.points_count} points but the baseline covers "
+                  f"{len(data)}; extra points (e.g. payload demos) can lower measured recall")
+        
+        queries = dataset.sample_queries(num_queries) if dataset is not None else random_vectors(num_queries)
+        search_params_list = [profile_search_params(collection_profile)] + hnsw_ef_sweep(
+            ef_values, quantization=models.QuantizationSearchParams(rescore=rescore)
+        )
+        results = evaluate_search(
+            measurement_client(), my_collection, data, queries, k=k, ids=point_ids,
+            search_params_list=search_params_list
+        )
+        print(f"✅ Evaluated {num_queries} queries against the exact top-{k}:")
+        for row in results:
+            params = row['search_params']
+            label = f"hnsw_ef={params.hnsw_ef}" if params is not None and params.hnsw_ef else "profile default"
+            print(f"   {label:<16} recall@{k}={row['recall_at_k']:.3f}  "
+                  f"p50={row['p50_ms']:.2f}ms  p99={row['p99_ms']:.2f}ms")
+    except Exception as e:
+        print(f"❌ Failed to evaluate recall: {e}")
+
+def deferred_index_bulk_load():
+    """Recreate the collection, ingest with indexing off, then build the index"""
+    print("\n🏗️ Bulk Load with Deferred Indexing")
+    print("-" * 30)
+    
+    if data is None:
+        print("❌ No data available. Please run 'Setup Collection & Data' first.")
+        return
+    
+    print(f"⚠️ This recreates '{my_collection}' with profile '{collection_profile}' and loads {len(data)} points")
+    if input("🔄 Continue? (y/n): ").strip().lower() != 'y':
+        return
+    
+    compare = input("⚖️ Also time the default path for comparison? (y/n, default y): ").strip().lower() != 'n'
+    
+    try:
+        payloads = dataset.payloads if dataset is not None else None
+        if compare:
+            results = compare_bulk_load(measurement_client(), my_collection, data, point_ids, payloads, collection_profile)
+        else:
+            results = {"deferred": bulk_load(client, my_collection, data, point_ids, payloads, collection_profile)}
+        for path, stats in results.items():
+            print(f"✅ {path:8} path: ingest {stats['ingest_seconds']:.2f}s ({stats['points_per_sec']:.0f} points/sec), "
+                  f"indexing {stats['index_seconds']:.2f}s, searchable after {stats['time_to_searchable']:.2f}s")
+        if compare:
+            saved = results['default']['time_to_searchable'] - results['deferred']['time_to_searchable']
+            print(f"💡 Deferred indexing saved {saved:.2f}s to searchable")
+        create_payload_indexes(client, my_collection)
+    except Exception as e:
+        print(f"❌ Failed to bulk load: {e}")
+
+def compare_payload_path_performance():
+    """Time per-point PointStruct payloads against columnar NumPy payloads"""
+    print("\n⚖️ Compare Payload Paths")
+    print("-" * 30)
+    
+    if not client.collection_exists(collection_name=my_collection):
+        print("❌ Collection doesn't exist. Please run 'Setup Collection & Data' first.")
+        return
+    
+    count = input("🔢 Number of points per path (default 20000): ").strip()
+    count = int(count) if count.isdigit() and int(count) > 0 else 20000
+    
+    # Use ids past the sample data so the comparison does not overwrite it
+    start_id = 20_000_000
+    try:
+        results = compare_payload_paths(measurement_client(), my_collection, count, start_id=start_id)
+        for path, stats in results.items():
+            print(f"✅ {path:9} path: generate {stats['generate_seconds']:.2f}s, upload {stats['upload_seconds']:.2f}s "
+                  f"({stats['points_per_sec']:.0f} points/sec)")
+        speedup = results['per_point']['total_seconds'] / results['columnar']['total_seconds']
+        print(f"💡 Columnar path: {speedup:.1f}x faster end to end")
+    except Exception as e:
+        print(f"❌ Failed to compare payload paths: {e}")
+    finally:
+        if client.collection_exists(collection_name=my_collection):
+            client.delete(
+                collection_name=my_collection,
+                points_selector=models.PointIdsList(points=list(range(start_id, start_id + count)))
+            )
+
+def export_collection():
+    """Stream the whole collection to an on-disk dataset with parallel range scans"""
+    print("\n📤 Export Collection to Dataset")
+    print("-" * 30)
+    
+    path = input("📁 Export directory (default ./qdrant_export): ").strip() or "qdrant_export"
+    if VectorDataset.exists(path) and input(f"⚠️ '{path}' already holds a dataset. Overwrite? (y/n): ").strip().lower() != 'y':
+        return
+    
+    partitions = input("⚡ Parallel id-range partitions (default 4): ").strip()
+    partitions = int(partitions) if partitions.isdigit() and int(partitions) > 0 else 4
+    
+    last_report = [0.0]
+    def report(done, total):
+        now = time.perf_counter()
+        if now - last_report[0] >= 1.0 or done == total:
+            last_report[0] = now
+            print(f"   {done}/{total} points")
+    
+    try:
+        stats = export_dataset(client, my_collection, path, partitions=partitions, progress=report)
+        print(f"✅ Exported {stats['points']} points to '{path}' over {stats['partitions']} partition(s)")
+        print(f"   Time: {stats['seconds']:.2f}s ({stats['points_per_sec']:.0f} points/sec), "
+              f"planning {stats['plan_seconds']:.2f}s")
+        print(f"   Written: {stats['mb_written']:.1f} MB")
+        print("💡 Open it with On-Disk Dataset to re-ingest it into another collection")
+    except Exception as e:
+        print(f"❌ Failed to export collection: {e}")
 
 def retrieve_points():
     """Retrieve specific points"""
@@ -186,13 +1155,30 @@ def vector_search():
     limit = int(limit) if limit.isdigit() else 5
     
     try:
-        search_response = client.query_points(
-            collection_name=my_collection,
-            query=query_vector,
-            limit=limit,
-            with_vectors=True
-        )
-        print(f"🔍 Query vector (first 5): {query_vector[:5]}")
+        if use_async:
+            responses, _ = run_async(
+                async_client_options(client), query_many,
+                my_collection, [query_vector], limit=limit, with_vectors=True,
+                search_params=profile_search_params(collection_profile)
+            )
+            search_response = responses[0]
+        elif sharded_collection is not None:
+            search_response = models.QueryResponse(points=sharded_collection.query(
+                to_client_vectors(query_vector, vector_mode),
+                limit=limit,
+                with_vectors=True,
+                search_params=profile_search_params(collection_profile)
+            ))
+            print(f"🧩 Fanned out to {sharded_collection.shards} shard collections")
+        else:
+            search_response = client.query_points(
+                collection_name=my_collection,
+                query=to_client_vectors(query_vector, vector_mode),
+                limit=limit,
+                with_vectors=True,
+                search_params=profile_search_params(collection_profile)
+            )
+        print(f"🔍 Query vector (first 5): {query_vector[:5].tolist()}")
         print(f"✅ Found {len(search_response.points)} similar vectors:")
         for i, result in enumerate(search_response.points):
             print(f"   Rank {i+1}: ID={result.id}, Score={result.score:.4f}, Vector (first 3): {result.vector[:3]}")
@@ -241,22 +1227,19 @@ def filtered_search():
             # Filter by payload field (requires payload data)
             print("💡 This requires points with payload data. Creating sample payload points first...")
             
-            # Create some points with payload
-            payload_points = []
-            for i in range(5):
-                payload_points.append(PointStruct(
-                    id=2000 + i,
-                    vector=np.random.uniform(low=-1.0, high=1.0, size=100).tolist(),
-                    payload={
-                        "category": random.choice(["red", "blue", "green"]),
-                        "value": random.randint(1, 100),
-                        "active": random.choice([True, False])
-                    }
-                ))
+            # Create some points with payload, generated column-wise
+            payload_columns = PayloadColumns(random_payload_columns(5, categories=("red", "blue", "green")))
             
-            # Insert payload points
-            client.upsert(collection_name=my_collection, points=payload_points)
-            print(f"✅ Inserted {len(payload_points)} points with payload")
+            # Insert payload points as one columnar batch
+            client.upsert(
+                collection_name=my_collection,
+                points=models.Batch(
+                    ids=list(range(2000, 2005)),
+                    vectors=to_client_vectors(random_vectors(5), vector_mode),
+                    payloads=payload_columns[:]
+                )
+            )
+            print(f"✅ Inserted {len(payload_columns)} points with payload")
             
             # Now search with payload filter
             category = input("🔍 Enter category to filter by (red/blue/green, default: red): ").strip()
@@ -265,7 +1248,7 @@ def filtered_search():
             
             payload_response = client.query_points(
                 collection_name=my_collection,
-                query=query_vector,
+                query=to_client_vectors(query_vector, vector_mode),
                 query_filter=models.Filter(
                     must=[
                         models.FieldCondition(
@@ -275,7 +1258,8 @@ def filtered_search():
                     ]
                 ),
                 limit=5,
-                with_payload=True
+                with_payload=True,
+                search_params=profile_search_params(collection_profile)
             )
             print(f"✅ Found {len(payload_response.points)} points with category '{category}':")
             for i, result in enumerate(payload_response.points):
@@ -291,26 +1275,27 @@ def filtered_search():
             
             print(f"💡 Creating points with value range {min_value}-{max_value}...")
             
-            # Create points with range values
-            range_points = []
-            for i in range(5):
-                range_points.append(PointStruct(
-                    id=3000 + i,
-                    vector=np.random.uniform(low=-1.0, high=1.0, size=100).tolist(),
-                    payload={
-                        "value": random.randint(min_value, max_value),
-                        "type": f"range_{i}"
-                    }
-                ))
+            # Create points with range values, generated column-wise
+            range_columns = PayloadColumns({
+                "value": random_payload_columns(5, value_range=(min_value, max_value))["value"],
+                "type": np.char.add("range_", np.arange(5).astype(str))
+            })
             
-            # Insert range points
-            client.upsert(collection_name=my_collection, points=range_points)
-            print(f"✅ Inserted {len(range_points)} points with value range")
+            # Insert range points as one columnar batch
+            client.upsert(
+                collection_name=my_collection,
+                points=models.Batch(
+                    ids=list(range(3000, 3005)),
+                    vectors=to_client_vectors(random_vectors(5), vector_mode),
+                    payloads=range_columns[:]
+                )
+            )
+            print(f"✅ Inserted {len(range_columns)} points with value range")
             
             # Search with range filter
             range_response = client.query_points(
                 collection_name=my_collection,
-                query=query_vector,
+                query=to_client_vectors(query_vector, vector_mode),
                 query_filter=models.Filter(
                     must=[
                         models.FieldCondition(
@@ -320,7 +1305,8 @@ def filtered_search():
                     ]
                 ),
                 limit=5,
-                with_payload=True
+                with_payload=True,
+                search_params=profile_search_params(collection_profile)
             )
             print(f"✅ Found {len(range_response.points)} points with value in range {min_value}-{max_value}:")
             for i, result in enumerate(range_response.points):
@@ -340,22 +1326,38 @@ def batch_search():
     num_queries = int(num_queries) if num_queries.isdigit() else 2
     
     try:
-        query_vectors = [
-            np.random.uniform(low=-1.0, high=1.0, size=100).tolist()
-            for _ in range(num_queries)
-        ]
+        if dataset is not None:
+            query_vectors = to_client_vectors(dataset.sample_queries(num_queries), vector_mode)
+        else:
+            query_vectors = to_client_vectors(random_vectors(num_queries), vector_mode)
+        if len(query_vectors) == 0:
+            print("❌ No query vectors to search with; enter a number of queries greater than 0")
+            return
         
-        batch_results = client.query_batch_points(
-            collection_name=my_collection,
-            requests=[
-                models.QueryRequest(query=qv, limit=3) for qv in query_vectors
-            ]
-        )
+        if use_async:
+            batch_results, summary = run_async(
+                async_client_options(client), query_many,
+                my_collection, query_vectors, limit=3, concurrency=async_concurrency,
+                search_params=profile_search_params(collection_profile)
+            )
+            print(f"⚡ Fanned out {summary['requests']} async queries: "
+                  f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms")
+        else:
+            batch_results, stats = adaptive_query_batches(
+                client, my_collection, query_vectors, limit=3, sizer=query_batch_sizer,
+                params=profile_search_params(collection_profile)
+            )
+            sizes = [batch['size'] for batch in stats['batches']]
+            print(f"📦 Sent {len(sizes)} batches (sizes {min(sizes)}-{max(sizes)}, next {stats['final_batch_size']}): "
+                  f"p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms per batch, "
+                  f"{stats['throughput']:.0f} queries/sec")
         print(f"✅ Batch search completed for {len(query_vectors)} queries")
-        for i, response in enumerate(batch_results):
+        for i, response in enumerate(batch_results[:10]):
             print(f"   Query {i+1}: Found {len(response.points)} results")
             for j, result in enumerate(response.points):
                 print(f"     Rank {j+1}: ID={result.id}, Score={result.score:.4f}")
+        if len(batch_results) > 10:
+            print(f"   ... and {len(batch_results) - 10} more queries")
     except Exception as e:
         print(f"❌ Failed to perform batch search: {e}")
 
@@ -376,6 +1378,8 @@ def scroll_collection():
         print(f"✅ Scrolled through collection, found {len(scroll_results[0])} points")
         for point in scroll_results[0]:
             print(f"   Point ID: {point.id}, Vector (first 3): {point.vector[:3]}")
+        if scroll_results[1] is not None:
+            print(f"💡 Next page starts at ID {scroll_results[1]}; use Export Collection to stream every page")
     except Exception as e:
         print(f"❌ Failed to scroll collection: {e}")
 
@@ -384,19 +1388,49 @@ def delete_points():
     print("\n9️⃣ Delete Points")
     print("-" * 30)
     
-    delete_ids_input = input("🗑️ Enter point IDs to delete (comma-separated): ").strip()
-    if not delete_ids_input:
-        print("❌ No IDs provided")
-        return
+    print("🗑️ Delete Options:")
+    print("1. By point IDs (comma-separated, ranges like 1000-1999 allowed)")
+    print("2. By payload category")
+    print("3. By payload value range")
+    
+    delete_choice = input("Select delete type (1-3, default 1): ").strip() or "1"
     
     try:
-        delete_ids = [int(x.strip()) for x in delete_ids_input.split(',')]
-        delete_result = client.delete(
-            collection_name=my_collection,
-            points_selector=models.PointIdsList(points=delete_ids)
-        )
-        print(f"✅ Deleted {len(delete_ids)} points: {delete_ids}")
-        print(f"   Operation ID: {delete_result.operation_id}")
+        if delete_choice == "1":
+            delete_ids_input = input("🗑️ Enter point IDs to delete: ").strip()
+            if not delete_ids_input:
+                print("❌ No IDs provided")
+                return
+            
+            # Expand "a-b" ranges with NumPy so very large id lists stay cheap
+            id_parts = []
+            for part in delete_ids_input.split(','):
+                first, _, last = part.strip().partition('-')
+                id_parts.append(np.arange(int(first), int(last or first) + 1))
+            delete_ids = np.concatenate(id_parts)
+            
+            stats = bulk_delete(client, my_collection, ids=delete_ids)
+            print(f"✅ Deleted {stats['deleted']} of {len(delete_ids)} requested points in {stats['requests']} request(s)")
+        elif delete_choice == "2":
+            category = input("🔍 Category to delete (default: A): ").strip() or "A"
+            stats = bulk_delete(client, my_collection, query_filter=models.Filter(
+                must=[models.FieldCondition(key="category", match=models.MatchValue(value=category))]
+            ))
+            print(f"✅ Deleted {stats['deleted']} points with category '{category}'")
+        elif delete_choice == "3":
+            min_value = input("🔍 Minimum value (default: 1): ").strip()
+            min_value = int(min_value) if min_value.isdigit() else 1
+            max_value = input("🔍 Maximum value (default: 10): ").strip()
+            max_value = int(max_value) if max_value.isdigit() else 10
+            stats = bulk_delete(client, my_collection, query_filter=models.Filter(
+                must=[models.FieldCondition(key="value", range=models.Range(gte=min_value, lte=max_value))]
+            ))
+            print(f"✅ Deleted {stats['deleted']} points with value in range {min_value}-{max_value}")
+        else:
+            print("❌ Invalid delete choice")
+            return
+        print(f"   Time: {stats['delete_seconds']:.2f}s ({stats['points_per_sec']:.0f} points/sec), "
+              f"green after {stats['time_to_green']:.2f}s")
     except Exception as e:
         print(f"❌ Failed to delete points: {e}")
 
@@ -409,31 +1443,29 @@ def payload_operations():
     num_payload_points = int(num_payload_points) if num_payload_points.isdigit() else 10
     
     try:
-        # Create points with payload
-        payload_points = []
-        for i in range(num_payload_points):
-            payload_points.append(PointStruct(
-                id=1000 + i,
-                vector=np.random.uniform(low=-1.0, high=1.0, size=100).tolist(),
-                payload={
-                    "category": random.choice(["A", "B", "C"]),
-                    "value": random.randint(1, 100),
-                    "description": f"Point {1000 + i}"
-                }
-            ))
+        # Create payload columns with NumPy instead of one dict per point
+        payload_ids = np.arange(1000, 1000 + num_payload_points)
+        payload_columns = random_payload_columns(num_payload_points)
+        del payload_columns["active"]
+        payload_columns["description"] = np.char.add("Point ", payload_ids.astype(str))
         
-        # Insert points with payload
-        payload_upsert = client.upsert(
-            collection_name=my_collection,
-            points=payload_points
+        # Insert points with payload in columnar batches
+        stats = bulk_upsert(
+            client,
+            my_collection,
+            random_vectors(num_payload_points),
+            ids=payload_ids,
+            payloads=PayloadColumns(payload_columns),
+            workers=1,
+            wait=True
         )
-        print(f"✅ Inserted {len(payload_points)} points with payload")
+        print(f"✅ Inserted {stats['points']} points with payload")
         
         # Search with payload filter
-        if query_vector:
+        if query_vector is not None:
             payload_response = client.query_points(
                 collection_name=my_collection,
-                query=query_vector,
+                query=to_client_vectors(query_vector, vector_mode),
                 query_filter=models.Filter(
                     must=[
                         models.FieldCondition(
@@ -443,7 +1475,8 @@ def payload_operations():
                     ]
                 ),
                 limit=3,
-                with_payload=True
+                with_payload=True,
+                search_params=profile_search_params(collection_profile)
             )
             print(f"✅ Found {len(payload_response.points)} points with category 'A':")
             for result in payload_response.points:
@@ -496,16 +1529,110 @@ def reset_collection():
             print("ℹ️ Collection doesn't exist")
         
         # Reset global variables
-        global data, point_ids, query_vector
+        global data, point_ids, query_vector, dataset
         data = None
         point_ids = None
         query_vector = None
+        dataset = None
         print("✅ Global variables reset")
     except Exception as e:
         print(f"❌ Failed to reset collection: {e}")
 
-def main():
-    """Main interactive loop"""
+def performance_tools():
+    """Performance tools sub-menu loop"""
+    while True:
+        show_performance_menu()
+        choice = input("⚡ Select a tool (0-25): ").strip()
+        
+        if choice == '0':
+            break
+        elif choice == '1':
+            bulk_insert_points()
+        elif choice == '2':
+            compare_vector_path_performance()
+        elif choice == '3':
+            switch_vector_path()
+        elif choice == '4':
+            open_dataset()
+        elif choice == '5':
+            switch_client_mode()
+        elif choice == '6':
+            compare_sync_async_performance()
+        elif choice == '7':
+            run_benchmark_suite()
+        elif choice == '8':
+            manage_query_cache()
+        elif choice == '9':
+            payload_index_benchmark()
+        elif choice == '10':
+            switch_collection_profile()
+        elif choice == '11':
+            collection_profile_sweep()
+        elif choice == '12':
+            recall_evaluation()
+        elif choice == '13':
+            deferred_index_bulk_load()
+        elif choice == '14':
+            compare_payload_path_performance()
+        elif choice == '15':
+            export_collection()
+        elif choice == '16':
+            switch_transport()
+        elif choice == '17':
+            compare_transport_performance()
+        elif choice == '18':
+            manage_instrumentation()
+        elif choice == '19':
+            manage_sharded_layout()
+        elif choice == '20':
+            shard_scaling_benchmark()
+        elif choice == '21':
+            compare_engine_performance()
+        elif choice == '22':
+            hybrid_search_comparison()
+        elif choice == '23':
+            read_write_stress_test()
+        elif choice == '24':
+            embed_and_ingest_text()
+        elif choice == '25':
+            manage_incremental_sync()
+        else:
+            print("❌ Invalid option. Please try again.")
+        
+        input("\nPress Enter to continue...")
+
+def run_headless_workload(path, output=None):
+    """Run a workload file (see workload.py) without any prompts and return an exit code"""
+    if not connect_to_qdrant():
+        return 1
+    try:
+        workload = load_workload(path)
+        print(f"\n🏃 Running workload {path} ({len(workload['phases'])} phases)")
+        results = run_workload(
+            measurement_client(), workload, progress=lambda row: print(format_row(row)),
+            tick=lambda phase, elapsed, completed, failed: print(
+                f"   [{phase}] {elapsed:.0f}s: {completed} requests, {failed} errors"
+            ),
+            report_every=10
+        )
+        if output:
+            write_json(results, output, {"target": client.init_options.get("location") or DEFAULT_URL,
+                                         "workload": workload})
+            print(f"💾 Results written to {output}")
+        return 1 if any(row["errors"] for row in results) else 0
+    except Exception as e:
+        print(f"❌ Failed to run workload: {e}")
+        return 1
+
+def main(argv=None):
+    """Main interactive loop, or a headless workload run with --workload"""
+    parser = argparse.ArgumentParser(description="Qdrant 101 interactive tutorial")
+    parser.add_argument("--workload", help="Run this workload JSON file without prompts and exit")
+    parser.add_argument("--output", help="With --workload, write the results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.workload:
+        return run_headless_workload(args.workload, args.output)
+
     clear_screen()
     print_header()
     
@@ -516,7 +1643,7 @@ def main():
     
     while True:
         show_main_menu()
-        choice = input("🎯 Select an option (0-12): ").strip()
+        choice = input("🎯 Select an option (0-13): ").strip()
         
         if choice == '0':
             print("\n👋 Goodbye!")
@@ -545,6 +1672,8 @@ def main():
             run_all_operations()
         elif choice == '12':
             reset_collection()
+        elif choice == '13':
+            performance_tools()
         else:
             print("❌ Invalid option. Please try again.")
         
@@ -553,4 +1682,4 @@ def main():
         print_header()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,10 +1,15 @@
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
 from qdrant_client.http.models import CollectionStatus
 
-client = QdrantClient("http://localhost:6333") # Connect to existing Qdrant instance
+from collection_config import COLLECTION_PROFILES, collection_kwargs
+from transport import DEFAULT_URL, connect_or_local
+
+transport = "rest" # "grpc" sends protobuf to port 6334 instead of JSON to port 6333
+client, is_server = connect_or_local(DEFAULT_URL, transport) # Connect to existing Qdrant instance
+if not is_server:
+    print(f"No Qdrant server at {DEFAULT_URL}; using the embedded in-memory engine")
 
 my_collection = "first_collection"
+profile = "default" # One of COLLECTION_PROFILES, e.g. "low-latency", "memory-saver", "bulk-load"
 
 # Check if collection exists and delete it if it does
 if client.collection_exists(collection_name=my_collection):
@@ -13,7 +18,7 @@ if client.collection_exists(collection_name=my_collection):
 # Create the collection
 first_collection = client.create_collection(
     collection_name=my_collection,
-    vectors_config=models.VectorParams(size=100, distance=models.Distance.COSINE)
+    **collection_kwargs(profile)
 )
 print("Collection created:", first_collection)
 
@@ -24,6 +29,9 @@ print("\nCollection info:")
 print(f"Name: {my_collection}")
 print(f"Vector size: {collection_info.config.params.vectors.size}")
 print(f"Distance metric: {collection_info.config.params.vectors.distance}")
+print(f"Profile: {profile} ({COLLECTION_PROFILES[profile]['description']})")
+print(f"HNSW m / ef_construct: {collection_info.config.hnsw_config.m} / {collection_info.config.hnsw_config.ef_construct}")
+print(f"Quantization: {collection_info.config.quantization_config}")
 print(f"Status: {collection_info.status}")
 print(f"Points count: {collection_info.points_count}")
 
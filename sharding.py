@@ -0,0 +1,128 @@
+"""Client-side sharding across several collections with parallel fan-out search
+
+ShardedCollection places point id i in collection "<base>_shard<i % N>",
+ingests the shards concurrently and answers a query by sending
+query_points to every shard at once and merging the per-shard top-k lists
+with a heap.
+"""
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+from qdrant_client.http import models
+
+from bulk_ops import bulk_upsert, is_local_client
+from collection_config import collection_kwargs
+from vector_data import VECTOR_DIM
+
+# Distances whose scores are "lower is closer"; everything else ranks higher scores first
+ASCENDING_DISTANCES = (models.Distance.EUCLID, models.Distance.MANHATTAN)
+
+
+class _GatheredRows:
+    """The given rows of an array, gathered only when sliced"""
+
+    def __init__(self, array, rows):
+        self.array = array
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.array[self.rows[index]]
+
+
+class ShardedCollection:
+    """N collections named <base_name>_shard<i> that behave like one for upserts and queries
+
+    With a local client (see is_local_client) shards are ingested and
+    queried one after another.
+    """
+
+    def __init__(self, client, base_name, shards):
+        self.client = client
+        self.base_name = base_name
+        self.shards = shards
+        self.names = [f"{base_name}_shard{i}" for i in range(shards)]
+        self.workers = 1 if is_local_client(client) else shards
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.distance = None
+
+    def create(self, profile="default", size=VECTOR_DIM, distance=models.Distance.COSINE):
+        """(Re)create every shard collection with a collection profile"""
+        kwargs = collection_kwargs(profile, size=size, distance=distance)
+        for name in self.names:
+            if self.client.collection_exists(collection_name=name):
+                self.client.delete_collection(collection_name=name)
+            self.client.create_collection(collection_name=name, **kwargs)
+        self.distance = distance
+
+    def drop(self):
+        """Delete every shard collection and stop the fan-out threads"""
+        for name in self.names:
+            if self.client.collection_exists(collection_name=name):
+                self.client.delete_collection(collection_name=name)
+        self.close()
+
+    def close(self):
+        """Stop the fan-out threads; the collections are kept"""
+        self.executor.shutdown(wait=True)
+
+    def shard_rows(self, ids):
+        """Return, for each shard, the row numbers of ids that belong to it"""
+        shard_of = np.asarray(ids, dtype=np.int64) % self.shards
+        return [np.flatnonzero(shard_of == shard) for shard in range(self.shards)]
+
+    def upsert(self, vectors, ids=None, chunk_size=1000, wait=True):
+        """Split vectors by id and bulk upsert every shard concurrently
+
+        Each shard's vectors are gathered from its row numbers one chunk at
+        a time, so memory stays bounded by chunk_size rows per worker rather
+        than a second copy of the matrix.
+        Returns a dict with points, seconds, points_per_sec and the
+        per-shard shard_seconds.
+        """
+        ids = np.arange(len(vectors)) if ids is None else np.asarray(ids)
+
+        def upsert_shard(shard, rows):
+            stats = bulk_upsert(
+                self.client, self.names[shard], _GatheredRows(vectors, rows), ids=ids[rows],
+                chunk_size=chunk_size, workers=1, wait=wait
+            )
+            return stats["seconds"]
+
+        start = time.perf_counter()
+        shard_seconds = list(self.executor.map(upsert_shard, range(self.shards), self.shard_rows(ids)))
+        seconds = time.perf_counter() - start
+        return {
+            "points": len(ids),
+            "seconds": seconds,
+            "points_per_sec": len(ids) / seconds if seconds > 0 else 0.0,
+            "shard_seconds": shard_seconds,
+        }
+
+    def count(self):
+        """Exact number of points over all shards"""
+        return sum(self.client.count(collection_name=name, exact=True).count for name in self.names)
+
+    def query(self, query, limit=10, **query_kwargs):
+        """Send query_points to every shard in parallel and merge the results
+
+        Each shard returns its own top-limit already sorted, so a heap merge
+        of the shard lists yields the global top-limit. Returns a list of
+        ScoredPoint, best first.
+        """
+        if self.distance is None:
+            self.distance = self.client.get_collection(collection_name=self.names[0]).config.params.vectors.distance
+        responses = self.executor.map(
+            lambda name: self.client.query_points(
+                collection_name=name, query=query, limit=limit, **query_kwargs
+            ).points,
+            self.names
+        )
+        reverse = self.distance not in ASCENDING_DISTANCES
+        merged = heapq.merge(*responses, key=lambda point: point.score, reverse=reverse)
+        return list(islice(merged, limit))
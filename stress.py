@@ -0,0 +1,400 @@
+"""Mixed read/write stress test: concurrent writers and readers at fixed rates
+
+Readers (query_points, filtered_search, query_batch_points) and writers
+(upsert, delete) each send requests at their own target rate, readers from
+one thread pool and writers from another. Readers run alone for a
+baseline period, then writers join, so the read-latency timeline shows how
+searches degrade under write load. Every write is checked for
+consistency anomalies:
+
+- missing_after_upsert: an acknowledged upsert is not retrievable
+- visible_after_delete: an acknowledged delete is still retrievable
+- deleted_point_returned: a search started after a delete was
+  acknowledged still returned the deleted point
+
+Run with:
+
+    python stress.py --duration 60 --baseline 10 --rate query_points=100 --rate upsert=20 --output stress.json
+    python stress.py --local --duration 10 --no-wait --timeline-csv timeline.csv
+"""
+import argparse
+import csv
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from benchmark import add_result_row, format_row, write_json
+from bulk_ops import bulk_upsert, is_local_client
+from collection_config import collection_kwargs
+from latency_stats import summarize_latencies
+from transport import DEFAULT_URL, TRANSPORTS, connect, connect_or_local
+from vector_data import PAYLOAD_CATEGORIES, VECTOR_DIM, PayloadColumns, random_payload_columns, random_vectors
+
+READ_OPERATIONS = ("query_points", "filtered_search", "query_batch_points")
+WRITE_OPERATIONS = ("upsert", "delete")
+DEFAULT_READ_RATES = {"query_points": 50.0, "filtered_search": 20.0, "query_batch_points": 5.0}
+DEFAULT_WRITE_RATES = {"upsert": 10.0, "delete": 5.0}
+TIMELINE_FIELDS = ("time", "phase", "operation", "requests", "errors", "p50_ms", "p95_ms", "p99_ms")
+ANOMALY_KINDS = ("missing_after_upsert", "visible_after_delete", "deleted_point_returned")
+STRESS_COLLECTION = "qdrant_101_stress"
+
+
+class _StressRun:
+    """Shared state of one stress run: request functions, samples and anomalies"""
+
+    def __init__(self, client, collection_name, vectors, batch_size, limit, wait, seed):
+        self.client = client
+        self.collection_name = collection_name
+        self.vectors = vectors
+        self.batch_size = batch_size
+        self.limit = limit
+        self.wait = wait
+        self.seed = seed
+        # Serialize calls on a local client (see is_local_client), keeping the same schedule
+        self.call_lock = threading.Lock() if is_local_client(client) else nullcontext()
+        self.lock = threading.Lock()
+        self.samples = []  # (operation, start offset in seconds, latency in seconds or None on error)
+        self.anomalies = []
+        self.deleted = {}  # point id -> perf_counter time its delete was acknowledged
+        self.next_upsert_id = len(vectors)
+        self.next_delete_end = len(vectors)
+        self.counters = {operation: 0 for operation in READ_OPERATIONS + WRITE_OPERATIONS}
+        self.start = None
+
+    def call(self, method, **kwargs):
+        with self.call_lock:
+            return getattr(self.client, method)(collection_name=self.collection_name, **kwargs)
+
+    def request(self, operation):
+        """Send one request, record its latency and check its results"""
+        with self.lock:
+            i = self.counters[operation]
+            self.counters[operation] += 1
+        started = time.perf_counter()
+        try:
+            check = getattr(self, f"_{operation}")(i, started)
+        except Exception:
+            with self.lock:
+                self.samples.append((operation, started - self.start, None))
+            return
+        seconds = time.perf_counter() - started
+        with self.lock:
+            self.samples.append((operation, started - self.start, seconds))
+        # Consistency checks run after the timed call so they do not inflate its latency
+        if check is not None:
+            check()
+
+    def anomaly(self, kind, operation, ids):
+        with self.lock:
+            self.anomalies.append({
+                "kind": kind,
+                "operation": operation,
+                "time": time.perf_counter() - self.start,
+                "ids": sorted(int(point_id) for point_id in ids),
+            })
+
+    def _query_vector(self, i):
+        return self.vectors[(i * 7919 + self.seed) % len(self.vectors)]
+
+    def _check_deleted(self, operation, started, ids):
+        with self.lock:
+            stale = [point_id for point_id in ids if self.deleted.get(point_id, started) < started]
+        if stale:
+            self.anomaly("deleted_point_returned", operation, stale)
+
+    def _query_points(self, i, started):
+        points = self.call("query_points", query=self._query_vector(i), limit=self.limit).points
+        return lambda: self._check_deleted("query_points", started, [point.id for point in points])
+
+    def _filtered_search(self, i, started):
+        low = 1 + (i * 37) % 80
+        points = self.call(
+            "query_points",
+            query=self._query_vector(i),
+            query_filter=models.Filter(must=[
+                models.FieldCondition(key="category", match=models.MatchValue(
+                    value=PAYLOAD_CATEGORIES[i % len(PAYLOAD_CATEGORIES)]
+                )),
+                models.FieldCondition(key="value", range=models.Range(gte=low, lte=low + 20)),
+            ]),
+            limit=self.limit
+        ).points
+        return lambda: self._check_deleted("filtered_search", started, [point.id for point in points])
+
+    def _query_batch_points(self, i, started):
+        responses = self.call("query_batch_points", requests=[
+            models.QueryRequest(query=self._query_vector(i * self.batch_size + j), limit=self.limit)
+            for j in range(self.batch_size)
+        ])
+        ids = [point.id for response in responses for point in response.points]
+        return lambda: self._check_deleted("query_batch_points", started, ids)
+
+    def _upsert(self, i, started):
+        with self.lock:
+            first = self.next_upsert_id
+            self.next_upsert_id += self.batch_size
+        ids = list(range(first, first + self.batch_size))
+        rows = np.arange(first, first + self.batch_size) % len(self.vectors)
+        self.call("upsert", points=models.Batch(
+            ids=ids,
+            vectors=self.vectors[rows].tolist(),
+            payloads=PayloadColumns(random_payload_columns(len(ids), seed=self.seed + first))[:]
+        ), wait=self.wait)
+
+        def check():
+            found = {point.id for point in self.call("retrieve", ids=ids, with_payload=False)}
+            missing = [point_id for point_id in ids if point_id not in found]
+            if missing:
+                self.anomaly("missing_after_upsert", "upsert", missing)
+        return check
+
+    def _delete(self, i, started):
+        # Delete disjoint id ranges from the top of the initial points; upserts only add new ids
+        with self.lock:
+            end = self.next_delete_end
+            first = max(end - self.batch_size, 0)
+            self.next_delete_end = first
+        ids = list(range(first, end))
+        if not ids:
+            return None
+        self.call("delete", points_selector=models.PointIdsList(points=ids), wait=self.wait)
+        acknowledged = time.perf_counter()
+        with self.lock:
+            for point_id in ids:
+                self.deleted[point_id] = acknowledged
+
+        def check():
+            visible = [point.id for point in self.call("retrieve", ids=ids, with_payload=False)]
+            if visible:
+                self.anomaly("visible_after_delete", "delete", visible)
+        return check
+
+
+def _pace(run, operation, rate, executor, in_flight, begin, end):
+    """Submit operation at rate/sec between begin and end (perf_counter times)
+
+    Requests are scheduled open-loop (request n is due at begin + n / rate);
+    in_flight bounds the requests queued on the shared pool. When an
+    overloaded server holds the pacer back, the slots that went by are
+    skipped rather than replayed, and nothing is submitted after end.
+    """
+    n = 0
+    while True:
+        due = begin + n / rate
+        if due >= end:
+            break
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        in_flight.acquire()
+        now = time.perf_counter()
+        if now >= end:
+            in_flight.release()
+            break
+        future = executor.submit(run.request, operation)
+        future.add_done_callback(lambda _: in_flight.release())
+        n = max(n + 1, int((now - begin) * rate) + 1)
+
+
+def run_stress(client, size=10000, duration=30.0, baseline=5.0, read_rates=None, write_rates=None,
+               read_threads=4, write_threads=2, window=1.0, batch_size=16, limit=10, wait=True,
+               collection_name=STRESS_COLLECTION, seed=42, progress=None):
+    """Run readers alone for baseline seconds, then readers and writers together for duration seconds
+
+    read_rates / write_rates map operations (READ_OPERATIONS,
+    WRITE_OPERATIONS) to requests per second; an operation left out or
+    given a rate of 0 does not run. With wait=False writes are
+    acknowledged before they are applied, which the anomaly checks make
+    visible. With a local client (see is_local_client) requests are
+    serialized, so their latency includes waiting for the other workers.
+
+    Returns (summary, timeline, anomalies):
+    - summary: one row per operation and phase ("read-only", "mixed"),
+      shaped like run_benchmark's with operation "<operation>[<phase>]"
+    - timeline: read latency percentiles per window of seconds, one row per
+      read operation and window with time, phase, requests, errors and
+      p50/p95/p99_ms
+    - anomalies: dicts with kind (one of ANOMALY_KINDS), operation, time
+      and ids
+    progress(row) is called with each timeline row as the run ends.
+    """
+    read_rates = DEFAULT_READ_RATES if read_rates is None else read_rates
+    write_rates = DEFAULT_WRITE_RATES if write_rates is None else write_rates
+    read_rates = {operation: rate for operation, rate in read_rates.items() if rate > 0}
+    write_rates = {operation: rate for operation, rate in write_rates.items() if rate > 0}
+    vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    client.create_collection(collection_name=collection_name, **collection_kwargs())
+    bulk_upsert(client, collection_name, vectors, payloads=PayloadColumns(random_payload_columns(size, seed=seed)),
+                wait=True)
+
+    run = _StressRun(client, collection_name, vectors, batch_size, limit, wait, seed)
+    pacers = []
+    with ThreadPoolExecutor(max_workers=read_threads) as readers, \
+            ThreadPoolExecutor(max_workers=write_threads) as writers:
+        read_slots = threading.Semaphore(read_threads * 2)
+        write_slots = threading.Semaphore(write_threads * 2)
+        run.start = time.perf_counter()
+        mixed_start = run.start + baseline
+        end = mixed_start + duration
+        for operation, rate in read_rates.items():
+            pacers.append(threading.Thread(target=_pace, args=(run, operation, rate, readers, read_slots,
+                                                               run.start, end)))
+        for operation, rate in write_rates.items():
+            pacers.append(threading.Thread(target=_pace, args=(run, operation, rate, writers, write_slots,
+                                                               mixed_start, end)))
+        for pacer in pacers:
+            pacer.start()
+        for pacer in pacers:
+            pacer.join()
+
+    summary = _summarize(run.samples, baseline, duration, size, read_threads, write_threads, batch_size)
+    timeline = _timeline(run.samples, baseline, window)
+    if progress is not None:
+        for row in timeline:
+            progress(row)
+
+    if client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return summary, timeline, sorted(run.anomalies, key=lambda anomaly: anomaly["time"])
+
+
+def _phase(offset, baseline):
+    return "read-only" if offset < baseline else "mixed"
+
+
+def _summarize(samples, baseline, duration, size, read_threads, write_threads, batch_size):
+    """Benchmark-shaped rows per (operation, phase)"""
+    groups = {}
+    for operation, offset, seconds in samples:
+        groups.setdefault((operation, _phase(offset, baseline)), []).append(seconds)
+
+    rows = []
+    for (operation, phase), latencies in sorted(groups.items()):
+        ok = [seconds for seconds in latencies if seconds is not None]
+        add_result_row(
+            rows, f"{operation}[{phase}]", size, read_threads if operation in READ_OPERATIONS else write_threads,
+            ok, baseline if phase == "read-only" else duration, len(latencies) - len(ok),
+            items=len(ok) * (1 if operation in ("query_points", "filtered_search") else batch_size),
+            extra={"phase": phase}
+        )
+    return rows
+
+
+def _timeline(samples, baseline, window):
+    """Read-latency percentiles per window, keyed by the window's start offset"""
+    windows = {}
+    for operation, offset, seconds in samples:
+        if operation in READ_OPERATIONS:
+            windows.setdefault((int(offset // window), operation), []).append(seconds)
+
+    rows = []
+    for (index, operation), latencies in sorted(windows.items()):
+        ok = [seconds for seconds in latencies if seconds is not None]
+        stats = summarize_latencies(ok, window)
+        rows.append({
+            "time": index * window,
+            "phase": _phase(index * window, baseline),
+            "operation": operation,
+            "requests": len(latencies),
+            "errors": len(latencies) - len(ok),
+            "p50_ms": stats["p50_ms"],
+            "p95_ms": stats["p95_ms"],
+            "p99_ms": stats["p99_ms"],
+        })
+    return rows
+
+
+def write_timeline_csv(timeline, path):
+    """Write the read-latency timeline as CSV"""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=TIMELINE_FIELDS)
+        writer.writeheader()
+        writer.writerows(timeline)
+
+
+def _parse_rate(text):
+    operation, _, rate = text.partition("=")
+    if operation not in READ_OPERATIONS + WRITE_OPERATIONS or not rate:
+        raise argparse.ArgumentTypeError(
+            f"expected <operation>=<requests/sec> with operation in {READ_OPERATIONS + WRITE_OPERATIONS}"
+        )
+    return operation, float(rate)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="Qdrant server URL")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="rest")
+    parser.add_argument("--local", action="store_true", help="Use the embedded ':memory:' mode instead of a server")
+    parser.add_argument("--fallback-local", action="store_true",
+                        help="Use the embedded ':memory:' mode if no server answers at --url")
+    parser.add_argument("--size", type=int, default=10000, help="Points loaded before the run")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of mixed reads and writes")
+    parser.add_argument("--baseline", type=float, default=5.0, help="Seconds of reads only before writers start")
+    parser.add_argument("--rate", type=_parse_rate, action="append", default=[],
+                        help="Requests/sec for one operation, e.g. upsert=20; repeat per operation. "
+                             "Given rates replace the defaults, 0 disables an operation")
+    parser.add_argument("--read-threads", type=int, default=4)
+    parser.add_argument("--write-threads", type=int, default=2)
+    parser.add_argument("--window", type=float, default=1.0, help="Seconds per timeline window")
+    parser.add_argument("--batch-size", type=int, default=16, help="Points per write, queries per batch search")
+    parser.add_argument("--limit", type=int, default=10, help="Top-k for searches")
+    parser.add_argument("--no-wait", action="store_true", help="Send writes with wait=False")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write summary, timeline and anomalies to this JSON file")
+    parser.add_argument("--timeline-csv", help="Write the read-latency timeline to this CSV file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.local:
+        client = QdrantClient(":memory:")
+    elif args.fallback_local:
+        client, is_server = connect_or_local(args.url, args.transport)
+        if not is_server:
+            print(f"No Qdrant server at {args.url}; using the embedded ':memory:' mode", file=sys.stderr)
+    else:
+        client = connect(args.url, args.transport)
+
+    read_rates = dict(DEFAULT_READ_RATES)
+    write_rates = dict(DEFAULT_WRITE_RATES)
+    if args.rate:
+        rates = dict(args.rate)
+        read_rates = {op: rate for op, rate in rates.items() if op in READ_OPERATIONS}
+        write_rates = {op: rate for op, rate in rates.items() if op in WRITE_OPERATIONS}
+
+    summary, timeline, anomalies = run_stress(
+        client, size=args.size, duration=args.duration, baseline=args.baseline, read_rates=read_rates,
+        write_rates=write_rates, read_threads=args.read_threads, write_threads=args.write_threads,
+        window=args.window, batch_size=args.batch_size, limit=args.limit, wait=not args.no_wait, seed=args.seed,
+        progress=lambda row: print(f"t={row['time']:>6.1f}s {row['phase']:<9} {row['operation']:<20} "
+                                   f"n={row['requests']:<5} p50={row['p50_ms']:.2f}ms  p99={row['p99_ms']:.2f}ms")
+    )
+    for row in summary:
+        print(format_row(row))
+    for kind in ANOMALY_KINDS:
+        count = sum(1 for anomaly in anomalies if anomaly["kind"] == kind)
+        print(f"{kind}: {count}")
+
+    if args.output:
+        metadata = {"target": client.init_options.get("location") or args.url, "args": vars(args)}
+        write_json(summary, args.output, metadata, extra={"timeline": timeline, "anomalies": anomalies})
+        print(f"Results written to {args.output}")
+    if args.timeline_csv:
+        write_timeline_csv(timeline, args.timeline_csv)
+        print(f"Timeline written to {args.timeline_csv}")
+    return 1 if anomalies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
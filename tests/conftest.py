@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+from qdrant_client import QdrantClient
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collection_config import collection_kwargs  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def collection(client):
+    client.create_collection(collection_name="test_collection", **collection_kwargs())
+    return "test_collection"
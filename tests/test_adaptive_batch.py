@@ -0,0 +1,33 @@
+from adaptive_batch import BatchSizer, adaptive_query_batches
+from bulk_ops import bulk_upsert
+from vector_data import random_vectors
+
+
+def test_batch_sizer_steps_toward_target_within_bounds():
+    sizer = BatchSizer(initial=64, min_size=8, max_size=256, target_ms=100.0, max_step=2.0)
+
+    # 64 queries in 50ms: 128 would hit 100ms
+    assert sizer.observe(64, 0.05) == 128
+    # Far too fast: capped at one doubling, then at max_size
+    assert sizer.observe(128, 0.001) == 256
+    assert sizer.observe(256, 0.001) == 256
+    # Far too slow: at most halved per observation, never below min_size
+    assert sizer.observe(256, 10.0) == 128
+    for _ in range(10):
+        sizer.observe(sizer.size, 10.0)
+    assert sizer.size == 8
+    assert sizer.observe(8, 0.0) == 16
+
+
+def test_adaptive_query_batches_keeps_input_order(client, collection):
+    bulk_upsert(client, collection, random_vectors(300, seed=2), wait=True)
+    queries = random_vectors(50, seed=3)
+
+    responses, stats = adaptive_query_batches(client, collection, iter(queries), limit=3,
+                                              sizer=BatchSizer(initial=7, min_size=7, max_size=7))
+
+    assert len(responses) == 50
+    assert [batch["offset"] for batch in stats["batches"]] == list(range(0, 50, 7))
+    for query, response in zip(queries, responses):
+        expected = client.query_points(collection_name=collection, query=query, limit=3).points
+        assert [point.id for point in response.points] == [point.id for point in expected]
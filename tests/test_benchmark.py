@@ -0,0 +1,45 @@
+from benchmark import add_result_row, compare_results
+
+
+def row(operation, throughput, p99_ms, size=1000, concurrency=1):
+    return {"operation": operation, "dataset_size": size, "concurrency": concurrency,
+            "throughput": throughput, "p99_ms": p99_ms}
+
+
+def test_compare_results_flags_regressions_beyond_tolerance():
+    baseline = [row("query_points", 1000, 10.0), row("upsert", 5000, 20.0)]
+    current = [row("query_points", 850, 10.5), row("upsert", 5200, 25.0)]
+
+    comparisons = {(c["operation"], c["metric"]): c for c in compare_results(baseline, current, tolerance=0.10)}
+
+    assert comparisons["query_points", "throughput"]["regression"]
+    assert abs(comparisons["query_points", "throughput"]["change"] + 0.15) < 1e-9
+    assert not comparisons["query_points", "p99_ms"]["regression"]
+    assert not comparisons["upsert", "throughput"]["regression"]
+    assert comparisons["upsert", "p99_ms"]["regression"]
+
+
+def test_compare_results_matches_rows_on_size_and_concurrency():
+    baseline = [row("query_points", 1000, 10.0), row("query_points", 0, 0.0, size=10)]
+    current = [
+        row("query_points", 100, 100.0, concurrency=8),
+        row("query_points", 100, 100.0, size=10),
+        row("scroll", 100, 100.0),
+    ]
+
+    # No baseline for concurrency 8 or scroll, and zero baselines cannot be compared
+    assert compare_results(baseline, current) == []
+
+
+def test_add_result_row_builds_summary_and_histogram():
+    results = []
+    reported = []
+
+    result = add_result_row(results, "upsert", 1000, 4, [0.01, 0.02, 0.03], 0.5, errors=1, items=192,
+                            extra={"phase": "load"}, progress=reported.append)
+
+    assert results == reported == [result]
+    assert list(result)[:4] == ["operation", "dataset_size", "concurrency", "errors"]
+    assert (result["requests"], result["items"], result["errors"], result["phase"]) == (3, 192, 1, "load")
+    assert result["throughput"] == 192 / 0.5
+    assert list(result)[-1] == "histogram"
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from qdrant_client.http import models
+
+from bulk_ops import bulk_delete, bulk_upsert
+from vector_data import PayloadColumns, random_payload_columns, random_vectors
+
+
+def test_bulk_upsert_round_trip(client, collection):
+    vectors = random_vectors(2500, seed=1)
+    ids = np.arange(2500) + 100
+    payloads = PayloadColumns(random_payload_columns(2500, seed=1))
+
+    stats = bulk_upsert(client, collection, vectors, ids=ids, payloads=payloads, chunk_size=1000, wait=True)
+
+    assert stats["points"] == 2500
+    assert stats["chunks"] == 3
+    assert client.count(collection_name=collection, exact=True).count == 2500
+    point = client.retrieve(collection_name=collection, ids=[1337], with_vectors=True)[0]
+    assert point.payload == payloads[1337 - 100]
+    # Cosine collections store normalized vectors
+    expected = vectors[1337 - 100] / np.linalg.norm(vectors[1337 - 100])
+    np.testing.assert_allclose(point.vector, expected, atol=1e-5)
+
+
+def test_bulk_delete_by_ids_counts_only_existing_points(client, collection):
+    bulk_upsert(client, collection, random_vectors(1000, seed=2), wait=True)
+
+    # 900..1099: only 100 of these ids exist
+    stats = bulk_delete(client, collection, ids=np.arange(900, 1100), chunk_size=64)
+
+    assert stats["deleted"] == 100
+    assert stats["requests"] == 4
+    assert client.count(collection_name=collection, exact=True).count == 900
+
+
+def test_bulk_delete_by_filter(client, collection):
+    payloads = PayloadColumns(random_payload_columns(1000, seed=3))
+    bulk_upsert(client, collection, random_vectors(1000, seed=3), payloads=payloads, wait=True)
+    query_filter = models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value="A"))])
+    expected = sum(payload["category"] == "A" for payload in payloads[0:1000])
+
+    stats = bulk_delete(client, collection, query_filter=query_filter)
+
+    assert stats["deleted"] == expected > 0
+    assert stats["requests"] == 1
+    assert client.count(collection_name=collection, count_filter=query_filter, exact=True).count == 0
+
+
+def test_bulk_delete_needs_exactly_one_selector(client, collection):
+    with pytest.raises(ValueError):
+        bulk_delete(client, collection)
+    with pytest.raises(ValueError):
+        bulk_delete(client, collection, ids=[1], query_filter=models.Filter())
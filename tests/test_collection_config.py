@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from qdrant_client.http import models
+
+from collection_config import wait_for_indexed
+
+GREEN, YELLOW, GREY = models.CollectionStatus.GREEN, models.CollectionStatus.YELLOW, models.CollectionStatus.GREY
+
+
+class ScriptedClient:
+    """Answers get_collection with one scripted (status, indexed_vectors_count) per call"""
+
+    def __init__(self, states, points=1000):
+        self.states = list(states)
+        self.points = points
+        self.triggers = 0
+
+    def get_collection(self, collection_name):
+        status, indexed = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        config = SimpleNamespace(hnsw_config=SimpleNamespace(m=16),
+                                 optimizer_config=SimpleNamespace(indexing_threshold=20000))
+        return SimpleNamespace(status=status, points_count=self.points, indexed_vectors_count=indexed, config=config)
+
+    def update_collection(self, collection_name, optimizers_config):
+        self.triggers += 1
+
+
+def test_wait_for_indexed_outlasts_a_stale_green_and_triggers_grey():
+    client = ScriptedClient([(GREEN, 0), (GREY, 0), (YELLOW, 400), (GREEN, 1000)])
+
+    wait_for_indexed(client, "c", poll_interval=0, settle=60)
+
+    assert client.states == [(GREEN, 1000)]
+    assert client.triggers == 1
+
+
+def test_wait_for_indexed_returns_when_green_again_below_the_threshold():
+    client = ScriptedClient([(YELLOW, 0), (GREEN, 0), (GREEN, 1000)])
+
+    wait_for_indexed(client, "c", poll_interval=0, settle=60)
+
+    assert client.states == [(GREEN, 1000)]
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from evaluation import exact_top_k
+from vector_data import random_vectors
+
+
+@pytest.mark.parametrize("distance", ["cosine", "dot", "euclid"])
+def test_exact_top_k_matches_brute_force(distance):
+    vectors = random_vectors(1000, seed=2)
+    queries = random_vectors(20, seed=3)
+
+    ids, scores = exact_top_k(vectors, queries, 10, distance=distance, corpus_chunk=128, query_chunk=7)
+
+    if distance == "cosine":
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ unit.T
+    elif distance == "dot":
+        expected = queries @ vectors.T
+    else:
+        expected = -np.linalg.norm(queries[:, None, :] - vectors[None, :, :], axis=2)
+    expected_ids = np.argsort(-expected, axis=1)[:, :10]
+    np.testing.assert_array_equal(ids, expected_ids)
+    np.testing.assert_allclose(scores, np.take_along_axis(expected, expected_ids, axis=1), rtol=1e-4, atol=1e-4)
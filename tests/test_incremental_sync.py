@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from incremental_sync import SyncManifest, content_hashes, incremental_sync, plan_sync
+from ingest_pipeline import HashingEmbedder
+from vector_data import random_vectors
+
+
+def test_plan_sync_classifies_points(tmp_path):
+    embedder = HashingEmbedder(dim=32)
+    texts = ["red vector search", "blue payload filter", "fast disk index", "cheap memory graph"]
+    manifest = SyncManifest(str(tmp_path / "manifest.npz"), "docs", [0, 1, 2, 3],
+                            content_hashes(embedder.embed(texts)))
+
+    # Point 1 changes, point 3 disappears, point 4 is new
+    texts = ["red vector search", "green payload filter", "fast disk index", "slow old model"]
+    plan = plan_sync(manifest, [0, 1, 2, 4], content_hashes(embedder.embed(texts)))
+
+    assert plan["upload_rows"].tolist() == [1, 3]
+    assert (plan["new"], plan["changed"], plan["unchanged"]) == (1, 1, 2)
+    assert plan["delete_ids"].tolist() == [3]
+
+
+def test_plan_sync_rejects_duplicate_ids(tmp_path):
+    with pytest.raises(ValueError):
+        plan_sync(SyncManifest(str(tmp_path / "manifest.npz")), [1, 1], np.zeros(2, dtype=np.uint64))
+
+
+def test_incremental_sync_uploads_only_changes(client, collection, tmp_path):
+    manifest_path = str(tmp_path / "manifest.npz")
+    vectors = random_vectors(500, seed=4)
+
+    first = incremental_sync(client, collection, vectors, manifest_path=manifest_path)
+    assert first["new"] == 500
+    assert incremental_sync(client, collection, vectors, manifest_path=manifest_path)["uploaded_fraction"] == 0.0
+
+    vectors[:10] += 0.5
+    stats = incremental_sync(client, collection, vectors[:450], manifest_path=manifest_path)
+    assert (stats["new"], stats["changed"], stats["unchanged"], stats["deleted"]) == (0, 10, 440, 50)
+    assert client.count(collection_name=collection, exact=True).count == 450
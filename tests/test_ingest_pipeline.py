@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from ingest_pipeline import STAGES, HashingEmbedder, generated_records, run_ingest_pipeline
+
+
+def test_hashing_embedder_is_deterministic_unit_length_and_word_sensitive():
+    texts = ["fast vector search engine", "Fast VECTOR search engine", "slow disk payload filter", ""]
+
+    vectors = HashingEmbedder(dim=64).embed(texts)
+
+    assert vectors.shape == (4, 64) and vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors, HashingEmbedder(dim=64).embed(texts))
+    np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, rtol=1e-5)
+    assert not vectors[3].any()
+    # Case is ignored; texts sharing words are closer than texts that share none
+    assert vectors[0] @ vectors[1] == pytest.approx(1.0)
+    shared = HashingEmbedder(dim=64).embed(["fast vector search filter"])[0]
+    assert shared @ vectors[0] > shared @ vectors[2] > vectors[0] @ vectors[2]
+
+
+def test_pipeline_stores_every_record(client, collection):
+    stats = run_ingest_pipeline(client, collection, generated_records(300, seed=1), batch_size=32, wait=True)
+
+    assert stats["points"] == 300
+    assert set(stats["stages"]) == set(STAGES) and stats["bottleneck"] in stats["stages"]
+    assert client.count(collection_name=collection, exact=True).count == 300
+    point = client.retrieve(collection_name=collection, ids=[7], with_payload=True)[0]
+    assert isinstance(point.payload["text"], str)
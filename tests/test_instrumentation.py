@@ -0,0 +1,45 @@
+import pytest
+
+from bulk_ops import bulk_upsert
+from instrumentation import ClientMetrics, InstrumentedClient
+from vector_data import random_vectors
+
+
+def test_to_prometheus_renders_cumulative_histograms_and_errors():
+    metrics = ClientMetrics()
+    metrics.record("query_points", 0.004, request_bytes=300, response_bytes=5000)
+    metrics.record("query_points", 0.2, request_bytes=300, response_bytes=5000)
+    metrics.record("upsert", 0.01, error=ValueError("bad"))
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert "# TYPE qdrant_client_request_duration_seconds histogram" in lines
+    prefix = 'qdrant_client_request_duration_seconds_bucket{method="query_points"'
+    buckets = [line for line in lines if line.startswith(prefix)]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts) and counts[-1] == 2
+    assert buckets[-1].startswith(prefix + ',le="+Inf"}')
+    assert 'qdrant_client_request_duration_seconds_count{method="query_points"} 2' in lines
+    assert 'qdrant_client_request_size_bytes_sum{method="query_points"} 600' in lines
+    assert 'qdrant_client_errors_total{method="upsert",error="ValueError"} 1' in lines
+
+
+def test_instrumented_client_records_calls_sizes_and_profiles(client, collection):
+    bulk_upsert(client, collection, random_vectors(100, seed=6), wait=True)
+    instrumented = InstrumentedClient(client)
+    instrumented.profile("query_points", every=2)
+
+    for _ in range(3):
+        instrumented.query_points(collection_name=collection, query=random_vectors(1, seed=7)[0], limit=5)
+    with pytest.raises(Exception):
+        instrumented.get_collection(collection_name="missing")
+
+    methods = instrumented.metrics.to_dict()
+    assert methods["query_points"]["calls"] == 3
+    assert methods["query_points"]["request_bytes"] == 0  # sizes are off by default
+    assert methods["get_collection"]["errors"] == 1
+    assert instrumented.metrics.profiles["query_points"]["sampled_calls"] == 2
+
+    sized = InstrumentedClient(client, measure_sizes=True)
+    sized.count(collection_name=collection)
+    assert sized.metrics.to_dict()["count"]["response_bytes"] > 0
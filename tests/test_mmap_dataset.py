@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from qdrant_client.http import models
+
+from collection_config import collection_kwargs
+from mmap_dataset import VectorDataset, export_dataset, ingest_dataset, plan_partitions
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(rows):
+    def progress(done, total, stats):
+        if done >= rows:
+            raise Interrupted()
+    return progress
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    return VectorDataset.create(str(tmp_path / "dataset"), 1000, dim=8, chunk_size=300, seed=1)
+
+
+def test_create_and_iter_batches(dataset, tmp_path):
+    assert VectorDataset.exists(dataset.path)
+    assert len(dataset) == 1000
+    assert dataset.dim == 8
+    assert isinstance(dataset.vectors, np.memmap)
+
+    batches = list(dataset.iter_batches(400, start=100))
+    assert [offset for offset, _, _, _ in batches] == [100, 500, 900]
+    offset, ids, vectors, payloads = batches[-1]
+    assert ids.tolist() == list(range(900, 1000))
+    assert vectors.shape == (100, 8)
+    assert set(payloads[0]) == {"category", "value", "active"}
+
+    reopened = VectorDataset(dataset.path)
+    np.testing.assert_array_equal(reopened.vectors, dataset.vectors)
+    assert reopened.payloads[999] == dataset.payloads[999]
+
+
+def test_ingest_resumes_from_checkpoint(client, dataset):
+    client.create_collection(collection_name="ingest", **collection_kwargs(size=8))
+
+    with pytest.raises(Interrupted):
+        ingest_dataset(client, "ingest", dataset, window_size=300, progress=interrupt_after(600))
+    assert dataset.load_checkpoint("ingest") == 600
+    assert client.count(collection_name="ingest", exact=True).count == 600
+
+    stats = ingest_dataset(client, "ingest", dataset, window_size=300)
+    assert stats["start_offset"] == 600
+    assert stats["points"] == 400
+    assert client.count(collection_name="ingest", exact=True).count == 1000
+    assert dataset.load_checkpoint() == 0
+
+
+def test_checkpoint_ignored_for_another_or_reset_collection(client, dataset):
+    client.create_collection(collection_name="ingest", **collection_kwargs(size=8))
+    with pytest.raises(Interrupted):
+        ingest_dataset(client, "ingest", dataset, window_size=300, progress=interrupt_after(300))
+    assert dataset.load_checkpoint("other") == 0
+
+    client.delete(collection_name="ingest", points_selector=models.FilterSelector(filter=models.Filter()))
+    stats = ingest_dataset(client, "ingest", dataset, window_size=300)
+    assert stats["start_offset"] == 0
+    assert client.count(collection_name="ingest", exact=True).count == 1000
+
+
+def test_export_round_trips_an_ingested_dataset(client, dataset, tmp_path):
+    # Euclid keeps vectors as written (cosine collections normalize them)
+    client.create_collection(collection_name="ingest", **collection_kwargs(size=8, distance=models.Distance.EUCLID))
+    ingest_dataset(client, "ingest", dataset, window_size=300)
+
+    stats = export_dataset(client, "ingest", str(tmp_path / "export"), page_size=128)
+    exported = VectorDataset(str(tmp_path / "export"))
+
+    assert stats["points"] == len(exported) == 1000
+    # Rows come back in scan order; line them up by id
+    order = np.argsort(exported.ids)
+    assert exported.ids[order].tolist() == dataset.ids.tolist()
+    np.testing.assert_allclose(exported.vectors[order], dataset.vectors, rtol=1e-6)
+    assert [exported.payloads[int(row)] for row in order[:50]] == dataset.payloads[0:50]
+
+
+def test_plan_partitions_cover_the_id_space(client, dataset):
+    client.create_collection(collection_name="ingest", **collection_kwargs(size=8))
+    ingest_dataset(client, "ingest", dataset, window_size=300)
+
+    plan = plan_partitions(client, "ingest", 4)
+
+    assert len(plan) == 4
+    assert plan[0][0] is None and plan[-1][1] is None
+    assert all(end == start for (_, end), (start, _) in zip(plan, plan[1:]))
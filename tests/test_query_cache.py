@@ -0,0 +1,73 @@
+import numpy as np
+from qdrant_client.http import models
+
+from bulk_ops import bulk_upsert
+from query_cache import CachedClient, QueryCache
+from vector_data import random_vectors
+
+
+def test_make_key_ignores_float_width_but_not_filter_or_params():
+    cache = QueryCache()
+    vector = np.random.default_rng(0).random(8)
+    query_filter = models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value="A"))])
+
+    key = cache.make_key("c", vector, query_filter, limit=5)
+
+    assert key == cache.make_key("c", vector.astype(np.float32), query_filter, limit=5)
+    assert key == cache.make_key("c", vector.tolist(), query_filter, limit=5)
+    assert key != cache.make_key("c", vector, None, limit=5)
+    assert key != cache.make_key("c", vector, query_filter, limit=10)
+    assert key != cache.make_key("other", vector, query_filter, limit=5)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("query_cache.time.monotonic", lambda: now[0])
+    cache = QueryCache(ttl_seconds=10)
+    key = cache.make_key("c", [1.0, 2.0])
+    cache.put(key, "result", cache.generation("c"))
+
+    now[0] += 9
+    assert cache.get(key) == "result"
+    now[0] += 2
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    keys = [cache.make_key("c", [float(i)]) for i in range(3)]
+    cache.put(keys[0], 0, 0)
+    cache.put(keys[1], 1, 0)
+    cache.get(keys[0])
+    cache.put(keys[2], 2, 0)
+
+    assert cache.get(keys[1]) is None
+    assert (cache.get(keys[0]), cache.get(keys[2])) == (0, 2)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_results_fetched_before_a_write_are_not_stored():
+    cache = QueryCache()
+    key = cache.make_key("c", [1.0])
+    generation = cache.generation("c")
+    cache.invalidate("c")
+    cache.put(key, "stale", generation)
+
+    assert cache.get(key) is None
+
+
+def test_cached_client_invalidates_on_write(client, collection):
+    vectors = random_vectors(100, seed=5)
+    bulk_upsert(client, collection, vectors, wait=True)
+    cached = CachedClient(client)
+
+    first = cached.query_points(collection, query=vectors[0], limit=3)
+    assert cached.query_points(collection, query=vectors[0], limit=3) is first
+    assert cached.cache.stats()["hits"] == 1
+
+    cached.delete(collection_name=collection, points_selector=models.PointIdsList(points=[0]))
+    after = cached.query_points(collection, query=vectors[0], limit=3)
+    assert after is not first
+    assert 0 not in [point.id for point in after.points]
+    assert cached.cache.stats()["invalidations"] == 1
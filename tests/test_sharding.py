@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from qdrant_client.http import models
+
+from evaluation import exact_top_k
+from sharding import ShardedCollection
+from vector_data import random_vectors
+
+
+@pytest.mark.parametrize("distance", [models.Distance.COSINE, models.Distance.EUCLID])
+def test_sharded_query_matches_exact_top_k(client, distance):
+    vectors = random_vectors(600, dim=16, seed=8)
+    queries = random_vectors(5, dim=16, seed=9)
+    ids = np.arange(600) * 7  # Spread ids so every shard gets a share
+    sharded = ShardedCollection(client, "sharded", 3)
+    sharded.create(size=16, distance=distance)
+    try:
+        sharded.upsert(vectors, ids=ids, chunk_size=128)
+        assert sharded.count() == 600
+        assert [len(rows) for rows in sharded.shard_rows(ids)] == [200, 200, 200]
+
+        expected_ids, _ = exact_top_k(vectors, queries, 10, distance=distance, ids=ids)
+        for query, expected in zip(queries, expected_ids):
+            points = sharded.query(query, limit=10)
+            assert [point.id for point in points] == expected.tolist()
+    finally:
+        sharded.drop()
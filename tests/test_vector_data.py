@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from qdrant_client.http import models
+
+from vector_data import PayloadColumns, SparseVectors, encode_sparse
+
+
+def test_payload_columns_build_dicts_of_python_values():
+    payloads = PayloadColumns({
+        "category": np.array(["A", "B", "C"]),
+        "value": np.array([1, 2, 3]),
+        "active": np.array([True, False, True]),
+    })
+
+    assert len(payloads) == 3
+    assert payloads[1:] == [
+        {"category": "B", "value": 2, "active": False},
+        {"category": "C", "value": 3, "active": True},
+    ]
+    assert payloads[0] == {"category": "A", "value": 1, "active": True}
+    assert type(payloads[0]["value"]) is int
+
+
+def test_payload_columns_reject_different_lengths():
+    with pytest.raises(ValueError):
+        PayloadColumns({"value": np.arange(3), "active": np.ones(2, dtype=bool)})
+
+
+def test_encode_sparse_counts_terms_per_document():
+    # Documents [3, 1, 3] and [2]
+    sparse = encode_sparse([3, 1, 3, 2], [3, 1], bm25=False)
+
+    assert isinstance(sparse, SparseVectors)
+    assert len(sparse) == 2
+    assert sparse.row_lengths().tolist() == [2, 1]
+    assert sparse.tolist() == [
+        models.SparseVector(indices=[1, 3], values=[1.0, 2.0]),
+        models.SparseVector(indices=[2], values=[1.0]),
+    ]
+    assert sparse[1] == models.SparseVector(indices=[2], values=[1.0])
+    assert sparse[1:].tolist() == sparse.tolist()[1:]
+
+
+def test_sparse_vectors_negative_and_out_of_range_indexes():
+    sparse = encode_sparse([3, 1, 3, 2, 5], [3, 1, 1], bm25=False)
+
+    assert sparse[-1] == models.SparseVector(indices=[5], values=[1.0])
+    assert sparse[-3] == sparse[0]
+    for index in (3, -4):
+        with pytest.raises(IndexError):
+            sparse[index]
+    assert list(sparse) == sparse.tolist()
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from workload import load_workload, run_workload
+
+
+def test_load_workload_fills_defaults(tmp_path):
+    path = tmp_path / "workload.json"
+    path.write_text(json.dumps({
+        "dataset_size": 500,
+        "phases": [{"operations": ["upsert"]}, {"name": "mix", "operations": {"query_points": 1}, "requests": 10}],
+    }))
+
+    workload = load_workload(str(path))
+
+    assert (workload["dataset_size"], workload["profile"], workload["recreate"]) == (500, "default", True)
+    assert [phase["name"] for phase in workload["phases"]] == ["phase1", "mix"]
+    assert (workload["phases"][0]["concurrency"], workload["phases"][0]["duration"]) == (1, None)
+
+
+@pytest.mark.parametrize("workload", [
+    {"phases": []},
+    {"profile": "nope", "phases": [{"operations": ["upsert"]}]},
+    {"phases": [{"operations": []}]},
+    {"phases": [{"operations": ["upsert", "fly"]}]},
+    {"phases": [{"operations": {"query_points": 0.5, "upsert": 0.5}}]},
+])
+def test_load_workload_rejects_invalid_workloads(workload):
+    with pytest.raises(ValueError):
+        load_workload(workload)
+
+
+def test_load_workload_does_not_modify_the_given_dict():
+    source = {"phases": [{"operations": ["upsert"]}]}
+
+    load_workload(source)
+
+    assert source == {"phases": [{"operations": ["upsert"]}]}
+
+
+def test_run_workload_reports_one_row_per_phase_operation(client):
+    workload = {
+        "collection": "workload", "dataset_size": 200, "batch_size": 16,
+        "phases": [
+            {"name": "load", "operations": ["upsert"]},
+            {"name": "mix", "operations": {"query_points": 0.5, "scroll": 0.5}, "requests": 20},
+        ],
+    }
+
+    rows = run_workload(client, workload)
+
+    assert [row["operation"] for row in rows] == ["upsert[load]", "query_points[mix]", "scroll[mix]"]
+    assert sum(row["requests"] for row in rows[1:]) == 20
+    assert not any(row["errors"] for row in rows)
+    assert not client.collection_exists(collection_name="workload")
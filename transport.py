@@ -0,0 +1,148 @@
+"""REST or gRPC client construction, a pool of clients for worker threads, and wire-size helpers
+
+connect_or_local falls back to the client's embedded local engine when no
+server answers, so the tutorial and benchmarks can run offline.
+"""
+import queue
+import time
+from contextlib import contextmanager
+
+from qdrant_client import QdrantClient
+from qdrant_client import grpc as qdrant_grpc
+from qdrant_client.conversions.conversion import RestToGrpc
+from qdrant_client.http import models
+
+from bulk_ops import is_local_client
+
+TRANSPORTS = ("rest", "grpc")
+DEFAULT_URL = "http://localhost:6333"
+DEFAULT_GRPC_PORT = 6334
+
+
+def connect(url=DEFAULT_URL, transport="rest", grpc_port=DEFAULT_GRPC_PORT, **kwargs):
+    """Return a QdrantClient for url that talks REST or gRPC
+
+    With transport="grpc" the client still takes the server from url but
+    sends requests as protobuf to grpc_port instead of JSON to url's port.
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}', expected one of {TRANSPORTS}")
+    return QdrantClient(url, grpc_port=grpc_port, prefer_grpc=transport == "grpc", **kwargs)
+
+
+def server_available(client):
+    """Return True if client reaches a running Qdrant server"""
+    try:
+        client.get_collections()
+        return True
+    except Exception:
+        return False
+
+
+def connect_or_local(url=DEFAULT_URL, transport="rest", local_path=None, **kwargs):
+    """Connect to the server at url, or open the embedded local engine if nothing answers
+
+    The local engine keeps its data in memory, or under local_path if given;
+    it supports the same client API but ignores payload indexes, HNSW and
+    quantization settings (see also bulk_ops.is_local_client). Returns
+    (client, is_server).
+    """
+    # Probe without the version check, which warns when nothing is listening
+    probe = connect(url, "rest", **dict(kwargs, check_compatibility=False))
+    available = server_available(probe)
+    probe.close()
+    if available:
+        return connect(url, transport, **kwargs), True
+    local_client = QdrantClient(path=local_path) if local_path else QdrantClient(":memory:")
+    return local_client, False
+
+
+def client_transport(client):
+    """Return "grpc" or "rest" for a client created by connect (or any QdrantClient)"""
+    return "grpc" if client.init_options.get("prefer_grpc") else "rest"
+
+
+def transport_options(client, transport):
+    """Return QdrantClient arguments that reach the same server as client over transport"""
+    if is_local_client(client):
+        raise ValueError("Transports need a Qdrant server: the embedded local mode has no network protocol")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}', expected one of {TRANSPORTS}")
+    options = dict(client.init_options)
+    options["prefer_grpc"] = transport == "grpc"
+    return options
+
+
+class ClientPool:
+    """Fixed set of clients leased to one caller at a time
+
+    Each client has its own HTTP connection pool or gRPC channel, so
+    worker threads do not queue behind a single connection. Any client
+    method called on the pool runs on a leased client, which lets a pool be
+    passed wherever a client is expected (bulk_upsert, the benchmarks...).
+    """
+
+    def __init__(self, client_options, size=4):
+        if client_options.get("location") == ":memory:" or client_options.get("path") is not None:
+            raise ValueError("A client pool needs a Qdrant server: local storage cannot be shared")
+        self.init_options = dict(client_options)
+        self.clients = [QdrantClient(**client_options) for _ in range(size)]
+        self._idle = queue.Queue()
+        for client in self.clients:
+            self._idle.put(client)
+
+    def __len__(self):
+        return len(self.clients)
+
+    @contextmanager
+    def lease(self):
+        """Borrow an idle client, blocking until one is returned"""
+        client = self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+    def __getattr__(self, name):
+        if not callable(getattr(self.clients[0], name)):
+            return getattr(self.clients[0], name)
+
+        def call(*args, **kwargs):
+            with self.lease() as client:
+                return getattr(client, name)(*args, **kwargs)
+        return call
+
+    def close(self):
+        """Close every client in the pool"""
+        for client in self.clients:
+            client.close()
+
+
+def encode_upsert(collection_name, points, transport):
+    """Encode an upsert request body the way transport sends it and return the bytes"""
+    if transport == "grpc":
+        return qdrant_grpc.UpsertPoints(
+            collection_name=collection_name,
+            points=[RestToGrpc.convert_point_struct(point) for point in points]
+        ).SerializeToString()
+    return models.PointsList(points=points).model_dump_json(exclude_none=True).encode("utf-8")
+
+
+def encode_query_batch(collection_name, requests, transport):
+    """Encode a query_batch_points request body the way transport sends it and return the bytes"""
+    if transport == "grpc":
+        return qdrant_grpc.QueryBatchPoints(
+            collection_name=collection_name,
+            query_points=[RestToGrpc.convert_query_request(request, collection_name) for request in requests]
+        ).SerializeToString()
+    return models.QueryRequestBatch(searches=requests).model_dump_json(exclude_none=True).encode("utf-8")
+
+
+def time_encoding(encode, *args, repeat=5):
+    """Return (best seconds, encoded bytes) over repeat calls of encode(*args)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = encode(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, len(encoded)
@@ -0,0 +1,275 @@
+"""Float32 dense vectors, CSR sparse vectors, columnar payloads and the list vs array client paths"""
+import time
+import tracemalloc
+
+import numpy as np
+from qdrant_client.http import models
+
+VECTOR_DIM = 100
+VECTOR_MODES = ("array", "list")
+PAYLOAD_CATEGORIES = ("A", "B", "C")
+SPARSE_VOCAB_SIZE = 30000
+
+
+def random_vectors(count, dim=VECTOR_DIM, seed=None):
+    """Generate a contiguous float32 matrix of uniform values in [-1, 1)"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.random((count, dim), dtype=np.float32)
+    vectors *= 2.0
+    vectors -= 1.0
+    return vectors
+
+
+def random_payload_columns(count, categories=PAYLOAD_CATEGORIES, value_range=(1, 100), seed=None):
+    """Generate category/value/active payload fields column-wise with NumPy
+
+    Returns {"category": str array, "value": int64 array, "active": bool array};
+    callers can add or drop columns before wrapping them in PayloadColumns.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = value_range
+    return {
+        "category": np.asarray(categories)[rng.integers(len(categories), size=count)],
+        "value": rng.integers(low, high + 1, size=count),
+        "active": rng.integers(2, size=count).astype(bool),
+    }
+
+
+class PayloadColumns:
+    """Columnar payloads that build per-point dicts only for the rows being sent
+
+    Supports len() and contiguous slicing, so it can be passed as the
+    payloads of bulk_upsert and is turned into dicts one chunk at a time.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.names = list(columns)
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Payload columns have different lengths: {sorted(lengths)}")
+        self.length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        # tolist() converts each column to Python objects in C, then rows are zipped
+        values = [self.columns[name][index].tolist() for name in self.names]
+        return [dict(zip(self.names, row)) for row in zip(*values)]
+
+
+def random_token_docs(count, vocab_size=SPARSE_VOCAB_SIZE, doc_length=(16, 64), zipf=1.1, seed=None):
+    """Generate tokenized documents whose term ids follow a Zipf distribution
+
+    Returns (token_ids, lengths): one flat int64 array of every document's
+    tokens back to back, and the number of tokens in each document. Term id
+    0 is the most frequent, like a vocabulary sorted by corpus frequency.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = doc_length
+    lengths = rng.integers(low, high + 1, size=count)
+    cdf = np.cumsum(1.0 / np.arange(1, vocab_size + 1) ** zipf)
+    cdf /= cdf[-1]
+    token_ids = np.searchsorted(cdf, rng.random(int(lengths.sum())))
+    return np.minimum(token_ids, vocab_size - 1), lengths
+
+
+def encode_sparse(token_ids, lengths, bm25=True, k1=1.2, b=0.75):
+    """Encode tokenized documents (see random_token_docs) as sparse vectors in one vectorized pass
+
+    Every (document, term) pair is counted with a single np.unique over
+    combined keys. With bm25 the counts become BM25 document weights
+    tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / mean length)); the IDF
+    half of BM25 is left to the collection's IDF modifier. Without bm25 the
+    values are raw term counts, which is how queries are encoded.
+    """
+    token_ids = np.asarray(token_ids, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    vocab_size = int(token_ids.max()) + 1 if len(token_ids) else 1
+    docs = np.repeat(np.arange(len(lengths)), lengths)
+    # Keys sort by document, then term, which is the CSR layout
+    keys, counts = np.unique(docs * vocab_size + token_ids, return_counts=True)
+    doc_of = keys // vocab_size
+    values = counts.astype(np.float32)
+    if bm25:
+        norm = k1 * (1 - b + b * lengths[doc_of] / max(lengths.mean(), 1))
+        values = values * (k1 + 1) / (values + norm)
+    indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(doc_of, minlength=len(lengths)), out=indptr[1:])
+    return SparseVectors(indptr, (keys % vocab_size).astype(np.uint32), values.astype(np.float32))
+
+
+def random_sparse_vectors(count, vocab_size=SPARSE_VOCAB_SIZE, doc_length=(16, 64), seed=None):
+    """Generate BM25-weighted sparse vectors for count random Zipf-distributed documents"""
+    return encode_sparse(*random_token_docs(count, vocab_size, doc_length, seed=seed))
+
+
+class SparseVectors:
+    """Sparse vectors in CSR form: row i is indices/values[indptr[i]:indptr[i + 1]]
+
+    Supports len(), contiguous slicing (another SparseVectors) and
+    tolist() (a list of models.SparseVector), so it can stand in for a
+    dense matrix wherever only chunks are turned into client objects.
+    """
+
+    def __init__(self, indptr, indices, values):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.uint32)
+        self.values = np.asarray(values, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            index = int(index)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("SparseVectors index out of range")
+            start, end = self.indptr[index], self.indptr[index + 1]
+            return models.SparseVector(
+                indices=self.indices[start:end].tolist(), values=self.values[start:end].tolist()
+            )
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError("SparseVectors only supports contiguous slices")
+        stop = max(start, stop)
+        first, last = self.indptr[start], self.indptr[stop]
+        return SparseVectors(self.indptr[start:stop + 1] - first, self.indices[first:last], self.values[first:last])
+
+    def row_lengths(self):
+        """Number of non-zero entries in each row"""
+        return np.diff(self.indptr)
+
+    def tolist(self):
+        """Return a models.SparseVector per row, converting the arrays to Python lists once"""
+        offsets = (self.indptr - self.indptr[0]).tolist()
+        indices = self.indices.tolist()
+        values = self.values.tolist()
+        return [
+            models.SparseVector(indices=indices[start:end], values=values[start:end])
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+
+
+class NamedVectors:
+    """Several vector columns (dense arrays, SparseVectors...) sliced together
+
+    tolist() returns {name: column.tolist()}, the named-vector form a
+    models.Batch accepts, so bulk_upsert can load collections with several
+    named vectors one chunk at a time.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Vector columns have different lengths: {sorted(lengths)}")
+        self.length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return {name: column[index] for name, column in self.columns.items()}
+        return NamedVectors({name: column[index] for name, column in self.columns.items()})
+
+    def tolist(self):
+        """Return {name: column.tolist()} for every column"""
+        return {name: column.tolist() for name, column in self.columns.items()}
+
+
+def as_float32(vectors):
+    """Return vectors as a C-contiguous float32 array, copying only if needed"""
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def to_client_vectors(vectors, mode="array"):
+    """Return vectors in the form handed to the client for the given path
+
+    "array" keeps a contiguous float32 ndarray that the client converts one
+    request at a time; "list" materializes nested Python float lists up front.
+    """
+    if mode == "array":
+        return as_float32(vectors)
+    if mode == "list":
+        return np.asarray(vectors).tolist()
+    raise ValueError(f"Unknown vector mode: {mode!r} (expected one of {VECTOR_MODES})")
+
+
+def upload_vectors(client, collection_name, vectors, ids, mode="array", batch_size=256):
+    """Upload vectors through the list path or the array path
+
+    The list path sends one Batch built from Python lists, like the original
+    tutorial. The array path gives the float32 array to upload_collection,
+    which slices it into batches so no full-size list copy is ever created.
+    Returns the operation id for the list path and None for the array path.
+    """
+    if mode == "list":
+        result = client.upsert(
+            collection_name=collection_name,
+            points=models.Batch(ids=[int(i) for i in ids], vectors=to_client_vectors(vectors, "list"))
+        )
+        return result.operation_id
+
+    client.upload_collection(
+        collection_name=collection_name,
+        vectors=to_client_vectors(vectors, mode),
+        ids=map(int, ids),
+        batch_size=batch_size,
+        wait=True
+    )
+    return None
+
+
+def compare_vector_paths(client, collection_name, vectors, ids, queries=None, limit=5):
+    """Time and memory-profile the list path against the array path
+
+    Each path uploads the same vectors (and runs the same queries, if given)
+    twice: once for wall time and once under tracemalloc for peak Python
+    allocations, since tracing slows the timed run considerably.
+    Returns {mode: {"upload_seconds", "query_seconds", "peak_mb", "data_mb"}}.
+    """
+    results = {}
+    for mode in VECTOR_MODES:
+        def workload():
+            start = time.perf_counter()
+            upload_vectors(client, collection_name, vectors, ids, mode=mode)
+            upload_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if queries is not None:
+                for query in to_client_vectors(queries, mode):
+                    client.query_points(collection_name=collection_name, query=query, limit=limit)
+            return upload_seconds, time.perf_counter() - start
+
+        upload_seconds, query_seconds = workload()
+
+        tracemalloc.start()
+        try:
+            workload()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results[mode] = {
+            "upload_seconds": upload_seconds,
+            "query_seconds": query_seconds,
+            "peak_mb": peak / (1024 * 1024),
+            "data_mb": _vectors_mb(vectors, mode),
+        }
+    return results
+
+
+def _vectors_mb(vectors, mode):
+    """Approximate memory held by vectors in the given representation"""
+    rows, cols = np.shape(vectors)
+    if mode == "array":
+        return rows * cols * 4 / (1024 * 1024)
+    # Nested lists: one list object per row plus a 24-byte float per element
+    return (rows * (56 + 8 * cols) + rows * cols * 24) / (1024 * 1024)
@@ -0,0 +1,270 @@
+"""Headless, config-driven workloads for soak tests and repeatable experiments
+
+A workload is a JSON file describing a collection, a dataset and a list of
+phases. Each phase runs a sequence of operations one after another, or a
+weighted mix of them, for a number of requests and/or a duration, at an
+optional target rate and with a number of concurrent workers:
+
+    {
+        "collection": "qdrant_101_workload",
+        "profile": "default",
+        "dataset_size": 10000,
+        "batch_size": 64,
+        "limit": 10,
+        "seed": 42,
+        "phases": [
+            {"name": "load", "operations": ["upsert"]},
+            {"name": "soak", "operations": {"query_points": 0.7, "filtered_search": 0.2, "upsert": 0.1},
+             "duration": 300, "rate": 200, "concurrency": 8}
+        ]
+    }
+
+Operations are the benchmark suite's (see benchmark.OPERATIONS). Run with:
+
+    python workload.py workload.json --output soak.json
+    python workload.py workload.json --fallback-local --report-every 10
+    python workload.py workload.json --compare soak.json --tolerance 0.2
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait as wait_futures
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from benchmark import (OPERATIONS, add_result_row, compare_results, format_row, load_results, operation_requests,
+                       write_csv, write_json)
+from bulk_ops import is_local_client
+from collection_config import COLLECTION_PROFILES, collection_kwargs
+from transport import DEFAULT_URL, TRANSPORTS, connect, connect_or_local
+from vector_data import VECTOR_DIM, random_vectors
+
+WORKLOAD_DEFAULTS = {
+    "collection": "qdrant_101_workload",
+    "profile": "default",
+    "dataset_size": 10000,
+    "batch_size": 64,
+    "limit": 10,
+    "seed": 42,
+    "recreate": True,
+    "drop": True,
+}
+PHASE_DEFAULTS = {
+    "requests": None,
+    "duration": None,
+    "rate": None,
+    "concurrency": 1,
+}
+
+
+def load_workload(source):
+    """Read a workload from a JSON path (or take a dict) and fill in defaults
+
+    Raises ValueError for unknown operations or profiles, and for a mix
+    phase with neither requests nor duration.
+    """
+    if isinstance(source, dict):
+        workload = dict(source)
+    else:
+        with open(source) as f:
+            workload = json.load(f)
+    workload = {**WORKLOAD_DEFAULTS, **workload}
+    if workload["profile"] not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown profile: {workload['profile']!r}")
+    if not workload.get("phases"):
+        raise ValueError("A workload needs at least one phase")
+
+    phases = []
+    for i, phase in enumerate(workload["phases"]):
+        phase = {**PHASE_DEFAULTS, "name": f"phase{i + 1}", **phase}
+        operations = phase.get("operations")
+        if not operations:
+            raise ValueError(f"Phase {phase['name']!r} has no operations")
+        unknown = [name for name in operations if name not in OPERATIONS]
+        if unknown:
+            raise ValueError(f"Unknown operation(s) in phase {phase['name']!r}: {unknown} (expected {OPERATIONS})")
+        if isinstance(operations, dict) and phase["requests"] is None and phase["duration"] is None:
+            raise ValueError(f"Mix phase {phase['name']!r} needs requests or duration")
+        phases.append(phase)
+    workload["phases"] = phases
+    return workload
+
+
+def _dispatch(request_fns, choose, limit_requests, duration, rate, concurrency, tick=None, report_every=None):
+    """Send requests until the request or time budget runs out, optionally paced to rate/sec
+
+    request_fns maps operation -> request_fn(i); choose(i) picks the
+    operation of the i-th request. At most 2 * concurrency requests are in
+    flight, so a rate the server cannot sustain turns into back-pressure
+    instead of an unbounded queue. Returns (per-operation latencies,
+    per-operation errors, seconds).
+    """
+    latencies = {operation: [] for operation in request_fns}
+    errors = {operation: 0 for operation in request_fns}
+    counters = {operation: 0 for operation in request_fns}
+
+    def timed(operation, i):
+        request_start = time.perf_counter()
+        request_fns[operation](i)
+        return time.perf_counter() - request_start
+
+    def collect(done):
+        for future in done:
+            operation = pending.pop(future)
+            try:
+                latencies[operation].append(future.result())
+            except Exception:
+                errors[operation] += 1
+
+    start = time.perf_counter()
+    next_report = start + report_every if report_every else None
+    sent = 0
+    pending = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while limit_requests is None or sent < limit_requests:
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            if rate:
+                # Open-loop pacing: request n is due at start + n / rate
+                delay = start + sent / rate - now
+                if delay > 0:
+                    time.sleep(delay)
+            if len(pending) >= concurrency * 2:
+                done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            operation = choose(sent)
+            pending[executor.submit(timed, operation, counters[operation])] = operation
+            counters[operation] += 1
+            sent += 1
+            if next_report is not None and time.perf_counter() >= next_report:
+                next_report += report_every
+                tick(time.perf_counter() - start, sum(map(len, latencies.values())), sum(errors.values()))
+        done, _ = wait_futures(list(pending))
+        collect(done)
+    return latencies, errors, time.perf_counter() - start
+
+
+def run_workload(client, workload, progress=None, tick=None, report_every=None):
+    """Run every phase of a workload (see load_workload) and return result rows
+
+    Each (phase, operation) pair gives one row shaped like run_benchmark's,
+    with operation "<operation>[<phase>]" plus phase and target_rate.
+    progress(row) is called as rows complete; tick(phase, elapsed,
+    completed, errors) every report_every seconds while a phase runs.
+    """
+    workload = load_workload(workload)
+    collection_name = workload["collection"]
+    size = workload["dataset_size"]
+    batch_size = workload["batch_size"]
+    seed = workload["seed"]
+    rng = np.random.default_rng(seed)
+    vectors = random_vectors(size, VECTOR_DIM, seed=seed)
+    queries = random_vectors(max(1000, batch_size), VECTOR_DIM, seed=seed + 1)
+
+    if workload["recreate"]:
+        if client.collection_exists(collection_name=collection_name):
+            client.delete_collection(collection_name=collection_name)
+        client.create_collection(collection_name=collection_name, **collection_kwargs(workload["profile"]))
+
+    results = []
+    for phase in workload["phases"]:
+        concurrency = 1 if is_local_client(client) else phase["concurrency"]
+        operations = phase["operations"]
+        budget = phase["requests"] or 10_000
+        if isinstance(operations, dict):
+            names = list(operations)
+            weights = np.asarray([operations[name] for name in names], dtype=np.float64)
+            picks = np.random.default_rng(rng.integers(2**32)).choice(len(names), size=budget, p=weights / weights.sum())
+            steps = [(names, lambda i: names[picks[i % budget]], phase["requests"])]
+        else:
+            steps = [([name], lambda i, name=name: name, phase["requests"]) for name in operations]
+
+        for step_operations, choose, limit_requests in steps:
+            request_fns = {}
+            items = {}
+            for operation in step_operations:
+                request_fn, natural_requests, items[operation] = operation_requests(
+                    client, collection_name, operation, size, vectors, queries, rng,
+                    batch_size, workload["limit"], budget
+                )
+                # Cycle through the operation's requests when a phase runs longer than one pass
+                request_fns[operation] = (lambda fn, n: lambda i: fn(i % n))(request_fn, max(natural_requests, 1))
+                if limit_requests is None and phase["duration"] is None:
+                    limit_requests = natural_requests
+
+            latencies, errors, seconds = _dispatch(
+                request_fns, choose, limit_requests, phase["duration"], phase["rate"], concurrency,
+                tick=(lambda elapsed, done, failed: tick(phase["name"], elapsed, done, failed)) if tick else None,
+                report_every=report_every if tick else None
+            )
+            for operation in step_operations:
+                add_result_row(
+                    results, f"{operation}[{phase['name']}]", size, concurrency, latencies[operation], seconds,
+                    errors[operation], items=len(latencies[operation]) * items[operation],
+                    extra={"phase": phase["name"], "target_rate": phase["rate"]}, progress=progress
+                )
+
+    if workload["drop"] and client.collection_exists(collection_name=collection_name):
+        client.delete_collection(collection_name=collection_name)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workload", help="Workload JSON file")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Qdrant server URL")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="rest")
+    parser.add_argument("--local", action="store_true", help="Use the embedded ':memory:' mode instead of a server")
+    parser.add_argument("--fallback-local", action="store_true",
+                        help="Use the embedded ':memory:' mode if no server answers at --url")
+    parser.add_argument("--report-every", type=float, default=None, help="Print progress every N seconds")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--csv", help="Write results to this CSV file")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workload = load_workload(args.workload)
+    if args.local:
+        client = QdrantClient(":memory:")
+    elif args.fallback_local:
+        client, is_server = connect_or_local(args.url, args.transport)
+        if not is_server:
+            print(f"No Qdrant server at {args.url}; using the embedded ':memory:' mode", file=sys.stderr)
+    else:
+        client = connect(args.url, args.transport)
+
+    def tick(phase, elapsed, completed, failed):
+        print(f"[{phase}] {elapsed:7.1f}s  {completed} requests  {failed} errors")
+
+    results = run_workload(client, workload, progress=lambda row: print(format_row(row)),
+                           tick=tick, report_every=args.report_every)
+
+    metadata = {"target": client.init_options.get("location") or args.url, "workload": workload}
+    if args.output:
+        write_json(results, args.output, metadata)
+        print(f"Results written to {args.output}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"Results written to {args.csv}")
+
+    if args.compare:
+        comparisons = compare_results(load_results(args.compare), results, args.tolerance)
+        regressions = [c for c in comparisons if c["regression"]]
+        for c in regressions:
+            print(f"REGRESSION {c['operation']} conc={c['concurrency']} "
+                  f"{c['metric']}: {c['baseline']:.2f} -> {c['current']:.2f} ({c['change']:+.1%})")
+        print(f"{len(regressions)} regression(s) in {len(comparisons)} comparisons")
+        if regressions:
+            return 1
+    return 1 if any(row["errors"] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())